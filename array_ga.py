@@ -0,0 +1,126 @@
+"""Dizi tabanlı popülasyonla genetik algoritma
+
+Popülasyon tek bir bitişik int32 2-B dizide (satır = birey) tutulur;
+çaprazlama ve mutasyon satır grupları üzerinde toplu uygulanır, amaç
+değerleri paralel bir dizide saklanır. Birey kopyalama (deepcopy) yoktur.
+DEAP yolu GeneticScheduler'da karşılaştırma için olduğu gibi durur.
+"""
+import random
+import time
+import numpy as np
+from genetic_algorithm import DEFAULT_WEIGHTS, GeneticScheduler, print_timestamp
+
+def order_crossover(parents_a, parents_b, rng):
+    """Satır çiftlerine toplu sıra çaprazlaması (OX)
+
+    Her çocuk ilk ebeveynin rastgele bir kesitini aynı konumda korur; kalan
+    konumlar ikinci ebeveynin sırasıyla, kesitte olmayan genlerle doldurulur.
+    """
+    pairs, length = parents_a.shape
+    rows = np.arange(pairs)[:, None]
+    cuts = np.sort(rng.integers(0, length + 1, size=(pairs, 2)), axis=1)
+    positions = np.arange(length)[None, :]
+    segment = (positions >= cuts[:, :1]) & (positions < cuts[:, 1:])
+
+    # Kesitteki genlerin işareti: in_segment[satır, gen]
+    in_segment = np.zeros((pairs, length), dtype=bool)
+    in_segment[np.broadcast_to(rows, (pairs, length))[segment], parents_a[segment]] = True
+    keep = ~np.take_along_axis(in_segment, parents_b, axis=1)
+
+    children = parents_a.copy()
+    # Satır başına boş konum ve kalan gen sayıları eşittir; satır sırası korunur
+    children[~segment] = parents_b[keep]
+    return children
+
+def shuffle_mutation(population, indpb, rng):
+    """Her satırda olasılığı indpb olan genleri kendi aralarında karıştırır (yerinde)"""
+    selected = rng.random(population.shape) < indpb
+    row_ids = np.nonzero(selected)[0]
+    if row_ids.size == 0:
+        return
+    values = population[selected]
+    order = np.lexsort((rng.random(row_ids.size), row_ids))
+    population[selected] = values[order]
+
+class ArrayGeneticScheduler(GeneticScheduler):
+    """GeneticScheduler ile aynı nesil düzeni (varAnd benzeri çaprazlama + mutasyon,
+    yavrular popülasyonun yerine geçer) ve aynı çıktılar; popülasyon numpy dizisinde"""
+
+    def __init__(self, work_orders, machines=10, population_size=50, weights=DEFAULT_WEIGHTS, mutation_indpb=0.05,
+                 **kwargs):
+        super().__init__(work_orders, machines=machines, population_size=population_size, weights=weights,
+                         **kwargs)
+        self.mutation_indpb = mutation_indpb
+
+    def evaluate_rows(self, population, rows, objectives):
+        """Verilen satırları çözümleyip amaç dizisine yazar"""
+        for row in rows:
+            objectives[row] = self.evaluate_schedule(population[row].tolist())
+
+    def best_row(self, objectives):
+        """DEAP selBest ile aynı sıralama: amaçlar sırayla (sözlük düzeni) küçük olan"""
+        return int(np.lexsort(objectives.T[::-1])[0])
+
+    def optimize(self, generations=100, initial_population=None, on_generation=None, cxpb=0.8, mutpb=0.2,
+                 seed=None, callbacks=(), gap_tolerance=None, **kwargs):
+        """Dizi tabanlı popülasyonla optimize et (parametreler GeneticScheduler.optimize ile aynı)"""
+        print_timestamp("\nOptimizasyon (dizi popülasyonu) başlıyor...")
+        if seed is not None:
+            random.seed(seed)
+        rng = np.random.default_rng(seed)
+        start_time = time.time()
+        size, length = self.population_size, len(self.work_orders)
+
+        population = np.argsort(rng.random((size, length)), axis=1).astype(np.int32)
+        if initial_population:
+            seeds = [self.check_permutation(perm) for perm in initial_population[:size]]
+            population[:len(seeds)] = np.asarray(seeds, dtype=np.int32)
+        objectives = np.empty((size, len(self.weights)))
+        self.evaluate_rows(population, range(size), objectives)
+        self.add_checkpoint(objectives[self.best_row(objectives)], start_time)
+
+        best_fitness = float('inf')
+        for gen in range(1, generations + 1):
+            gen_start_time = time.time()
+            offspring = population.copy()
+            offspring_objectives = objectives.copy()
+            changed = np.zeros(size, dtype=bool)
+
+            # Çaprazlama: ardışık çiftler cxpb olasılığıyla, toplu
+            pair_starts = np.arange(0, size - 1, 2)
+            crossing = pair_starts[rng.random(pair_starts.size) < cxpb]
+            if crossing.size and length > 1:
+                first, second = offspring[crossing], offspring[crossing + 1]
+                offspring[crossing] = order_crossover(first, second, rng)
+                offspring[crossing + 1] = order_crossover(second, first, rng)
+                changed[crossing] = changed[crossing + 1] = True
+
+            # Mutasyon: satırlar mutpb olasılığıyla, seçilen genler karıştırılır;
+            # ikiden az gen seçilen (ya da karışımı aynı kalan) satır değişmiş sayılmaz
+            mutating = np.nonzero(rng.random(size) < mutpb)[0]
+            if mutating.size:
+                block = offspring[mutating]
+                shuffle_mutation(block, self.mutation_indpb, rng)
+                mutated = mutating[(block != offspring[mutating]).any(axis=1)]
+                offspring[mutating] = block
+                changed[mutated] = True
+
+            # Yalnızca değişen bireyler yeniden değerlendirilir
+            self.evaluate_rows(offspring, np.nonzero(changed)[0], offspring_objectives)
+            population, objectives = offspring, offspring_objectives
+
+            best = self.best_row(objectives)
+            best_fitness = min(best_fitness, objectives[best, 0])
+            gen_stats = {
+                'generation': gen,
+                'best_fitness': best_fitness,
+                'avg_fitness': float(objectives[:, 0].mean()),
+                'execution_time': time.time() - gen_start_time,
+                'gap': self.optimality_gap(best_fitness)
+            }
+            self.add_checkpoint(objectives[best], start_time)
+            if self.finish_generation(gen_stats, on_generation, callbacks, gap_tolerance):
+                break
+
+        self.last_population = population.tolist()
+        return self.analyze_best_solution(population[self.best_row(objectives)].tolist())
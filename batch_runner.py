@@ -0,0 +1,147 @@
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from data_processor import DataProcessor, print_timestamp
+
+# Senaryo varsayılanları
+SCENARIO_DEFAULTS = {
+    'file': 'siparis.xlsx',
+    'test_mode': False,
+    'machines': 10,
+    'population_size': 50,
+    'generations': 100,
+    'frozen_days': 0,     # en erken terminden itibaren bu kadar gün içindeki siparişler dondurulur
+    'exclude': [],        # planlamaya alınmayacak iş emri kimlikleri
+    'seed': None
+}
+
+# İşçi süreçte paylaşılan, bir kez okunmuş sipariş verisi (havuzun veri kümesi)
+_work_orders = []
+
+def init_worker(work_orders):
+    global _work_orders
+    _work_orders = work_orders
+
+def dataset_key(scenario):
+    return (scenario['file'], bool(scenario['test_mode']))
+
+def split_frozen(work_orders, frozen_days):
+    """Dondurulmuş ufuk içindeki (zaten serbest bırakılmış) iş emirlerini ayırır"""
+    if not frozen_days or not work_orders:
+        return work_orders, []
+    horizon = min(order['hamTermin'] for order in work_orders) + pd.Timedelta(days=frozen_days)
+    free = [order for order in work_orders if order['hamTermin'] > horizon]
+    frozen = [order for order in work_orders if order['hamTermin'] <= horizon]
+    return free, frozen
+
+def run_scenario(scenario, export_dir=None):
+    """Tek bir senaryoyu işçi süreçte çalıştırır ve özet satırını döndürür"""
+    import random
+    from genetic_algorithm import GeneticScheduler
+
+    scenario_start = time.time()
+    if scenario['seed'] is not None:
+        random.seed(scenario['seed'])
+
+    excluded = set(scenario['exclude'])
+    work_orders = [order for order in _work_orders if order['id'] not in excluded]
+    work_orders, frozen = split_frozen(work_orders, scenario['frozen_days'])
+    if not work_orders:
+        raise ValueError(f"Planlanacak iş emri kalmadı ({len(frozen)} dondurulan, {len(excluded)} dışlanan)")
+
+    scheduler = GeneticScheduler(work_orders, machines=scenario['machines'],
+                                 population_size=scenario['population_size'])
+    scheduler.optimize(generations=scenario['generations'])
+    total_time, balance, changes = scheduler.score_schedule(scheduler.best_schedule)
+
+    if export_dir is not None:
+        from schedule_exporter import ScheduleExporter
+        ScheduleExporter(os.path.join(export_dir, scenario['name']), formats=('csv',)).export_scheduler(scheduler)
+
+    type_changes = scheduler.debug_stats['type_changes']
+    return {
+        'Senaryo': scenario['name'],
+        'Dosya': scenario['file'],
+        'Makine': scenario['machines'],
+        'İş Emri': len(work_orders),
+        'Dondurulan': len(frozen),
+        'Popülasyon': scenario['population_size'],
+        'Nesiller': scenario['generations'],
+        'Toplam Süre (Saat)': total_time,
+        'Yük Dengesi': balance,
+        'Tip Değişim Oranı': changes,
+        'VARYANT': type_changes['VARYANT'],
+        'ULAK': type_changes['ULAK'],
+        'TAKIM': type_changes['TAKIM'],
+        'Çalışma Süresi (sn)': round(time.time() - scenario_start, 2)
+    }
+
+def run_batch(scenarios, core_budget=None, summary_path='senaryo_karsilastirma.xlsx', export_dir=None):
+    """Senaryoları paylaşılan sipariş verisiyle süreç havuzunda eşzamanlı çalıştırır
+
+    Her senaryo tek çekirdek kullanır; aynı anda en fazla core_budget
+    senaryo çalışır. Aynı (dosya, test modu) çiftini kullanan senaryolar
+    veriyi bir kez okunmuş olarak paylaşır: senaryolar veri kümesine göre
+    gruplanır, her grup yalnızca kendi veri kümesini alan bir havuzda çalışır.
+    """
+    scenarios = [{**SCENARIO_DEFAULTS, 'name': f'senaryo_{i}', **scenario}
+                 for i, scenario in enumerate(scenarios, start=1)]
+    core_budget = core_budget or os.cpu_count() or 1
+
+    # Girdileri çakışan senaryolar için veri bir kez okunur
+    datasets = {}
+    for scenario in scenarios:
+        key = dataset_key(scenario)
+        if key not in datasets:
+            print_timestamp(f"Veri okunuyor: {key[0]} (test modu: {key[1]})")
+            datasets[key] = DataProcessor(key[0], test_mode=key[1]).create_work_orders()
+    print_timestamp(f"{len(scenarios)} senaryo, {len(datasets)} veri kümesi, {core_budget} çekirdek")
+
+    rows = []
+    for key, work_orders in datasets.items():
+        group = [scenario for scenario in scenarios if dataset_key(scenario) == key]
+        with ProcessPoolExecutor(max_workers=min(core_budget, len(group)), initializer=init_worker,
+                                 initargs=(work_orders,)) as executor:
+            futures = {executor.submit(run_scenario, scenario, export_dir): scenario for scenario in group}
+            for future in as_completed(futures):
+                name = futures[future]['name']
+                try:
+                    rows.append(future.result())
+                    print_timestamp(f"Senaryo tamamlandı: {name}")
+                except Exception as e:
+                    print_timestamp(f"Senaryo başarısız: {name} ({str(e)})")
+                    rows.append({'Senaryo': name, 'Hata': str(e)})
+
+    # Karşılaştırma özeti: senaryo sırasıyla, en iyi toplam süreye göre fark
+    order = {scenario['name']: i for i, scenario in enumerate(scenarios)}
+    summary = pd.DataFrame(sorted(rows, key=lambda row: order[row['Senaryo']]))
+    if 'Toplam Süre (Saat)' in summary:
+        best = summary['Toplam Süre (Saat)'].min()
+        summary['En İyiye Fark (%)'] = (summary['Toplam Süre (Saat)'] - best) / best * 100
+    summary.to_excel(summary_path, index=False)
+    summary.to_csv(os.path.splitext(summary_path)[0] + '.csv', index=False)
+    print_timestamp(f"Karşılaştırma özeti kaydedildi: {summary_path}")
+    return summary
+
+def main():
+    """Kullanım: python batch_runner.py senaryolar.json [--cores N] [--export klasör]
+
+    JSON dosyası senaryo listesi ya da {"scenarios": [...], "core_budget": N}
+    biçiminde olabilir.
+    """
+    with open(sys.argv[1], encoding='utf-8') as f:
+        config = json.load(f)
+    if isinstance(config, list):
+        config = {'scenarios': config}
+    core_budget = config.get('core_budget')
+    if '--cores' in sys.argv:
+        core_budget = int(sys.argv[sys.argv.index('--cores') + 1])
+    export_dir = sys.argv[sys.argv.index('--export') + 1] if '--export' in sys.argv else None
+    summary = run_batch(config['scenarios'], core_budget=core_budget, export_dir=export_dir)
+    print(summary.to_string(index=False))
+
+if __name__ == '__main__':
+    main()
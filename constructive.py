@@ -0,0 +1,188 @@
+"""Evrimsiz, tek geçişli yapıcı çizelgeleme (ör. tezgah arızasından sonra anında plan)"""
+import heapq
+import time
+from genetic_algorithm import DEFAULT_WEIGHTS, GeneticScheduler, print_timestamp
+from schedule_timeline import TYPE_CHANGE_MINUTES, classify_codes
+
+class ConstructiveScheduler(GeneticScheduler):
+    """İş emirlerini aile partilerine ayırıp liste çizelgelemeyle makinelere dağıtır
+
+    Partiler ulak ailesi içinde varyanta göre oluşturulur ve en erken
+    terminlerine göre sıralanır. Atama find_best_machine ile aynı kuralları
+    izler: aynı siparişin son üç işinde bulunduğu makine (ve takvim varsa
+    süresiz arızadan önce işi bitiremeyecek makine) engellenir, yük
+    dengesizliği ortalamanın %30'unu aşarsa en az yüklü makine seçilir,
+    aksi halde ortalamanın 1.2 katını aşmamış ve son işi aynı varyant/ulak
+    olan makine tercih edilir; o da yoksa en az yüklü makine alınır. En az
+    yüklü makine bir öbekten (heap) okunur. Sonuç GA ile aynı çözücüden
+    geçirilir; amaçlar evaluate_schedule ile aynı biçimdedir.
+    """
+
+    def __init__(self, work_orders, machines=10, population_size=50, weights=DEFAULT_WEIGHTS, **kwargs):
+        super().__init__(work_orders, machines=machines, population_size=population_size, weights=weights,
+                         **kwargs)
+
+    def family_batches(self):
+        """İş emri indekslerini (ulak, varyant) partilerine ayırır, partileri en erken termine göre sıralar"""
+        batches = {}
+        for idx, (variant, ulak, _) in enumerate(self.order_codes):
+            batches.setdefault((ulak or '', variant or f'#{idx}'), []).append(idx)
+
+        def termin(idx):
+            value = self.work_orders[idx].get('hamTermin')
+            return (False, value) if value is not None else (True, 0)
+
+        for batch in batches.values():
+            batch.sort(key=termin)
+        # Aynı ulak ailesinin partileri ailenin en erken termininde art arda gelir
+        family_first = {}
+        for (ulak, _), batch in batches.items():
+            if ulak and (ulak not in family_first or termin(batch[0]) < family_first[ulak]):
+                family_first[ulak] = termin(batch[0])
+        keys = sorted(batches, key=lambda key: (family_first.get(key[0], termin(batches[key][0])), key[0],
+                                                termin(batches[key][0])))
+        return [batches[key] for key in keys]
+
+    def place(self, machine, ready, setup_hours, duration):
+        """Hazırlık ve üretimi çözücüdeki gibi yerleştirir; (üretim başlangıcı, bitiş) döndürür"""
+        if self.calendar is None:
+            return ready + setup_hours, ready + setup_hours + duration
+        return self.calendar.schedule_block(machine, ready, setup_hours, duration)
+
+    def construct(self):
+        """Partileri sırayla makinelere atar; (permütasyon, makine ataması) döndürür"""
+        machine_times = [0.0] * self.machines
+        last_codes = [None] * self.machines
+        machine_last = [None] * self.machines  # bölme kararı için son iş emri indeksleri
+        recent_orders = [[] for _ in range(self.machines)]  # son üç işin sipariş kodları
+        heap = [(0.0, machine_id) for machine_id in range(self.machines)]
+        total_time = 0.0
+        first_setup = TYPE_CHANGE_MINUTES['TAKIM'] / 60
+        permutation, assignment = [], []
+
+        def least_loaded(blocked, unavailable=()):
+            # Bayat ve engelli girdiler atlanır; engelliler öbeğe geri konur
+            skipped = []
+            choice = None
+            while heap:
+                load, machine_id = heapq.heappop(heap)
+                if load != machine_times[machine_id]:
+                    continue
+                if machine_id in blocked:
+                    skipped.append((load, machine_id))
+                    continue
+                choice = machine_id
+                heapq.heappush(heap, (load, machine_id))
+                break
+            for entry in skipped:
+                heapq.heappush(heap, entry)
+            if choice is None:
+                # Tüm makineler engelliyse arızada olmayan en az yüklü makine
+                candidates = [m for m in range(self.machines) if m not in unavailable] or range(self.machines)
+                choice = min(candidates, key=lambda m: machine_times[m])
+            return choice
+
+        for batch in self.family_batches():
+            for idx in batch:
+                variant, ulak, siparis_id = self.order_codes[idx]
+                avg_time = total_time / self.machines
+                blocked = {m for m in range(self.machines) if siparis_id in recent_orders[m]}
+                unavailable = set()
+                if self.calendar is not None and self.calendar.open_ended:
+                    duration = self.work_orders[idx]['duration']
+                    unavailable = {m for m in range(self.machines)
+                                   if self.calendar.schedule_block(m, machine_times[m], first_setup,
+                                                                   duration)[1] == float('inf')}
+                    blocked |= unavailable
+
+                machine = None
+                if max(machine_times) - min(machine_times) > avg_time * 0.3:
+                    machine = least_loaded(blocked, unavailable)
+                else:
+                    # Aynı varyant, yoksa aynı ulak; ortalamaya en yakın yük
+                    best_score = float('inf')
+                    for match in (0, 1):
+                        for m in range(self.machines):
+                            if m in blocked or last_codes[m] is None or machine_times[m] >= avg_time * 1.2:
+                                continue
+                            prev = last_codes[m][match]
+                            current = variant if match == 0 else ulak
+                            if current and prev and current == prev:
+                                score = abs(machine_times[m] - avg_time)
+                                if score < best_score:
+                                    best_score, machine = score, m
+                        if machine is not None:
+                            break
+                    if machine is None:
+                        machine = least_loaded(blocked, unavailable)
+
+                # Yük, çözücüdeki gibi hazırlık süresini (takvim varsa kapalı süreleri) de içerir
+                if last_codes[machine] is None:
+                    change_type = 'TAKIM'
+                else:
+                    change_type = classify_codes(variant, ulak, *last_codes[machine])
+                setup_hours = TYPE_CHANGE_MINUTES[change_type] / 60
+                duration = self.work_orders[idx]['duration']
+                start, end = self.place(machine, machine_times[machine], setup_hours, duration)
+
+                # Çözücü işi bölecekse yardımcı makinelerin yükleri de aynı biçimde izlenir
+                due = self.due_hours[idx] if self.due_hours is not None else None
+                if (self.split_limits is not None and self.split_limits[idx] > 1
+                        and (end > max(machine_times) or (due is not None and end > due))):
+                    pieces = self.split_pieces(idx, machine, start, machine_times, machine_last)
+                    if pieces is not None:
+                        fraction, helpers = pieces
+                        if self.calendar is None:
+                            end = start + duration * fraction
+                        else:
+                            end = self.calendar.finish_time(machine, start, duration * fraction)
+                        for helper, piece_change, piece_fraction in helpers:
+                            piece_end = self.place(helper, machine_times[helper],
+                                                   TYPE_CHANGE_MINUTES[piece_change] / 60,
+                                                   duration * piece_fraction)[1]
+                            total_time += piece_end - machine_times[helper]
+                            machine_times[helper] = piece_end
+                            heapq.heappush(heap, (piece_end, helper))
+                            last_codes[helper] = (variant, ulak)
+                            machine_last[helper] = idx
+                            recent_orders[helper] = (recent_orders[helper] + [siparis_id])[-3:]
+
+                total_time += end - machine_times[machine]
+                machine_times[machine] = end
+                heapq.heappush(heap, (machine_times[machine], machine))
+                last_codes[machine] = (variant, ulak)
+                machine_last[machine] = idx
+                recent_orders[machine] = (recent_orders[machine] + [siparis_id])[-3:]
+                permutation.append(idx)
+                assignment.append(machine)
+        return permutation, assignment
+
+    def optimize(self, generations=None, callbacks=(), **kwargs):
+        """Yapıcı çizelgeyi üretir (evrim yok; GA parametreleri yok sayılır)"""
+        print_timestamp("Yapıcı çizelgeleme başlıyor")
+        start_time = time.time()
+        permutation, assignment = self.construct()
+        best_solution = self.analyze_best_solution(permutation, assignment)
+        objectives = list(self.score_schedule(self.best_schedule))
+        self.evaluations = 1
+        elapsed = time.time() - start_time
+
+        gen_stats = {
+            'generation': 1,
+            'best_fitness': objectives[0],
+            'avg_fitness': objectives[0],
+            'execution_time': elapsed,
+            'gap': self.optimality_gap(objectives[0])
+        }
+        self.debug_stats['generation_stats'].append(gen_stats)
+        self.debug_stats['anytime'].append({
+            'elapsed': elapsed,
+            'evaluations': self.evaluations,
+            'best_fitness': self.weighted_fitness(objectives),
+            'best_objectives': objectives
+        })
+        for callback in callbacks:
+            callback(dict(gen_stats, elapsed=elapsed, evaluations=self.evaluations, best_objectives=objectives))
+        self.last_population = [permutation]
+        print_timestamp(f"Yapıcı çizelgeleme tamamlandı: {elapsed:.3f} sn, amaçlar {objectives}")
+        return best_solution
@@ -1,6 +1,10 @@
 import pandas as pd
 from datetime import datetime, timedelta
 import time
+from schedule_timeline import classify_codes, clean_code
+
+# Tezgah adları; sıra, çözücüdeki makine numarasıdır (0 -> mk101, 3 -> mk201)
+MACHINE_NAMES = ['mk101', 'mk102', 'mk103', 'mk201', 'mk202', 'mk203', 'mk301', 'mk302', 'mk303', 'mk304']
 
 def print_timestamp(message):
     """Zaman damgalı mesaj yazdır"""
@@ -8,9 +12,12 @@ def print_timestamp(message):
     print(f"[{current_time}] {message}")
 
 class DataProcessor:
-    def __init__(self, file_path, test_mode=False):
+    def __init__(self, file_path, test_mode=False, split_mode='upfront'):
+        """split_mode: 'upfront' termine yetişmeyecek siparişleri okurken böler;
+        'decoder' bölmez, bölme kararını çizelgeleyiciye bırakır (max_splits)"""
         self.file_path = file_path
         self.test_mode = test_mode
+        self.split_mode = split_mode
         
         # Tezgah parametreleri
         self.ATKI_DEVIR = 450  # dakikada atılan atkı sayısı
@@ -23,11 +30,7 @@ class DataProcessor:
         self.MAX_PARCA_SAYISI = 10      # maksimum bölünebilecek parça sayısı
         
         # Başlangıçta boş makine hızları sözlüğü
-        self.machines = {
-            'mk101': 0, 'mk102': 0, 'mk103': 0, 'mk201': 0,
-            'mk202': 0, 'mk203': 0, 'mk301': 0, 'mk302': 0,
-            'mk303': 0, 'mk304': 0
-        }
+        self.machines = {name: 0 for name in MACHINE_NAMES}
 
     def calculate_machine_speed(self, atki_sikligi):
         """Atkı sıklığına göre makine hızını hesaplar (metre/saat)"""
@@ -72,20 +75,9 @@ class DataProcessor:
         return float(quantity) / machine_speed
     
     def check_type_change(self, current_variant, current_ulak, prev_variant, prev_ulak):
-        """Tip değişim türünü belirler"""
-        # İlk iş için veya önceki iş yoksa
-        if prev_variant is None and prev_ulak is None:
-            return "TAKIM"  # 180 dakika
-        
-        # Varyant kodu eşleşiyorsa - en verimli değişim
-        if current_variant and prev_variant and current_variant == prev_variant:
-            return "VARYANT"  # 30 dakika
-        # Ulak kodu eşleşiyorsa
-        elif current_ulak and prev_ulak and str(current_ulak) == str(prev_ulak):
-            return "ULAK"  # 120 dakika
-        # Hiçbir eşleşme yoksa
-        else:
-            return "TAKIM"  # 180 dakika
+        """Tip değişim türünü belirler (GeneticScheduler ile aynı kurallar)"""
+        return classify_codes(clean_code(current_variant), clean_code(current_ulak),
+                              clean_code(prev_variant), clean_code(prev_ulak))
     
     def create_work_orders(self):
         """İş emirlerini oluşturur"""
@@ -138,6 +130,14 @@ class DataProcessor:
             if idx < 5:
                 print(f"İş emri {idx} için hamTermin: {work_order_data['hamTermin']}")
             
+            if self.split_mode == 'decoder':
+                # Bölme çözücüde: en fazla parça sayısı ve en küçük parça miktarı iş emrinde taşınır
+                work_order_data['max_splits'] = max(1, min(self.MAX_PARCA_SAYISI,
+                                                           int(row['quantity'] // self.MIN_BOLME_MIKTARI)))
+                work_order_data['min_split_quantity'] = self.MIN_BOLME_MIKTARI
+                work_orders.append(work_order_data)
+                continue
+            
             # Termin kontrolü ve iş emri bölme
             remaining_time = max((row['hamTermin'] - now).total_seconds() / 3600, 1)
             
@@ -0,0 +1,408 @@
+"""Büyük örnekler için ayrıştırma: iş emirlerini kümelere böl, kümeleri makine
+alt kümelerinde paralel optimize et, alt çizelgeleri birleştirip iyileştir"""
+import heapq
+import multiprocessing
+import queue
+import time
+from concurrent.futures import ProcessPoolExecutor
+from genetic_algorithm import DEFAULT_WEIGHTS, GeneticScheduler, print_timestamp
+from schedule_timeline import TYPE_CHANGE_MINUTES, classify_codes, order_code
+
+# Bu sayının üzerindeki iş emri sayısında ayrıştırma modu kullanılır
+DECOMPOSITION_THRESHOLD = 20000
+
+# Kümeleme ölçütleri: aile (ulak/varyant), atkı sıklığı bandı, termin penceresi
+PARTITION_MODES = ('family', 'atki', 'termin')
+
+def partition_key(order, mode, atki_band=5, termin_days=7):
+    """İş emrinin bölümleme anahtarı"""
+    if mode == 'family':
+        # Aynı ulak ailesindeki varyantlar aynı kümede kalır (ULAK/VARYANT değişimleri kısa)
+        ulak = order_code(order, 'ulakKodu')
+        variant = order_code(order, 'varyantKodu')
+        return f'u{ulak}' if ulak else (f'v{variant}' if variant else '')
+    if mode == 'atki':
+        return int((order.get('atkiSikligi') or 0) // atki_band)
+    if mode == 'termin':
+        termin = order.get('hamTermin')
+        return termin.toordinal() // termin_days if termin is not None else 0
+    raise ValueError(f"Bilinmeyen bölümleme ölçütü: {mode} (seçenekler: {', '.join(PARTITION_MODES)})")
+
+def partition_orders(work_orders, mode='family', max_cluster_orders=2000, atki_band=5, termin_days=7):
+    """İş emri indekslerini en fazla max_cluster_orders büyüklüğünde kümelere ayırır
+
+    Aile kümeleri büyükten küçüğe ilk-uyan yöntemiyle paketlenir; bant ve
+    pencere kümeleri komşu bantlar bir arada kalacak şekilde sırayla
+    birleştirilir. Sınırı aşan tek bir grup termin sırasıyla parçalanır.
+    """
+    groups = {}
+    for idx, order in enumerate(work_orders):
+        groups.setdefault(partition_key(order, mode, atki_band, termin_days), []).append(idx)
+
+    # Sınırı aşan gruplar termin sırasıyla parçalara ayrılır
+    chunks = []
+    for key in sorted(groups, key=str) if mode == 'family' else sorted(groups):
+        indices = groups[key]
+        if len(indices) > max_cluster_orders:
+            indices = sorted(indices, key=lambda i: (work_orders[i].get('hamTermin') is None,
+                                                     work_orders[i].get('hamTermin')))
+        for offset in range(0, len(indices), max_cluster_orders):
+            chunks.append(indices[offset:offset + max_cluster_orders])
+
+    clusters = []
+    if mode == 'family':
+        for chunk in sorted(chunks, key=len, reverse=True):
+            target = next((cluster for cluster in clusters if len(cluster) + len(chunk) <= max_cluster_orders), None)
+            if target is None:
+                clusters.append(list(chunk))
+            else:
+                target.extend(chunk)
+    else:
+        for chunk in chunks:
+            if clusters and len(clusters[-1]) + len(chunk) <= max_cluster_orders:
+                clusters[-1].extend(chunk)
+            else:
+                clusters.append(list(chunk))
+    return clusters
+
+def cluster_workload(work_orders, cluster):
+    """Kümenin tahmini iş yükü (saat): üretim süreleri ve aile başına bir takım hazırlığı"""
+    families = {partition_key(work_orders[idx], 'family') for idx in cluster}
+    return sum(work_orders[idx]['duration'] for idx in cluster) + len(families) * TYPE_CHANGE_MINUTES['TAKIM'] / 60
+
+def earliest_termin(work_orders, cluster):
+    """Kümedeki en erken termin (sıralama anahtarı; termini olmayan kümeler sona)"""
+    termins = [work_orders[idx].get('hamTermin') for idx in cluster]
+    termins = [termin for termin in termins if termin is not None and termin == termin]
+    return (0, min(termins)) if termins else (1, None)
+
+def assign_machines(work_orders, clusters, machines, max_group_orders=None):
+    """Kümelere yük dengeleyerek makine alt kümeleri atar
+
+    Küme sayısı makine sayısından azsa makineler iş yüküyle orantılı
+    dağıtılır (her kümeye en az bir makine). Fazlaysa kümeler en uzun iş
+    önce (LPT) kuralıyla en az yüklü makineye verilir; bir makinedeki
+    kümeler en erken termin sırasıyla, max_group_orders iş emrini
+    aşmayacak şekilde ardışık alt problemlere paketlenir (aynı makinede
+    sırayla çalışırlar). (makine numaraları, iş emri indeksleri) çiftleri
+    döndürür; aynı makinenin alt problemleri çalışma sırasıyla gelir.
+    """
+    workloads = [cluster_workload(work_orders, cluster) for cluster in clusters]
+
+    if len(clusters) <= machines:
+        # En büyük kalan yöntemiyle orantılı makine sayıları
+        total = sum(workloads) or 1
+        extra = machines - len(clusters)
+        shares = [workload / total * extra for workload in workloads]
+        counts = [1 + int(share) for share in shares]
+        remaining = machines - sum(counts)
+        for i in sorted(range(len(clusters)), key=lambda i: shares[i] - int(shares[i]), reverse=True)[:remaining]:
+            counts[i] += 1
+        groups = []
+        first = 0
+        for cluster, count in zip(clusters, counts):
+            groups.append((list(range(first, first + count)), cluster))
+            first += count
+        return groups
+
+    loads = [0.0] * machines
+    machine_clusters = [[] for _ in range(machines)]
+    for i in sorted(range(len(clusters)), key=lambda i: workloads[i], reverse=True):
+        machine_id = min(range(machines), key=lambda m: loads[m])
+        loads[machine_id] += workloads[i]
+        machine_clusters[machine_id].append(clusters[i])
+    groups = []
+    for machine_id in range(machines):
+        indices = []
+        for cluster in sorted(machine_clusters[machine_id],
+                              key=lambda cluster: earliest_termin(work_orders, cluster)):
+            if indices and max_group_orders is not None and len(indices) + len(cluster) > max_group_orders:
+                groups.append(([machine_id], indices))
+                indices = []
+            indices = indices + cluster
+        if indices:
+            groups.append(([machine_id], indices))
+    return groups
+
+def stacked_makespan(values, keys):
+    """Aynı makinelerde ardışık çalışan alt problemlerin süreleri toplanır; en büyük toplam döner"""
+    totals = {}
+    for value, key in zip(values, keys):
+        totals[key] = totals.get(key, 0.0) + value
+    return max(totals.values())
+
+# İşçi süreçlerde paylaşılan iş emirleri, ilerleme kuyruğu ve durdurma olayı
+_work_orders = None
+_progress = None
+_stop_event = None
+
+def init_worker(work_orders, progress=None, stop_event=None):
+    global _work_orders, _progress, _stop_event
+    _work_orders = work_orders
+    _progress = progress
+    _stop_event = stop_event
+
+def solve_cluster(group_id, indices, machine_count, options):
+    """Tek bir alt problemi işçi süreçte genetik algoritmayla çözer
+
+    Nesil kayıtları (group_id, kayıt) olarak ilerleme kuyruğuna yazılır;
+    durdurma olayı set edilirse alt problem o nesilden sonra durur. Alt
+    problem sessiz çalışır; ilerleme ve sonuç raporunu ana süreç yazdırır.
+    """
+    from progress_sinks import StopSignal
+    records = []
+
+    def forward(record):
+        records.append(record)
+        if _progress is not None:
+            _progress.put((group_id, record))
+
+    callbacks = [forward]
+    if _stop_event is not None:
+        callbacks.append(StopSignal(event=_stop_event))
+    sub_orders = [_work_orders[idx] for idx in indices]
+    scheduler = GeneticScheduler(sub_orders, machines=machine_count, population_size=options['population_size'],
+                                 weights=options['weights'], plan_start=options['plan_start'],
+                                 tardiness_weights=options['tardiness_weights'],
+                                 tardiness_limit=options['tardiness_limit'], calendar=options['calendar'],
+                                 split_orders=options['split_orders'], quiet=True)
+    scheduler.optimize(generations=options['generations'], cxpb=options['cxpb'], mutpb=options['mutpb'],
+                       seed=options['seed'], callbacks=callbacks)
+    timeline = scheduler.best_schedule['timeline']
+    # Bölünen işlerde ana parça (iş emrinin son satırı) sırayı ve makineyi belirler
+    primary_rows = sorted({idx: row for row, idx in enumerate(timeline['order_index'])}.values())
+    return {
+        'sequence': [indices[timeline['order_index'][row]] for row in primary_rows],
+        'machines': [timeline['machine'][row] for row in primary_rows],
+        'starts': [timeline['start'][row] for row in primary_rows],
+        'finish': max(scheduler.best_schedule['machine_times']),
+        'objectives': list(scheduler.score_schedule(scheduler.best_schedule)),
+        'evaluations': scheduler.evaluations,
+        'progress': records
+    }
+
+class DecompositionScheduler(GeneticScheduler):
+    """Ayrıştırmalı çözücü: GeneticScheduler ile aynı çıktıları (best_schedule,
+    debug_stats, machine_loads) üretir; main.py ve görselleştirme değişmeden çalışır
+
+    max_workers: işçi süreç sayısı; None ise alt problem sayısı kadar. Daha
+    az verilirse birleşik nesil kayıtları (ve durdurma) tüm alt problemler
+    başlayana kadar gecikir.
+    """
+
+    def __init__(self, work_orders, machines=10, population_size=50, weights=DEFAULT_WEIGHTS,
+                 partition='family', max_cluster_orders=2000, max_workers=None, polish_moves=500, **kwargs):
+        super().__init__(work_orders, machines=machines, population_size=population_size, weights=weights,
+                         **kwargs)
+        self.partition = partition
+        self.max_cluster_orders = max_cluster_orders
+        self.max_workers = max_workers
+        self.polish_moves = polish_moves
+
+    def setup_hours(self, prev_idx, idx):
+        """İki iş arasındaki hazırlık süresi (saat); önceki iş yoksa ilk takım hazırlığı"""
+        if prev_idx is None:
+            return TYPE_CHANGE_MINUTES['TAKIM'] / 60
+        variant, ulak, _ = self.order_codes[idx]
+        prev_variant, prev_ulak, _ = self.order_codes[prev_idx]
+        return TYPE_CHANGE_MINUTES[classify_codes(variant, ulak, prev_variant, prev_ulak)] / 60
+
+    def sequence_time(self, sequence):
+        """Makine sırasının toplam süresi (üretim ve hazırlık)"""
+        total = 0.0
+        prev_idx = None
+        for idx in sequence:
+            total += self.setup_hours(prev_idx, idx) + self.work_orders[idx]['duration']
+            prev_idx = idx
+        return total
+
+    def polish(self, machine_sequences):
+        """Birleştirilmiş çizelgede darboğaz makineden en az yüklü makineye iş taşır
+
+        Her adımda darboğaz makinedeki her işin çıkarılması ve en az yüklü
+        makinenin sonuna eklenmesi sabit sürede değerlendirilir; iki
+        makinenin büyüğünü en çok azaltan taşıma uygulanır. İyileşme
+        kalmayınca ya da polish_moves taşımaya ulaşılınca durur.
+        """
+        times = [self.sequence_time(sequence) for sequence in machine_sequences]
+        moves = 0
+        while moves < self.polish_moves:
+            bottleneck = max(range(self.machines), key=lambda m: times[m])
+            lightest = min(range(self.machines), key=lambda m: times[m])
+            source, target = machine_sequences[bottleneck], machine_sequences[lightest]
+            if bottleneck == lightest or len(source) < 2:
+                break
+
+            target_last = target[-1] if target else None
+            best_move, best_peak = None, times[bottleneck]
+            for position, idx in enumerate(source):
+                prev_idx = source[position - 1] if position > 0 else None
+                next_idx = source[position + 1] if position + 1 < len(source) else None
+                removed = self.setup_hours(prev_idx, idx) + self.work_orders[idx]['duration']
+                if next_idx is not None:
+                    removed += self.setup_hours(idx, next_idx) - self.setup_hours(prev_idx, next_idx)
+                added = self.setup_hours(target_last, idx) + self.work_orders[idx]['duration']
+                peak = max(times[bottleneck] - removed, times[lightest] + added)
+                if peak < best_peak - 1e-9:
+                    best_move, best_peak = (position, removed, added), peak
+            if best_move is None:
+                break
+
+            position, removed, added = best_move
+            target.append(source.pop(position))
+            times[bottleneck] -= removed
+            times[lightest] += added
+            moves += 1
+        return moves
+
+    def combine_objectives(self, objective_lists, sizes, keys):
+        """Alt problem amaçlarından birleşik çizelgenin yaklaşık amaçları
+
+        Toplam süre makine alt kümesi başına ardışık alt problemlerin toplamının
+        en büyüğü, en büyük gecikme alt problemlerin en büyüğü, iş emri başına
+        amaçlar iş emri sayısıyla ağırlıklı, yük dengesi ortalamadır.
+        """
+        total = sum(sizes)
+        objectives = [stacked_makespan([values[0] for values in objective_lists], keys),
+                      sum(values[1] for values in objective_lists) / len(objective_lists),
+                      sum(values[2] * size for values, size in zip(objective_lists, sizes)) / total]
+        if len(objective_lists[0]) > 3:
+            objectives += [sum(values[3] * size for values, size in zip(objective_lists, sizes)) / total,
+                           max(values[4] for values in objective_lists)]
+        return objectives
+
+    def report_generations(self, progress, finished, reported, groups, start_time, on_generation=None,
+                           callbacks=(), gap_tolerance=None):
+        """Tüm alt problemlerin ulaştığı nesilleri birleştirip bildirir
+
+        Bir nesil, bitmemiş her alt problem o nesli bildirdiğinde birleştirilir;
+        biten alt problemin son kaydı kullanılır. Kayıtlar GeneticScheduler
+        ile aynı biçimdedir (finish_generation). (bildirilen nesil sayısı,
+        durdurma istendi mi) döndürür.
+        """
+        while True:
+            gen = reported
+            if not any(len(records) > gen for records in progress):
+                return reported, False
+            if not all(len(records) > gen or done for records, done in zip(progress, finished)):
+                return reported, False
+            active = [group_id for group_id, records in enumerate(progress) if records]
+            records = [progress[group_id][min(gen, len(progress[group_id]) - 1)] for group_id in active]
+            keys = [tuple(groups[group_id][0]) for group_id in active]
+            gen_stats = {
+                'generation': gen + 1,
+                'best_fitness': stacked_makespan([record['best_fitness'] for record in records], keys),
+                'avg_fitness': sum(record['avg_fitness'] for record in records) / len(records),
+                'execution_time': max(record['execution_time'] for record in records)
+            }
+            gen_stats['gap'] = self.optimality_gap(gen_stats['best_fitness'])
+            self.evaluations = sum(record['evaluations'] for record in records)
+            self.add_checkpoint(self.combine_objectives([record['best_objectives'] for record in records],
+                                                        [len(groups[group_id][1]) for group_id in active], keys),
+                                start_time)
+            reported += 1
+            if self.finish_generation(gen_stats, on_generation, callbacks, gap_tolerance):
+                return reported, True
+
+    def optimize(self, generations=100, cxpb=0.8, mutpb=0.2, seed=None, callbacks=(), on_generation=None,
+                 gap_tolerance=None, **kwargs):
+        """Kümelere ayır, alt problemleri paralel çöz, birleştir ve iyileştir
+
+        Alt problemlerin nesil kayıtları çözüm sürerken birleştirilip
+        callbacks'e iletilir; bir alıcı True döndürürse (ya da gap_tolerance
+        sağlanırsa) tüm alt problemler o nesilden sonra durur ve o ana kadarki
+        en iyi alt çözümler birleştirilir. Ara kontrol noktalarının amaçları
+        alt problemlerden yaklaşık hesaplanır; sonuncusu birleşik çizelgenindir.
+        """
+        start_time = time.time()
+        clusters = partition_orders(self.work_orders, self.partition, self.max_cluster_orders)
+        groups = assign_machines(self.work_orders, clusters, self.machines, self.max_cluster_orders)
+        print_timestamp(f"Ayrıştırma ({self.partition}): {len(self.work_orders)} iş emri, {len(clusters)} küme, "
+                        f"{len(groups)} alt problem")
+
+        # Gecikme ağırlıkları self.weights'e eklenmiş olduğundan alt problemlere ayrıca geçirilir
+        options = {'population_size': self.population_size, 'weights': self.weights[:len(DEFAULT_WEIGHTS)],
+                   'generations': generations, 'cxpb': cxpb, 'mutpb': mutpb, 'seed': seed,
+                   'plan_start': self.plan_start, 'tardiness_weights': self.tardiness_weights,
+                   'tardiness_limit': self.tardiness_limit, 'split_orders': self.split_limits is not None}
+        context = multiprocessing.get_context()
+        progress_queue, stop_event = context.Queue(), context.Event()
+        progress = [[] for _ in groups]
+        reported = 0
+        # Nesil kayıtlarının birleşebilmesi için alt problemler varsayılan olarak aynı anda çalışır
+        with ProcessPoolExecutor(max_workers=self.max_workers or len(groups), initializer=init_worker,
+                                 initargs=(self.work_orders, progress_queue, stop_event)) as executor:
+            # Alt problemler kendi makinelerinin takvimiyle çözülür
+            futures = [executor.submit(solve_cluster, group_id, indices, len(machine_ids),
+                                       dict(options, calendar=self.calendar.subset(machine_ids)
+                                            if self.calendar is not None else None))
+                       for group_id, (machine_ids, indices) in enumerate(groups)]
+            while True:
+                finished = [future.done() for future in futures]
+                try:
+                    group_id, record = progress_queue.get(timeout=0.5)
+                    if not finished[group_id]:
+                        progress[group_id].append(record)
+                except queue.Empty:
+                    pass
+                for group_id, future in enumerate(futures):
+                    # Biten alt problemin kayıtları sonuçla birlikte gelir (kuyruktakiler gecikebilir)
+                    if finished[group_id] and future.exception() is None:
+                        progress[group_id] = list(future.result()['progress'])
+                if not stop_event.is_set():
+                    reported, stop = self.report_generations(progress, finished, reported, groups, start_time,
+                                                             on_generation, callbacks, gap_tolerance)
+                    if stop:
+                        stop_event.set()
+                if all(finished):
+                    break
+            results = [future.result() for future in futures]
+            # Kuyrukta kalan kayıtlar boşaltılır (işçilerin kapanışta beklememesi için)
+            try:
+                while True:
+                    progress_queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+        # Alt çizelgeleri birleştir: alt problemin yerel makinesi -> atanan makine
+        # (aynı makinenin ardışık alt problemleri sırayla eklenir)
+        machine_sequences = [[] for _ in range(self.machines)]
+        for (machine_ids, _), result in zip(groups, results):
+            for idx, local_machine in zip(result['sequence'], result['machines']):
+                machine_sequences[machine_ids[local_machine]].append(idx)
+        if self.calendar is None and self.split_limits is None:
+            moves = self.polish(machine_sequences)
+            permutation = [idx for sequence in machine_sequences for idx in sequence]
+            assignment = [machine_id for machine_id, sequence in enumerate(machine_sequences) for _ in sequence]
+        else:
+            # İyileştirme taşımaları toplamsal, bölünmeyen iş modeline dayanır; takvimde ve çözücüde
+            # bölmede atlanır. Alt çözümlerin çözümleme sıraları korunarak başlangıç zamanlarına göre
+            # birleştirilir ki bölme kararları alt çözümdekine yakın makine durumlarını görsün.
+            # Aynı makinede sonra çalışan alt problemin zamanları öncekilerin bitişi kadar kaydırılır.
+            moves = 0
+            offsets, machine_finish = [], {}
+            for (machine_ids, _), result in zip(groups, results):
+                offsets.append(machine_finish.get(tuple(machine_ids), 0.0))
+                machine_finish[tuple(machine_ids)] = offsets[-1] + result['finish']
+            timed = list(heapq.merge(*[[(offset + start, machine_ids[local_machine], idx)
+                                        for idx, local_machine, start in zip(result['sequence'], result['machines'],
+                                                                             result['starts'])]
+                                       for (machine_ids, _), result, offset in zip(groups, results, offsets)],
+                                     key=lambda item: item[0]))
+            permutation = [idx for _, _, idx in timed]
+            assignment = [machine_id for _, machine_id, _ in timed]
+        self.evaluations = sum(result['evaluations'] for result in results)
+        self.debug_stats['clusters'] = [{
+            'machines': machine_ids,
+            'orders': len(indices),
+            'objectives': result['objectives']
+        } for (machine_ids, indices), result in zip(groups, results)]
+        self.debug_stats['polish_moves'] = moves
+
+        self.last_population = [permutation]
+        best_solution = self.analyze_best_solution(permutation, assignment)
+        objectives = list(self.score_schedule(self.best_schedule))
+        self.add_checkpoint(objectives, start_time)
+        print_timestamp(f"Ayrıştırma tamamlandı: {moves} iyileştirme taşıması, "
+                        f"toplam süre {objectives[0]:.2f} saat")
+        return best_solution
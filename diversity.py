@@ -0,0 +1,85 @@
+"""Popülasyon çeşitliliğinin izlenmesi ve kopya bireylerin ayıklanması
+
+Değerlendirmeden önce yavrular permütasyonlarına göre karşılaştırılır:
+aynı nesilde birden çok kez üretilen permütasyonların fazlası rastgele
+göçmenlerle değiştirilir; ebeveyn popülasyonunda zaten değerlendirilmiş
+bir permütasyonun uygunluğu yeniden çözümlenmeden kopyalanır. Çeşitlilik
+(örneklenen çiftler arasındaki konum farkı oranı) eşiğin altına inerse
+popülasyonun bir kısmı göçmenlerle yenilenir.
+"""
+import random
+
+def position_distance(population, pairs=30):
+    """Rastgele birey çiftlerinde farklı gen taşıyan konumların ortalama oranı (0: tümü aynı)"""
+    if len(population) < 2 or not population[0]:
+        return 0.0
+    length = len(population[0])
+    total = 0.0
+    for _ in range(pairs):
+        a, b = random.sample(range(len(population)), 2)
+        total += sum(1 for x, y in zip(population[a], population[b]) if x != y) / length
+    return total / pairs
+
+class DiversityControl:
+    """Kopya ayıklama, çeşitlilik ölçümü ve düşük çeşitlilikte kısmi yeniden başlatma
+
+    threshold: konum farkı oranı bunun altına inince immigrant_rate kadar
+    birey (nesil içi en iyi hariç) rastgele göçmenle değiştirilir.
+    """
+
+    def __init__(self, threshold=0.3, immigrant_rate=0.2):
+        self.threshold = threshold
+        self.immigrant_rate = immigrant_rate
+        self.history = []
+        self.saved_evaluations = 0
+
+    def apply(self, generation, pop, offspring, new_individual):
+        """Yavruları değerlendirmeden önce düzenler; kaydedilen nesil ölçümlerini döndürür
+
+        Uygunluğu geçerli kalan yavrular (değişmemiş ya da önbellekten
+        kopyalanmış) değerlendirilmez; yalnızca önbellekten kopyalananlar
+        tasarruf sayılır (değişmemiş yavrular zaten değerlendirilmezdi).
+        Değiştirilen yavruların sıra numaraları 'replaced' altında döner.
+        """
+        known = {tuple(ind): ind.fitness.values for ind in pop if ind.fitness.valid}
+        seen = set()
+        replaced = []
+        cached = set()
+        for i, ind in enumerate(offspring):
+            key = tuple(ind)
+            if key in seen:
+                offspring[i] = new_individual()
+                replaced.append(i)
+                continue
+            seen.add(key)
+            if not ind.fitness.valid and key in known:
+                ind.fitness.values = known[key]
+                cached.add(i)
+
+        distinct_ratio = len(seen) / len(offspring)
+        distance = position_distance(offspring)
+        restarted = 0
+        if distance < self.threshold:
+            # Kısmi yeniden başlatma: değerlendirilmiş en iyi birey korunur
+            evaluated = [i for i, ind in enumerate(offspring) if ind.fitness.valid]
+            keep = max(evaluated, key=lambda i: offspring[i].fitness) if evaluated else None
+            candidates = [i for i in range(len(offspring)) if i != keep and i not in replaced]
+            count = min(len(candidates), max(1, int(len(offspring) * self.immigrant_rate)))
+            for i in random.sample(candidates, count):
+                offspring[i] = new_individual()
+                replaced.append(i)
+            restarted = count
+
+        # Göçmenle değiştirilen önbellek isabetleri tasarruf sayılmaz
+        saved = len(cached - set(replaced))
+        self.saved_evaluations += saved
+        record = {
+            'generation': generation,
+            'distinct_ratio': distinct_ratio,
+            'position_distance': distance,
+            'duplicates': len(replaced) - restarted,
+            'immigrants': restarted,
+            'saved_evaluations': saved
+        }
+        self.history.append(record)
+        return record, replaced
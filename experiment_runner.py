@@ -1,11 +1,20 @@
 import pandas as pd
-import plotly.graph_objects as go
 import math
-from plotly.subplots import make_subplots
+import bisect
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from genetic_algorithm import GeneticScheduler
 from data_processor import DataProcessor
+import sys
 
-
+# Her deney tamamlandığında sonuç satırının eklendiği dosya (yeniden başlatmada okunur)
+RESULTS_FILE = "deney_sonuclari.csv"
+# Zamana göre kalite özetleri: karşılaştırma bütçesi (sn) ve hedefin en iyi sonuca uzaklığı
+ANYTIME_BUDGET = 60
+ANYTIME_TARGET_GAP = 0.01
 
 def print_debug(message):
     """Zaman damgalı debug mesajı yazdırır."""
@@ -53,212 +62,351 @@ def dynamic_parameters(population_size, generations):
 # Parametreleri belirleyerek experiments listesine ekleyelim
 population_values = [5, 10, 15, 20, 50]  # Farklı popülasyon değerleri
 generation_values = [10, 20, 50, 250]  # Farklı nesil sayıları
+experiment_seeds = [1, 2, 3]  # Her yapılandırma bu tohumlarla çalıştırılır
 
-experiments = []
+# Ayarlama (--tune) modu: yapılandırma uzayı, tohumlar ve ardışık yarılama bütçesi
+tuning_population_values = [10, 20, 50]
+tuning_cxpb_values = [0.6, 0.8, 0.9]
+tuning_mutpb_values = [0.1, 0.2, 0.3]
+tuning_seeds = [1, 2, 3]
+TUNING_MIN_GENERATIONS = 10   # ilk turun nesil bütçesi
+TUNING_MAX_GENERATIONS = 270  # son turun nesil bütçesi üst sınırı
+TUNING_ETA = 3                # her turda yapılandırmaların 1/eta'sı kalır, bütçe eta katına çıkar
+TUNING_FILE = "ayarlama_sonuclari.csv"
 
-for pop in population_values:
-    for gen in generation_values:
-        experiments.append(dynamic_parameters(pop, gen))
+# Excel'e yazılacak kolonlar
+columns = ["Deney No", "Popülasyon", "Nesiller", "Çaprazlama", "Mutasyon", "Fitness Ağırlıkları", "Tohum",
+           "Fitness Değeri", "Toplam Süre (Saat)", "Makine Yük Dengesizliği", "Tip Değişim Sayısı",
+           "Çalışma Süresi (sn)", "Anahtar"]
+tuning_columns = ["Tur", "Yapılandırma", "Popülasyon", "Nesiller", "Çaprazlama", "Mutasyon", "Tohum",
+                  "Fitness Değeri", "Toplam Süre (Saat)", "Makine Yük Dengesizliği", "Tip Değişim Sayısı",
+                  "Çalışma Süresi (sn)", "Anahtar"]
 
-# Experiment listesini satır satır consola yazdır
-for i, exp in enumerate(experiments, start=1):
-    print(f"{i}: {exp}")
+def build_experiments():
+    experiments = []
+    for pop in population_values:
+        for gen in generation_values:
+            experiments.append(dynamic_parameters(pop, gen))
+    return experiments
 
-input("Devam etmek için herhangi bir tuşa basın...")
+def build_tuning_configs():
+    configs = []
+    for pop in tuning_population_values:
+        for cxpb in tuning_cxpb_values:
+            for mutpb in tuning_mutpb_values:
+                configs.append({"population_size": pop, "cxpb": cxpb, "mutpb": mutpb, "weights": (-2, -3, -10)})
+    return configs
 
-# Sonuçları saklamak için boş bir liste
-results = []
+def experiment_key(exp):
+    """Deney yapılandırmasının kalıcı anahtarı (yeniden başlatmada eşleştirme için)"""
+    return json.dumps({k: exp[k] for k in sorted(exp)}, sort_keys=True)
 
-# Excel'e yazılacak kolonlar
-columns = ["Deney No", "Popülasyon", "Nesiller", "Çaprazlama", "Mutasyon", "Fitness Ağırlıkları",
-           "Fitness Değeri", "Toplam Süre (Saat)", "Makine Yük Dengesizliği", "Tip Değişim Sayısı"]
-
-# Veriyi işle
-print_debug("Veri işleme başlatılıyor...")
-data_processor = DataProcessor("siparis.xlsx")
-work_orders = data_processor.create_work_orders()
-print_debug(f"Veri işleme tamamlandı. {len(work_orders)} iş emri oluşturuldu.")
-
-# Deneyleri çalıştır
-for i, exp in enumerate(experiments, start=1):
-    print_debug(f"🚀 Deney {i} başlatılıyor: {exp}")
-
-    # Genetik algoritmayı başlat
-    scheduler = GeneticScheduler(work_orders, machines=10, population_size=exp["population_size"])
-    print_debug("Genetik algoritma başlatıldı.")
-    
-    # Optimizasyonu çalıştır
-    machine_schedules = scheduler.optimize(generations=exp["generations"])
-    print_debug("Optimizasyon tamamlandı.")
-    
-    # Debug: machine_schedules içeriğini kontrol et
-    if not machine_schedules:
-        print_debug("❌ Uyarı: machine_schedules BOŞ!")
-    else:
-        print_debug(f"🔍 machine_schedules dolu, ilk makinenin görev sayısı: {len(machine_schedules[0])}")
-
-    # for idx, machine in enumerate(machine_schedules[:3]):
-    #     print_debug(f"Makine {idx+1}: {machine}")
-    
-    # Popülasyonun boş olup olmadığını kontrol et
-    population = scheduler.toolbox.population(n=scheduler.population_size)
-    if not population:
-        print_debug("❌ Hata: Popülasyon boş! Varsayılan fitness değeri atanıyor.")
-        best_fitness = float('inf')
-    else:
-        if any(len(ind.fitness.values) == 0 for ind in population):
-            print_debug("⚠️ Uyarı: Bazı bireylerin fitness değeri hesaplanmamış! Yeniden hesaplanıyor...")
-            fitnesses = list(map(scheduler.evaluate_schedule, population))
-            for ind, fit in zip(population, fitnesses):
-                ind.fitness.values = fit
-        best_fitness = min([ind.fitness.values[0] for ind in population])
-
-    print_debug(f"📌 En iyi fitness değeri: {best_fitness}")
-    
-    try:
-        total_time = max([sum([task['duration'] for task in machine if isinstance(task, dict) and 'duration' in task]) for machine in machine_schedules if machine])
-    except KeyError as e:
-        print_debug(f"❌ Hata: Eksik anahtar - {e}. Varsayılan değer atanıyor.")
-        total_time = float('inf')
-    except ValueError:
-        print_debug("⚠️ Uyarı: Makine çizelgeleri boş olabilir. Varsayılan toplam süre atanıyor.")
-        total_time = 0
-    
-    print_debug(f"📌 Hesaplanan toplam süre: {total_time}")
-    
-    load_variance = scheduler.debug_stats["generation_stats"][-1]["best_fitness"]
-    type_changes = sum(scheduler.debug_stats["type_changes"].values())
-    
-    results.append([i, exp["population_size"], exp["generations"], exp["cxpb"], exp["mutpb"], exp["weights"],
-                    best_fitness, total_time, load_variance, type_changes])
-    print_debug(f"Deney {i} tamamlandı. Fitness: {best_fitness}, Toplam Süre: {total_time} saat.")
-
-    #input("Devam etmek için herhangi bir tuşa basın...")
-
-# DataFrame oluştur ve Excel'e kaydet
-df = pd.DataFrame(results, columns=columns)
-df.to_excel("deney_sonuclari.xlsx", index=False)
-print_debug("✅ Tüm deneyler tamamlandı! Sonuçlar 'deney_sonuclari.xlsx' dosyasına kaydedildi.")
-# **Normalizasyon fonksiyonu**
-def normalize_column(df, col):
-    min_val = df[col].min()
-    max_val = df[col].max()
-    if max_val - min_val == 0:
-        df[f"Normalized_{col}"] = 0
-    else:
-        df[f"Normalized_{col}"] = (df[col] - min_val) / (max_val - min_val)
-
-# Excel dosyasını tekrar oku
-df = pd.read_excel("deney_sonuclari.xlsx")
-
-# Fitness Ağırlıkları sütunu string olmaması için düzeltme
-if isinstance(df["Fitness Ağırlıkları"].iloc[0], str):
-    df["Fitness Ağırlıkları"] = df["Fitness Ağırlıkları"].apply(lambda x: eval(x))
-
-# **Önce Fitness Ağırlıkları toplamını hesapla ve sütun ekle**
-df["Fitness_Ağırlıkları_Toplam"] = df["Fitness Ağırlıkları"].apply(lambda w: sum(w))
-
-# **İhtiyaç duyulan sütunları normalize et**
-normalize_column(df, "Fitness Değeri")
-normalize_column(df, "Toplam Süre (Saat)")
-normalize_column(df, "Makine Yük Dengesizliği")
-normalize_column(df, "Popülasyon")
-normalize_column(df, "Nesiller")
-normalize_column(df, "Çaprazlama")
-normalize_column(df, "Mutasyon")
-normalize_column(df, "Fitness_Ağırlıkları_Toplam")
-
-# Alt grafikleri olan tek bir HTML sayfası oluştur
-fig = make_subplots(
-    rows=3, cols=1,
-    subplot_titles=(
-        "Fitness Değeri vs. Parametreler (Normalize)", 
-        "Toplam Süre (Saat) vs. Parametreler (Normalize)", 
-        "Makine Yük Dengesizliği vs. Parametreler (Normalize)"
+def load_results(path):
+    """Sonuç dosyasındaki satırları anahtarlarına göre okur"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8', newline='') as f:
+        return {row["Anahtar"]: row for row in csv.DictReader(f)}
+
+def append_result(row, path, row_columns):
+    """Tamamlanan deneyin satırını sonuç dosyasına hemen ekler"""
+    new_file = not os.path.exists(path)
+    with open(path, 'a', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        if new_file:
+            writer.writerow(row_columns)
+        writer.writerow([row.get(column) for column in row_columns])
+        f.flush()
+        os.fsync(f.fileno())
+
+def checkpoints_path(path):
+    return os.path.splitext(path)[0] + "_kontrol_noktalari.ndjson"
+
+def append_checkpoints(key, checkpoints, path):
+    """Çalışmanın kontrol noktalarını NDJSON dosyasına ekler"""
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({"Anahtar": key, "checkpoints": checkpoints}, ensure_ascii=False) + '\n')
+
+def load_checkpoints(path):
+    """Kontrol noktalarını çalışma anahtarlarına göre okur"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return {record["Anahtar"]: record["checkpoints"] for record in records}
+
+# İşçi süreçlerde paylaşılan, bir kez ön işlenmiş iş emirleri
+_work_orders = None
+
+def init_worker(work_orders):
+    global _work_orders
+    _work_orders = work_orders
+
+def run_experiment(exp):
+    """Tek bir deneyi işçi süreçte çalıştırır ve sonuç satırını döndürür"""
+    experiment_start = time.time()
+    scheduler = GeneticScheduler(_work_orders, machines=10, population_size=exp["population_size"],
+                                 weights=exp["weights"])
+    scheduler.optimize(generations=exp["generations"], cxpb=exp["cxpb"], mutpb=exp["mutpb"],
+                       seed=exp.get("seed"))
+
+    # Amaçlar en iyi bireyin çözümlenmiş çizelgesinden okunur
+    total_time, balance, changes = scheduler.score_schedule(scheduler.best_schedule)
+    best_fitness = scheduler.weighted_fitness((total_time, balance, changes))
+
+    row = {
+        "Popülasyon": exp["population_size"],
+        "Nesiller": exp["generations"],
+        "Çaprazlama": exp["cxpb"],
+        "Mutasyon": exp["mutpb"],
+        "Fitness Ağırlıkları": list(exp["weights"]),
+        "Tohum": exp.get("seed"),
+        "Fitness Değeri": best_fitness,
+        "Toplam Süre (Saat)": total_time,
+        "Makine Yük Dengesizliği": balance,
+        "Tip Değişim Sayısı": sum(scheduler.debug_stats["type_changes"].values()),
+        "Çalışma Süresi (sn)": round(time.time() - experiment_start, 2),
+        "Anahtar": experiment_key(exp)
+    }
+    return row, scheduler.debug_stats["anytime"]
+
+def run_pool(runs, work_orders, path, row_columns, max_workers=None):
+    """Çalışmaları süreç havuzunda yürütür; sonucu olanları atlar, bitenleri hemen kaydeder
+
+    runs: (etiketler, deney) çiftleri; etiketler sonuç satırına eklenir.
+    Kontrol noktaları sonuç dosyasının yanındaki NDJSON dosyasına yazılır.
+    Zamana göre ölçümler için --workers 1 daha adil bir karşılaştırma verir.
+    Dosyadaki tüm sonuçları anahtarlarına göre döndürür.
+    """
+    results = load_results(path)
+    pending = [(labels, exp) for labels, exp in runs if experiment_key(exp) not in results]
+    print_debug(f"{len(runs)} deneyden {len(runs) - len(pending)} tanesinin sonucu var, "
+                f"{len(pending)} deney çalıştırılacak.")
+    if not pending:
+        return results
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                             initargs=(work_orders,)) as executor:
+        futures = {executor.submit(run_experiment, exp): labels for labels, exp in pending}
+        for future in as_completed(futures):
+            labels = futures[future]
+            try:
+                row, checkpoints = future.result()
+                row.update(labels)
+            except Exception as e:
+                print_debug(f"❌ Deney {labels} başarısız: {str(e)}")
+                continue
+            append_checkpoints(row["Anahtar"], checkpoints, checkpoints_path(path))
+            append_result(row, path, row_columns)
+            results[row["Anahtar"]] = row
+            print_debug(f"Deney {labels} tamamlandı. Fitness: {row['Fitness Değeri']:.2f}, "
+                        f"Toplam Süre: {row['Toplam Süre (Saat)']:.2f} saat.")
+    return results
+
+def run_experiments(experiments, work_orders, max_workers=None):
+    """Parametre ızgarasındaki deneyleri her tohumla çalıştırır"""
+    runs = [({"Deney No": i}, dict(exp, seed=seed))
+            for i, exp in enumerate(experiments, start=1) for seed in experiment_seeds]
+    run_pool(runs, work_orders, RESULTS_FILE, columns, max_workers)
+
+def successive_halving(configs, work_orders, seeds, max_workers=None):
+    """Yapılandırmaları ardışık yarılama ile eler
+
+    Her turda kalan yapılandırmalar tüm tohumlarla turun nesil bütçesiyle
+    çalıştırılır ve ortalama fitness değerine göre sıralanır; en iyi 1/eta
+    kısmı bir sonraki tura, eta katı bütçeyle geçer. Sonuçlar kaydedildiği
+    için yarıda kalan ayarlama kaldığı yerden sürer.
+    """
+    survivors = list(enumerate(configs, start=1))
+    generations = TUNING_MIN_GENERATIONS
+    rung = 1
+    while True:
+        runs = [({"Tur": rung, "Yapılandırma": number}, dict(config, generations=generations, seed=seed))
+                for number, config in survivors for seed in seeds]
+        results = run_pool(runs, work_orders, TUNING_FILE, tuning_columns, max_workers)
+
+        scores = []
+        for number, config in survivors:
+            keys = [experiment_key(dict(config, generations=generations, seed=seed)) for seed in seeds]
+            values = [float(results[key]["Fitness Değeri"]) for key in keys if key in results]
+            scores.append((sum(values) / len(values) if values else float('inf'), number, config))
+        scores.sort(key=lambda item: item[0])
+
+        print_debug(f"Tur {rung} ({generations} nesil, {len(survivors)} yapılandırma):")
+        for score, number, config in scores:
+            print_debug(f"  #{number} {config} -> ortalama fitness {score:.2f}")
+
+        if len(scores) == 1 or generations * TUNING_ETA > TUNING_MAX_GENERATIONS:
+            return scores
+        keep = max(1, math.ceil(len(scores) / TUNING_ETA))
+        survivors = [(number, config) for _, number, config in scores[:keep]]
+        generations *= TUNING_ETA
+        rung += 1
+
+def value_at(checkpoints, t, key='elapsed'):
+    """t anındaki en iyi fitness (ilk kontrol noktasından önce None)"""
+    i = bisect.bisect_right([point[key] for point in checkpoints], t)
+    return checkpoints[i - 1]['best_fitness'] if i else None
+
+def anytime_metrics(checkpoints, budget, target):
+    """Tek çalışmanın hedefe ulaşma süresi, bütçe sonundaki değeri ve eğri altı alanı
+
+    Alan, en iyi fitness basamak eğrisinin [0, bütçe] aralığındaki
+    ortalamasıdır (ilk kontrol noktasına kadar ilk değer kullanılır);
+    küçük olan daha iyidir.
+    """
+    time_to_target = next((point['elapsed'] for point in checkpoints if point['best_fitness'] <= target), None)
+    area = 0.0
+    previous_time, previous_value = 0.0, checkpoints[0]['best_fitness']
+    for point in checkpoints:
+        if point['elapsed'] >= budget:
+            break
+        area += (point['elapsed'] - previous_time) * previous_value
+        previous_time, previous_value = point['elapsed'], point['best_fitness']
+    area += (budget - previous_time) * previous_value
+    at_budget = value_at(checkpoints, budget)
+    return time_to_target, at_budget if at_budget is not None else checkpoints[0]['best_fitness'], area / budget
+
+def config_label(row):
+    return f"P{row['Popülasyon']} N{row['Nesiller']} Ç{row['Çaprazlama']} M{row['Mutasyon']}"
+
+def summarize_anytime(df, checkpoints, budget=ANYTIME_BUDGET, target_gap=ANYTIME_TARGET_GAP):
+    """Kontrol noktalarını yapılandırma bazında tohumlar üzerinden özetler
+
+    Hedef, tüm çalışmaların en iyi son fitness değerinin target_gap kadar
+    üstüdür. Hedefe ulaşamayan çalışmalar başarı oranına yansır, süre
+    ortalamasına katılmaz. Kontrol noktası olan çalışma yoksa (ör. bu
+    kayıtlardan önceki bir sonuç dosyası sürdürülüyorsa) boş tablo döner.
+    """
+    runs = df[df["Anahtar"].map(lambda key: bool(checkpoints.get(key)))]
+    if runs.empty:
+        return pd.DataFrame()
+    target = min(checkpoints[key][-1]['best_fitness'] for key in runs["Anahtar"]) * (1 + target_gap)
+
+    rows = []
+    for number, group in runs.groupby("Deney No"):
+        metrics = [anytime_metrics(checkpoints[key], budget, target) for key in group["Anahtar"]]
+        reached = [m[0] for m in metrics if m[0] is not None]
+        first = group.iloc[0]
+        rows.append({
+            "Deney No": number,
+            "Yapılandırma": config_label(first),
+            "Tohum Sayısı": len(group),
+            "Hedef Fitness": target,
+            "Hedefe Ulaşma Oranı": len(reached) / len(metrics),
+            "Hedefe Ulaşma Süresi (sn)": sum(reached) / len(reached) if reached else None,
+            f"{budget:g} sn Sonunda Fitness": sum(m[1] for m in metrics) / len(metrics),
+            "Eğri Altı Alan (Ortalama Fitness)": sum(m[2] for m in metrics) / len(metrics),
+            "Son Fitness": group["Fitness Değeri"].mean()
+        })
+    return pd.DataFrame(rows).sort_values("Eğri Altı Alan (Ortalama Fitness)")
+
+def mean_curve(curves, key, points=200):
+    """Tohumların en iyi fitness eğrilerini ortak eksende ortalar"""
+    end = max(curve[-1][key] for curve in curves)
+    xs, ys = [], []
+    for step in range(points + 1):
+        x = end * step / points
+        values = [value_at(curve, x, key) for curve in curves]
+        values = [value for value in values if value is not None]
+        if values:
+            xs.append(x)
+            ys.append(sum(values) / len(values))
+    return xs, ys
+
+def plot_results(df, checkpoints, summary, visualizer, budget=ANYTIME_BUDGET):
+    """Kalite-zaman ve kalite-değerlendirme eğrileri ile eğri altı alan karşılaştırması"""
+    # Grafik kütüphaneleri yalnızca ana süreçte yüklenir (işçi süreçleri çizim yapmaz)
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    fig = make_subplots(
+        rows=3, cols=1,
+        subplot_titles=(
+            "En İyi Fitness vs. Geçen Süre (sn, tohum ortalaması)",
+            "En İyi Fitness vs. Değerlendirme Sayısı (tohum ortalaması)",
+            f"Eğri Altı Alan (ilk {budget:g} sn, ortalama fitness)"
+        )
+    )
+
+    for number, group in df[df["Anahtar"].isin(checkpoints)].groupby("Deney No"):
+        curves = [checkpoints[key] for key in group["Anahtar"]]
+        label = f"#{number} {config_label(group.iloc[0])}"
+        xs, ys = mean_curve(curves, 'elapsed')
+        fig.add_trace(go.Scatter(x=xs, y=ys, mode='lines', line_shape='hv', name=label,
+                                 legendgroup=label), row=1, col=1)
+        xs, ys = mean_curve(curves, 'evaluations')
+        fig.add_trace(go.Scatter(x=xs, y=ys, mode='lines', line_shape='hv', name=label,
+                                 legendgroup=label, showlegend=False), row=2, col=1)
+
+    if not summary.empty:
+        fig.add_vline(x=budget, line_dash='dot', row=1, col=1)
+        fig.add_hline(y=summary["Hedef Fitness"].iloc[0], line_dash='dash', row=1, col=1)
+        fig.add_trace(go.Bar(x=[f"#{n}" for n in summary["Deney No"]],
+                             y=summary["Eğri Altı Alan (Ortalama Fitness)"],
+                             text=summary["Yapılandırma"], name='Eğri Altı Alan', showlegend=False),
+                      row=3, col=1)
+
+    fig.update_xaxes(title_text="Süre (sn)", row=1, col=1)
+    fig.update_xaxes(title_text="Değerlendirme", row=2, col=1)
+    fig.update_layout(
+        height=1200, width=1200,
+        title_text="Genetik Algoritma Deney Sonuçları - Zamana Göre Çözüm Kalitesi",
+        showlegend=True
     )
-)
-
-# Birinci grafik: Normalleştirilmiş Fitness vs. (Popülasyon, Nesiller)
-fig.add_trace(
-    go.Scatter(
-        x=df["Deney No"], 
-        y=df["Normalized_Fitness Değeri"], 
-        mode='lines+markers', 
-        name='Fitness Değeri (Norm)'
-    ), row=1, col=1
-)
-fig.add_trace(
-    go.Scatter(
-        x=df["Deney No"], 
-        y=df["Normalized_Popülasyon"], 
-        mode='lines', 
-        name='Popülasyon (Norm)',
-        line=dict(dash='dot')
-    ), row=1, col=1
-)
-fig.add_trace(
-    go.Scatter(
-        x=df["Deney No"], 
-        y=df["Normalized_Nesiller"], 
-        mode='lines', 
-        name='Nesiller (Norm)', 
-        line=dict(dash='dashdot')
-    ), row=1, col=1
-)
-
-# İkinci grafik: Normalleştirilmiş Toplam Süre vs. (Çaprazlama, Mutasyon)
-fig.add_trace(
-    go.Scatter(
-        x=df["Deney No"], 
-        y=df["Normalized_Toplam Süre (Saat)"], 
-        mode='lines+markers', 
-        name='Toplam Süre (Norm)'
-    ), row=2, col=1
-)
-fig.add_trace(
-    go.Scatter(
-        x=df["Deney No"], 
-        y=df["Normalized_Çaprazlama"], 
-        mode='lines', 
-        name='Çaprazlama (Norm)',
-        line=dict(dash='dot')
-    ), row=2, col=1
-)
-fig.add_trace(
-    go.Scatter(
-        x=df["Deney No"], 
-        y=df["Normalized_Mutasyon"], 
-        mode='lines', 
-        name='Mutasyon (Norm)', 
-        line=dict(dash='dashdot')
-    ), row=2, col=1
-)
-
-# Üçüncü grafik: Normalleştirilmiş Makine Yük Dengesizliği vs. Fitness Ağırlıkları Toplamı
-fig.add_trace(
-    go.Scatter(
-        x=df["Deney No"], 
-        y=df["Normalized_Makine Yük Dengesizliği"], 
-        mode='lines+markers', 
-        name='Makine Yük Dengesizliği (Norm)'
-    ), row=3, col=1
-)
-fig.add_trace(
-    go.Scatter(
-        x=df["Deney No"], 
-        y=df["Normalized_Fitness_Ağırlıkları_Toplam"], 
-        mode='lines', 
-        name='Fitness Ağırlıkları Toplamı (Norm)',
-        line=dict(dash='dot')
-    ), row=3, col=1
-)
-
-fig.update_layout(
-    height=1000, width=1200,
-    title_text="Genetik Algoritma Deney Sonuçları - Parametre Etkileri (Normalleştirilmiş)",
-    showlegend=True
-)
-
-fig.write_html("deney_sonuclari_grafik.html")
-
-print("✅ Normalleştirilmiş verilerle HTML grafik oluşturuldu: deney_sonuclari_grafik.html")
\ No newline at end of file
+
+    visualizer.write_figure_html(fig, "deney_sonuclari_grafik.html")
+
+    print("✅ Kalite-zaman grafikleri oluşturuldu: deney_sonuclari_grafik.html")
+
+def tune(work_orders, max_workers=None):
+    """Ayarlama modu: ardışık yarılama sonucunu kaydeder ve en iyi yapılandırmayı döndürür"""
+    configs = build_tuning_configs()
+    print_debug(f"Ayarlama: {len(configs)} yapılandırma, {len(tuning_seeds)} tohum")
+    scores = successive_halving(configs, work_orders, tuning_seeds, max_workers=max_workers)
+    best_score, best_number, best_config = scores[0]
+    print_debug(f"✅ En iyi yapılandırma #{best_number}: {best_config} (ortalama fitness {best_score:.2f})")
+
+    df = pd.read_csv(TUNING_FILE).sort_values(["Tur", "Yapılandırma", "Tohum"])
+    df.to_excel("ayarlama_sonuclari.xlsx", index=False)
+    print_debug("Ayarlama sonuçları 'ayarlama_sonuclari.xlsx' dosyasına kaydedildi.")
+    return best_config
+
+def main():
+    """Kullanım: python experiment_runner.py [--tune] [--workers N] [--budget SN] [--offline]"""
+    max_workers = int(sys.argv[sys.argv.index('--workers') + 1]) if '--workers' in sys.argv else None
+    budget = float(sys.argv[sys.argv.index('--budget') + 1]) if '--budget' in sys.argv else ANYTIME_BUDGET
+
+    # Veriyi işle
+    print_debug("Veri işleme başlatılıyor...")
+    data_processor = DataProcessor("siparis.xlsx")
+    work_orders = data_processor.create_work_orders()
+    print_debug(f"Veri işleme tamamlandı. {len(work_orders)} iş emri oluşturuldu.")
+
+    if '--tune' in sys.argv:
+        tune(work_orders, max_workers=max_workers)
+        return
+
+    experiments = build_experiments()
+
+    # Experiment listesini satır satır consola yazdır
+    for i, exp in enumerate(experiments, start=1):
+        print(f"{i}: {exp}")
+
+    run_experiments(experiments, work_orders, max_workers=max_workers)
+
+    # Tüm sonuçları deney sırasıyla, zamana göre kalite özetiyle birlikte Excel'e kaydet
+    df = pd.read_csv(RESULTS_FILE).sort_values(["Deney No", "Tohum"])
+    checkpoints = load_checkpoints(checkpoints_path(RESULTS_FILE))
+    summary = summarize_anytime(df, checkpoints, budget=budget)
+    with pd.ExcelWriter("deney_sonuclari.xlsx") as writer:
+        df.to_excel(writer, sheet_name="Çalışmalar", index=False)
+        summary.to_excel(writer, sheet_name="Zamana Göre Kalite", index=False)
+    print_debug("✅ Tüm deneyler tamamlandı! Sonuçlar 'deney_sonuclari.xlsx' dosyasına kaydedildi.")
+
+    # --offline: grafik, raporlarla ortak çevrimdışı paketi kullanır
+    from visualizer import ScheduleVisualizer
+    visualizer = ScheduleVisualizer(asset_mode='offline' if '--offline' in sys.argv else 'cdn')
+    plot_results(df, checkpoints, summary, visualizer, budget=budget)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""Çok doğruluklu (multi-fidelity) değerlendirme: erken nesillerde örneklenmiş iş emirleri
+
+Erken nesillerde kaba bir sıralama yeterlidir. Birey yalnızca bir iş emri
+örnekleminin kendi içindeki göreli sırasına indirgenip (izdüşüm) çözümlenir;
+toplam süre örneklemin iş yükü payına göre ölçeklenir, değişim ve gecikme
+amaçları örneklemdeki iş sayısına bölünür. Örneklem oranı nesil takvimine
+göre artar, son nesiller tam evaluate_schedule ile değerlendirilir. Her
+nesilde en iyi bireyler (elit) ayrıca tam doğrulukla puanlanır; raporlanan
+en iyi değerler ve kontrol noktaları yalnızca bu tam değerlerden gelir.
+"""
+import random
+
+FIDELITY_METHODS = ('stratified', 'random')
+
+# Tam değerlendirmeden önceki örneklem oranları (nesil takviminde sırayla)
+FIDELITY_LEVELS = (0.2, 0.5)
+
+class MultiFidelity:
+    """Nesil takvimine göre örneklem seçer, bireyleri örneklem üzerinde değerlendirir
+
+    method: 'stratified' iş emirlerini varyant ailesi ve süreye göre sıralayıp
+    sistematik örnekler (her aile ve süre aralığı orantılı temsil edilir);
+    'random' düzgün rastgele örnekler.
+    levels: örneklem oranları; nesillerin ilk (1 - full_share) kısmı bunlara
+    eşit bölünür, kalan full_share kısmı tam doğrulukla değerlendirilir.
+    elite_size: her örneklemli nesilde tam puanlanan en iyi birey sayısı.
+    resample_every: aynı düzeyde örneklem bu kadar nesilde bir yenilenir
+    (tek örnekleme aşırı uyumu önler).
+    """
+
+    def __init__(self, scheduler, generations, method='stratified', levels=FIDELITY_LEVELS, full_share=0.3,
+                 elite_size=2, resample_every=10):
+        if method not in FIDELITY_METHODS:
+            raise ValueError(f"Bilinmeyen doğruluk yöntemi: {method} (seçenekler: {', '.join(FIDELITY_METHODS)})")
+        self.scheduler = scheduler
+        self.method = method
+        self.levels = tuple(level for level in levels if 0 < level < 1)
+        self.low_generations = int(generations * (1 - full_share))
+        self.elite_size = elite_size
+        self.resample_every = resample_every
+        self.total_duration = sum(order['duration'] for order in scheduler.work_orders)
+        # Tabakalı örnekleme sırası: aile, ardından süre
+        self.strata_order = sorted(range(len(scheduler.work_orders)),
+                                   key=lambda idx: (scheduler.order_codes[idx][0] or '',
+                                                    scheduler.work_orders[idx]['duration']))
+        self.fraction = 1.0
+        self.sample = None
+        self.scale = 1.0
+        self.drawn_at = None
+        self.best_objectives = None
+        self.best_permutation = None
+        self.stats = {'sampled_evaluations': 0, 'sampled_orders': 0, 'elite_evaluations': 0, 'resamples': 0}
+
+    @property
+    def exact(self):
+        """Geçerli düzey tam doğruluk mu"""
+        return self.sample is None
+
+    def level_at(self, generation):
+        """Nesildeki örneklem oranı (1.0: tam değerlendirme)"""
+        if not self.levels or generation >= self.low_generations:
+            return 1.0
+        span = self.low_generations / len(self.levels)
+        return self.levels[min(int(generation / span), len(self.levels) - 1)]
+
+    def draw_sample(self, fraction):
+        """Verilen oranda iş emri örneklemi (iş emri numaraları kümesi)"""
+        count = max(1, int(round(len(self.strata_order) * fraction)))
+        if self.method == 'random':
+            return set(random.sample(range(len(self.strata_order)), count))
+        step = len(self.strata_order) / count
+        offset = random.uniform(0, step)
+        return {self.strata_order[min(int(offset + k * step), len(self.strata_order) - 1)] for k in range(count)}
+
+    def advance(self, generation):
+        """Nesil başında düzeyi günceller; örneklem değiştiyse True döndürür
+
+        True dönerse önceki puanlar yeni düzeyle karşılaştırılamaz, popülasyon
+        yeniden değerlendirilmelidir.
+        """
+        fraction = self.level_at(generation)
+        if fraction >= 1.0:
+            if self.sample is None:
+                return False
+            self.fraction, self.sample, self.scale = 1.0, None, 1.0
+            return True
+        if (fraction == self.fraction and self.drawn_at is not None
+                and generation - self.drawn_at < self.resample_every):
+            return False
+        self.fraction = fraction
+        self.sample = self.draw_sample(fraction)
+        sample_duration = sum(self.scheduler.work_orders[idx]['duration'] for idx in self.sample)
+        self.scale = self.total_duration / sample_duration if sample_duration > 0 else 1.0 / fraction
+        self.drawn_at = generation
+        self.stats['resamples'] += 1
+        return True
+
+    def evaluate(self, individual):
+        """Bireyi geçerli düzeyde değerlendirir (tam düzeyde evaluate_schedule)
+
+        Örneklemli çözümleme, çözümlenen iş oranı kadar kesirli değerlendirme
+        olarak scheduler.evaluations'a eklenir (bkz. surrogate).
+        """
+        scheduler = self.scheduler
+        if self.sample is None:
+            return scheduler.evaluate_schedule(individual)
+        projected = [idx for idx in individual if idx in self.sample]
+        schedule = scheduler.decode(projected)
+        objectives = list(scheduler.score_schedule(schedule, job_count=len(projected)))
+        objectives[0] *= self.scale
+        scheduler.evaluations += len(projected) / len(scheduler.work_orders)
+        self.stats['sampled_evaluations'] += 1
+        self.stats['sampled_orders'] += len(projected)
+        return tuple(objectives)
+
+    def rescore_elite(self, population):
+        """En iyi elite_size bireyi tam doğrulukla puanlar; tam amaçlarını döndürür
+
+        Uygunluk değerleri (seçilim örneklem ölçeğinde kalsın diye)
+        değiştirilmez; şimdiye kadarki en iyi tam çözüm saklanır.
+        """
+        scheduler = self.scheduler
+        elite = sorted(population, key=lambda ind: ind.fitness, reverse=True)[:self.elite_size]
+        scored = []
+        for ind in elite:
+            objectives = scheduler.evaluate_schedule(ind)
+            self.stats['elite_evaluations'] += 1
+            scored.append(objectives)
+            self.observe(ind, objectives)
+        return min(scored, key=scheduler.weighted_fitness)
+
+    def observe(self, individual, objectives):
+        """Tam değerlendirilmiş bireyi en iyi tam çözümle karşılaştırır"""
+        weighted_fitness = self.scheduler.weighted_fitness
+        if self.best_objectives is None or weighted_fitness(objectives) < weighted_fitness(self.best_objectives):
+            self.best_objectives = tuple(objectives)
+            self.best_permutation = list(individual)
+
+    def summary(self):
+        """Örneklemli ve tam değerlendirme sayıları, çözümlenen iş emri tasarrufu"""
+        stats = self.stats
+        order_count = len(self.strata_order)
+        full_equivalent = stats['sampled_orders'] / order_count if order_count else 0.0
+        return {
+            'method': self.method,
+            'levels': list(self.levels),
+            'low_fidelity_generations': self.low_generations,
+            'sampled_evaluations': stats['sampled_evaluations'],
+            'elite_evaluations': stats['elite_evaluations'],
+            'resamples': stats['resamples'],
+            # Örneklemli değerlendirmelerin tam çözümleme karşılığı ve tasarruf edilen çözümleme sayısı
+            'full_decode_equivalent': round(full_equivalent, 1),
+            'saved_decodes': round(stats['sampled_evaluations'] - full_equivalent, 1)
+        }
@@ -1,44 +1,95 @@
 import random
-import numpy as np
-import pandas as pd
 from deap import base, creator, tools, algorithms
-from collections import defaultdict
-from datetime import datetime
 import time
+from collections import deque
+from datetime import datetime
+from schedule_timeline import TYPE_CHANGE_MINUTES, classify_codes, classify_type_change, order_code, new_timeline
 
 def print_timestamp(message):
     """Zaman damgalı mesaj yazdır"""
     current_time = time.strftime("%H:%M:%S")
     print(f"[{current_time}] {message}")
 
+# Varsayılan amaç ağırlıkları: (Toplam süre, yük dengesi, tip değişim sayısı)
+DEFAULT_WEIGHTS = (-2, -3, -10)
+
+def fitness_classes(weights):
+    """Verilen ağırlıklar için DEAP uygunluk ve birey sınıflarını döndürür
+
+    Varsayılan ağırlıklar FitnessMin/Individual adlarını kullanır; farklı
+    ağırlıklar için sınıflar ağırlıklardan türetilen adlarla bir kez oluşturulur.
+    """
+    weights = tuple(weights)
+    suffix = '' if weights == DEFAULT_WEIGHTS else '_' + '_'.join(str(w).replace('-', 'm').replace('.', 'p')
+                                                                 for w in weights)
+    fitness_name, individual_name = 'FitnessMin' + suffix, 'Individual' + suffix
+    if not hasattr(creator, fitness_name):
+        creator.create(fitness_name, base.Fitness, weights=weights)
+        creator.create(individual_name, list, fitness=getattr(creator, fitness_name))
+    return getattr(creator, fitness_name), getattr(creator, individual_name)
+
 class GeneticScheduler:
-    def __init__(self, work_orders, machines=10, population_size=50):
+    def __init__(self, work_orders, machines=10, population_size=50, weights=DEFAULT_WEIGHTS,
+                 stats_history=None, plan_start=None, tardiness_weights=None, tardiness_limit=None, calendar=None,
+                 split_orders=False, quiet=False):
+        """stats_history: bellekte tutulacak son nesil istatistiği sayısı (None ise tümü)
+
+        plan_start: plan başlangıç zamanı; verilirse çözücü her işin
+        bitişini hamTermin ile karşılaştırıp gecikmeleri aynı geçişte hesaplar.
+        tardiness_weights: (toplam gecikme, en büyük gecikme) ağırlıkları;
+        verilirse bu ikisi ek amaç olur (toplam gecikme iş emri başına).
+        tardiness_limit: en büyük gecikme bu kadar saati aşarsa aşan kısım
+        toplam süreye ceza olarak eklenir (kısıt).
+        calendar: makine kullanılabilirlik takvimi (bkz. machine_calendar);
+        verilirse işler kapalı aralıklara göre yerleştirilir.
+        split_orders: True ise iş emirlerinin 'max_splits' alanına göre
+        bölünmesine çözücü karar verir (bkz. split_pieces); iş emirleri
+        önceden bölünmeden (DataProcessor split_mode='decoder') verilmelidir.
+        quiet: True ise ilerleme satırları ve sonuç raporu yazdırılmaz
+        (ör. ayrıştırmanın işçi süreçlerindeki alt problemler).
+        """
         self.work_orders = work_orders
         self.machines = machines
         self.population_size = population_size
+        if (tardiness_weights is not None or tardiness_limit is not None) and plan_start is None:
+            raise ValueError("Gecikme amacı/kısıtı için plan_start gerekli")
+        self.tardiness_weights = tuple(tardiness_weights) if tardiness_weights is not None else None
+        self.tardiness_limit = tardiness_limit
+        self.calendar = calendar
+        self.quiet = quiet
+        self.split_limits = [order.get('max_splits', 1) for order in work_orders] if split_orders else None
+        self.weights = tuple(weights) + (self.tardiness_weights or ())
         self.debug_stats = {
-            'generation_stats': [],
+            'generation_stats': [] if stats_history is None else deque(maxlen=stats_history),
             'type_changes': {'VARYANT': 0, 'ULAK': 0, 'TAKIM': 0},
             'machine_loads': [],
-            'execution_times': []
+            'execution_times': [],
+            'anytime': []  # (geçen süre, değerlendirme sayısı, en iyi amaçlar) kontrol noktaları
         }
+        self.evaluations = 0
         
         # Genetik algoritma araçlarını hazırla
-        try:
-            creator.FitnessMin
-        except:
-            creator.create("FitnessMin", base.Fitness, weights=(-2, -3, -10))  # (Toplam süre, yük dengesi, tip değişim sayısı)
-            creator.create("Individual", list, fitness=creator.FitnessMin)
+        _, self.Individual = fitness_classes(self.weights)
         
         self.toolbox = base.Toolbox()
         self.toolbox.register("indices", random.sample, range(len(work_orders)), len(work_orders))
-        self.toolbox.register("individual", tools.initIterate, creator.Individual, self.toolbox.indices)
+        self.toolbox.register("individual", tools.initIterate, self.Individual, self.toolbox.indices)
         self.toolbox.register("population", tools.initRepeat, list, self.toolbox.individual)
         
         self.toolbox.register("mate", tools.cxUniformPartialyMatched, indpb=0.8)
         self.toolbox.register("mutate", tools.mutShuffleIndexes, indpb=0.05)
         self.toolbox.register("select", tools.selTournament, tournsize=10)
         self.toolbox.register("evaluate", self.evaluate_schedule)
+
+        # Tip değişimi ve sipariş kontrolleri için temizlenmiş kodlar (bir kez hesaplanır)
+        self.order_codes = [self.clean_codes(order) for order in work_orders]
+        self.codes_by_order = {id(order): codes for order, codes in zip(work_orders, self.order_codes)}
+        self.plan_start = datetime.fromisoformat(str(plan_start)) if plan_start is not None else None
+        self.due_hours = self.compute_due_hours() if plan_start is not None else None
+        self.best_schedule = None
+        self.last_population = None
+        self.bounds = self.lower_bounds()
+        self.debug_stats['lower_bounds'] = self.bounds
     
     def group_work_orders(self):
         """İş emirlerini varyant ve ulak kodlarına göre grupla"""
@@ -70,30 +121,51 @@ class GeneticScheduler:
         
         return groups
     
+    def clean_codes(self, order):
+        """İş emrinin temizlenmiş (varyant, ulak, sipariş) kodları"""
+        return order_code(order, 'varyantKodu'), order_code(order, 'ulakKodu'), order_code(order, 'siparisId')
+
+    def compute_due_hours(self):
+        """İş emirlerinin terminleri, plan başlangıcından itibaren saat olarak (termin yoksa None)"""
+        due_hours = []
+        for order in self.work_orders:
+            termin = order.get('hamTermin')
+            if termin is None or termin != termin:  # NaT
+                due_hours.append(None)
+            else:
+                due_hours.append((termin - self.plan_start).total_seconds() / 3600)
+        return due_hours
+
+    def codes_of(self, order):
+        """Kodları önceden hesaplanmış tablodan okur (tabloda yoksa hesaplar)"""
+        codes = self.codes_by_order.get(id(order))
+        return codes if codes is not None else self.clean_codes(order)
+
     def find_best_machine(self, order, machine_loads, machine_times):
         """En uygun makineyi bul"""
         avg_time = sum(machine_times) / len(machine_times)
         max_time = max(machine_times) if machine_times else 0
         min_time = min(machine_times) if machine_times else 0
         
-        current_variant = str(order.get('varyantKodu', '')).strip()
-        current_ulak = str(order.get('ulakKodu', '')).strip()
-        current_siparis_id = str(order.get('siparisId', '')).strip()
+        current_variant, current_ulak, current_siparis_id = self.codes_of(order)
         
-        if current_variant == '':
-            current_variant = None
-        if current_ulak == '':
-            current_ulak = None
-            
         # Aynı siparişin son planlandığı makineyi bul ve engelle
         blocked_machines = set()
         for i in range(self.machines):
             if machine_loads[i]:
                 last_three_orders = machine_loads[i][-3:]  # Son 3 işe bak
                 for prev_order in last_three_orders:
-                    if str(prev_order.get('siparisId', '')).strip() == current_siparis_id:
+                    if self.codes_of(prev_order)[2] == current_siparis_id:
                         blocked_machines.add(i)
                         break
+        # Süresiz arıza başlamadan işi bitiremeyecek makineler (en pahalı hazırlıkla)
+        unavailable = set()
+        if self.calendar is not None and self.calendar.open_ended:
+            setup_hours = TYPE_CHANGE_MINUTES['TAKIM'] / 60
+            unavailable = {i for i in range(self.machines)
+                           if self.calendar.schedule_block(i, machine_times[i], setup_hours,
+                                                           order['duration'])[1] == float('inf')}
+            blocked_machines.update(unavailable)
         
         # Yük dengesizliği kontrolü
         load_imbalance = max_time - min_time
@@ -112,14 +184,7 @@ class GeneticScheduler:
                 continue
                 
             if machine_loads[i]:
-                last_order = machine_loads[i][-1]
-                prev_variant = str(last_order.get('varyantKodu', '')).strip()
-                prev_ulak = str(last_order.get('ulakKodu', '')).strip()
-                
-                if prev_variant == '':
-                    prev_variant = None
-                if prev_ulak == '':
-                    prev_ulak = None
+                prev_variant, prev_ulak, _ = self.codes_of(machine_loads[i][-1])
                 
                 load_score = abs(machine_times[i] - avg_time) / (max_time + 1)
                 
@@ -160,14 +225,7 @@ class GeneticScheduler:
             # Tip değişim kontrolü
             type_change_score = 0
             if machine_loads[i]:
-                last_order = machine_loads[i][-1]
-                prev_variant = str(last_order.get('varyantKodu', '')).strip()
-                prev_ulak = str(last_order.get('ulakKodu', '')).strip()
-                
-                if prev_variant == '':
-                    prev_variant = None
-                if prev_ulak == '':
-                    prev_ulak = None
+                prev_variant, prev_ulak, _ = self.codes_of(machine_loads[i][-1])
                 
                 if not (current_variant and prev_variant and current_variant == prev_variant) and \
                    not (current_ulak and prev_ulak and current_ulak == prev_ulak):
@@ -177,35 +235,249 @@ class GeneticScheduler:
             machine_scores.append((i, total_score))
         
         # En düşük skorlu makineyi seç
-        best_machine, _ = min(machine_scores, key=lambda x: x[1])
+        best_machine, best_score = min(machine_scores, key=lambda x: x[1])
+        if best_score == float('inf') and unavailable and len(unavailable) < self.machines:
+            # Tüm makineler engelliyse sipariş engeli gevşetilir, arızalı makineye iş verilmez
+            best_machine = min((i for i in range(self.machines) if i not in unavailable),
+                               key=lambda i: machine_times[i])
         return best_machine
     
-    def evaluate_schedule(self, individual):
-        """Çizelgenin uygunluğunu değerlendir"""
-        machine_loads = [[] for _ in range(self.machines)]
-        machine_times = [0] * self.machines
-        total_changes = 0
-        parallel_penalties = 0
-        
+    def decode(self, individual, materialize=False, assignment=None, resume=None, snapshots=None,
+               snapshot_every=64):
+        """Bireyi tek geçişte çözümler: makine atamaları, bitiş zamanları ve sayaçlar
+
+        Zamanlar saat cinsindendir ve ilk takım hazırlığı ile tip değişim
+        süreleri dahildir. materialize=True ise her iş için sütunlu zaman
+        çizelgesi (makine, başlangıç, bitiş, değişim türü/dakikası, iş emri
+        indeksi) üretilir; analiz, Gantt ve dışa aktarım bunu okur.
+        assignment verilirse (sıradaki her iş için makine numarası) makine
+        seçimi yapılmaz, işler verilen makinelerde verilen sırayla çizelgelenir.
+        plan_start verilmişse her işin bitişi termini ile karşılaştırılır;
+        toplam/en büyük gecikme ve geciken iş sayısı aynı geçişte toplanır.
+        calendar verilmişse hazırlık ve üretim makinenin açık olduğu
+        aralıklara yerleştirilir; makine zamanları kapalı süreleri de içerir.
+        split_orders açıksa toplam süreyi uzatacak ya da termini kaçıracak
+        büyük işler o an boşta kalan makinelere bölünebilir (assignment
+        verildiğinde de ana parçanın makinesi assignment'tan gelir); zaman
+        çizelgesinde her parça ayrı satırdır, ana parça iş emrinin son satırıdır.
+
+        Artımlı değerlendirme için: snapshots sözlüğü verilirse her
+        snapshot_every konumda çözücü durumu (bkz. decoder_state) bu sözlüğe
+        yazılır; resume ile böyle bir durumdan devam edilir ve yalnızca o
+        konumdan sonraki işler çözümlenir. Devam edilen çözümde
+        machine_loads makine başına yalnızca son işleri içerir (puanlama için
+        yeterlidir); tam çizelge için baştan çözümlenmelidir.
+        """
+        if resume is None:
+            begin = 0
+            machine_loads = [[] for _ in range(self.machines)]
+            machine_times = [0.0] * self.machines
+            machine_last = [None] * self.machines
+            change_counts = {'VARYANT': 0, 'ULAK': 0, 'TAKIM': 0}
+            parallel_penalties = 0
+            tardiness = {'total': 0.0, 'max': 0.0, 'late_jobs': 0}
+        else:
+            begin = resume['position']
+            machine_loads = [list(tail) for tail in resume['machine_loads']]
+            machine_times = list(resume['machine_times'])
+            machine_last = list(resume['machine_last'])
+            change_counts = dict(resume['change_counts'])
+            parallel_penalties = resume['parallel_penalties']
+            tardiness = dict(resume['tardiness'])
+        timeline = new_timeline() if materialize else None
+        codes = self.order_codes
+        due_hours = self.due_hours
+        calendar = self.calendar
+        split_limits = self.split_limits
+
         # İş emirlerini makinalara dağıt
-        for idx in individual:
+        for position in range(begin, len(individual)):
+            if snapshots is not None and position % snapshot_every == 0:
+                snapshots[position] = self.decoder_state(position, machine_loads, machine_times, machine_last,
+                                                         change_counts, parallel_penalties, tardiness)
+            idx = individual[position]
             order = self.work_orders[idx]
-            best_machine = self.find_best_machine(order, machine_loads, machine_times)
+            if assignment is None:
+                best_machine = self.find_best_machine(order, machine_loads, machine_times)
+            else:
+                best_machine = assignment[position]
             machine_loads[best_machine].append(order)
-            
-            if len(machine_loads[best_machine]) > 1:
-                prev_order = machine_loads[best_machine][-2]
-                change_time = self.calculate_type_change_time(order, prev_order)
-                if change_time > 0:
-                    total_changes += 1
-                machine_times[best_machine] += change_time
-                
+
+            variant, ulak, siparis_id = codes[idx]
+            prev_idx = machine_last[best_machine]
+            if prev_idx is None:
+                change_type = 'TAKIM'  # İlk takım hazırlığı
+            else:
+                prev_variant, prev_ulak, prev_siparis_id = codes[prev_idx]
+                change_type = classify_codes(variant, ulak, prev_variant, prev_ulak)
+                change_counts[change_type] += 1
+
                 # Aynı sipariş kontrolü
-                if str(order.get('siparisId', '')).strip() == str(prev_order.get('siparisId', '')).strip():
+                if siparis_id == prev_siparis_id:
                     parallel_penalties += 1
-            
-            machine_times[best_machine] += order['duration']
-        
+            machine_last[best_machine] = idx
+
+            change_minutes = TYPE_CHANGE_MINUTES[change_type]
+            if calendar is None:
+                start = machine_times[best_machine] + change_minutes / 60
+                end = start + order['duration']
+            else:
+                start, end = calendar.schedule_block(best_machine, machine_times[best_machine], change_minutes / 60,
+                                                     order['duration'])
+            due = due_hours[idx] if due_hours is not None else None
+
+            # Bölme kararı: iş toplam süreyi uzatıyor ya da termini kaçırıyorsa
+            fraction, finish = 1.0, end
+            if (split_limits is not None and split_limits[idx] > 1
+                    and (end > max(machine_times) or (due is not None and end > due))):
+                pieces = self.split_pieces(idx, best_machine, start, machine_times, machine_last)
+                if pieces is not None:
+                    fraction, helpers = pieces
+                    if calendar is None:
+                        end = start + order['duration'] * fraction
+                    else:
+                        end = calendar.finish_time(best_machine, start, order['duration'] * fraction)
+                    finish = end
+                    for machine, piece_change, piece_fraction in helpers:
+                        machine_loads[machine].append(order)
+                        helper_prev = machine_last[machine]
+                        if helper_prev is not None:
+                            change_counts[piece_change] += 1
+                            if siparis_id == codes[helper_prev][2]:
+                                parallel_penalties += 1
+                        machine_last[machine] = idx
+                        piece_minutes = TYPE_CHANGE_MINUTES[piece_change]
+                        piece_duration = order['duration'] * piece_fraction
+                        if calendar is None:
+                            piece_start = machine_times[machine] + piece_minutes / 60
+                            piece_end = piece_start + piece_duration
+                        else:
+                            piece_start, piece_end = calendar.schedule_block(machine, machine_times[machine],
+                                                                             piece_minutes / 60, piece_duration)
+                        machine_times[machine] = piece_end
+                        finish = max(finish, piece_end)
+                        if timeline is not None:
+                            timeline['order_index'].append(idx)
+                            timeline['machine'].append(machine)
+                            timeline['start'].append(piece_start)
+                            timeline['end'].append(piece_end)
+                            timeline['change_type'].append(piece_change)
+                            timeline['change_minutes'].append(piece_minutes)
+                            timeline['tardiness'].append(max(piece_end - due, 0.0) if due is not None else 0.0)
+                            timeline['fraction'].append(piece_fraction)
+            machine_times[best_machine] = end
+
+            # Gecikme iş emrinin son parçasının bitişine göre
+            late = 0.0
+            if due is not None and finish > due:
+                late = finish - due
+                tardiness['total'] += late
+                tardiness['late_jobs'] += 1
+                if late > tardiness['max']:
+                    tardiness['max'] = late
+
+            if timeline is not None:
+                timeline['order_index'].append(idx)
+                timeline['machine'].append(best_machine)
+                timeline['start'].append(start)
+                timeline['end'].append(end)
+                timeline['change_type'].append(change_type)
+                timeline['change_minutes'].append(change_minutes)
+                timeline['tardiness'].append(max(end - due, 0.0) if due is not None else 0.0)
+                timeline['fraction'].append(fraction)
+
+        return {
+            'machine_loads': machine_loads,
+            'machine_times': machine_times,
+            'change_counts': change_counts,
+            'total_changes': sum(change_counts.values()),
+            'parallel_penalties': parallel_penalties,
+            'total_tardiness': tardiness['total'],
+            'max_tardiness': tardiness['max'],
+            'late_jobs': tardiness['late_jobs'],
+            'timeline': timeline
+        }
+
+    def split_pieces(self, idx, primary, start, machine_times, machine_last):
+        """İş emrini başka makinelere bölmenin bitişi öne çekip çekmediğini belirler
+
+        Parçalar ortak bir bitiş anına göre paylaştırılır (su doldurma):
+        diğer makineler hazırlık sonrası başlayabilecekleri ana göre sıralanır
+        ve ortak bitişten önce başlayabilenler, parça sayısı 'max_splits'i ve
+        en küçük parça 'min_split_quantity' metreyi aşmadıkça eklenir. Bölme
+        yararsızsa None; aksi halde (ana makinenin payı, [(makine, değişim
+        türü, pay), ...]) döndürür.
+        """
+        order = self.work_orders[idx]
+        duration = order['duration']
+        if duration <= 0 or not order['quantity']:
+            return None
+        variant, ulak, _ = self.order_codes[idx]
+        candidates = []
+        for machine in range(self.machines):
+            if machine == primary:
+                continue
+            prev_idx = machine_last[machine]
+            if prev_idx is None:
+                change_type = 'TAKIM'
+            else:
+                change_type = classify_codes(variant, ulak, *self.order_codes[prev_idx][:2])
+            setup_hours = TYPE_CHANGE_MINUTES[change_type] / 60
+            if self.calendar is None:
+                piece_start = machine_times[machine] + setup_hours
+            else:
+                # Süresiz arızadan önce işin tamamını bitiremeyecek makineye parça verilmez
+                piece_start, whole_end = self.calendar.schedule_block(machine, machine_times[machine], setup_hours,
+                                                                      duration)
+                if whole_end == float('inf'):
+                    continue
+            candidates.append((piece_start, machine, change_type))
+        candidates.sort()
+
+        min_fraction = order.get('min_split_quantity', 0) / order['quantity']
+        starts, helpers = [start], []
+        finish = start + duration
+        for piece_start, machine, change_type in candidates:
+            if len(starts) >= self.split_limits[idx] or piece_start >= finish:
+                break
+            trial_finish = (duration + sum(starts) + piece_start) / (len(starts) + 1)
+            # En küçük parça en geç başlayan makinededir
+            if (trial_finish - max(max(starts), piece_start)) / duration < min_fraction:
+                break
+            starts.append(piece_start)
+            helpers.append((machine, change_type, piece_start))
+            finish = trial_finish
+        if not helpers:
+            return None
+        return (finish - start) / duration, [(machine, change_type, (finish - piece_start) / duration)
+                                             for machine, change_type, piece_start in helpers]
+
+    def decoder_state(self, position, machine_loads, machine_times, machine_last, change_counts, parallel_penalties,
+                      tardiness):
+        """Çözücünün verilen konumdaki durumunun kopyası
+
+        Makine seçimi yalnızca makinelerdeki son işlere baktığından makine
+        başına son üç iş saklanır.
+        """
+        return {
+            'position': position,
+            'machine_loads': [load[-3:] for load in machine_loads],
+            'machine_times': list(machine_times),
+            'machine_last': list(machine_last),
+            'change_counts': dict(change_counts),
+            'parallel_penalties': parallel_penalties,
+            'tardiness': dict(tardiness)
+        }
+
+    def score_schedule(self, schedule, job_count=None):
+        """Çözümlenmiş çizelgenin amaç değerlerini hesaplar
+
+        job_count: iş emri başına amaçların böleni; çizelge iş emirlerinin
+        yalnızca bir kısmından çözümlendiyse (bkz. fidelity) o kısmın sayısı.
+        """
+        job_count = job_count or len(self.work_orders)
+        machine_times = schedule['machine_times']
+
         # Toplam üretim süresi
         total_time = max(machine_times)
         
@@ -221,54 +493,139 @@ class GeneticScheduler:
         balance_score = (load_variance / (avg_time ** 2)) * (1 + empty_machines * 2 + overloaded_machines)
         
         # Paralel üretim cezası
-        parallel_score = parallel_penalties / len(self.work_orders)
+        parallel_score = schedule['parallel_penalties'] / job_count
         
-        return total_time, balance_score + parallel_score * 2, total_changes / len(self.work_orders)
+        # Gecikme kısıtı: sınırı aşan en büyük gecikme toplam süreye ceza olarak eklenir
+        if self.tardiness_limit is not None and schedule['max_tardiness'] > self.tardiness_limit:
+            total_time += schedule['max_tardiness'] - self.tardiness_limit
+
+        objectives = (total_time, balance_score + parallel_score * 2,
+                      schedule['total_changes'] / job_count)
+        if self.tardiness_weights is not None:
+            objectives += (schedule['total_tardiness'] / job_count, schedule['max_tardiness'])
+        return objectives
+
+    def lower_bounds(self):
+        """Toplam süre ve tip değişimi için ucuz alt sınırlar
+
+        Kullanılan her makine bir ilk takım hazırlığı, diğer her iş en az bir
+        varyant değişimi gerektirir; bir makinede k farklı varyant ailesi
+        varsa en az k-1 değişim varyant değişiminden pahalıdır (en az ULAK).
+        Toplam süre alt sınırı, k makine kullanımı için (toplam iş + en az
+        hazırlık) / k değerlerinin en küçüğü ile en uzun iş + ilk hazırlığın
+        büyüğüdür.
+        """
+        job_count = len(self.work_orders)
+        if job_count == 0:
+            return {'makespan': 0.0, 'longest_job': 0.0, 'total_work': 0.0, 'families': 0,
+                    'min_family_changes': 0, 'changes': 0.0}
+        durations = [order['duration'] for order in self.work_orders]
+        if self.split_limits is not None:
+            # Bölünebilen işin en uzun parçası en az süre / en fazla parça sayısıdır
+            durations = [duration / limit for duration, limit in zip(durations, self.split_limits)]
+        total_work = sum(order['duration'] for order in self.work_orders)
+        families = len({codes[0] for codes in self.order_codes if codes[0]})
+        first_setup = TYPE_CHANGE_MINUTES['TAKIM'] / 60
+        min_change = TYPE_CHANGE_MINUTES['VARYANT'] / 60
+        family_change = min(TYPE_CHANGE_MINUTES['ULAK'], TYPE_CHANGE_MINUTES['TAKIM']) / 60
+
+        def min_setup(used):
+            return (used * first_setup + (job_count - used) * min_change
+                    + max(families - used, 0) * (family_change - min_change))
+
+        usable = min(self.machines, job_count)
+        load_bound = min((total_work + min_setup(used)) / used for used in range(1, usable + 1))
+        return {
+            'makespan': max(max(durations) + first_setup, load_bound),
+            'longest_job': max(durations) + first_setup,
+            'total_work': total_work,
+            'families': families,
+            'min_family_changes': max(families - usable, 0),
+            'changes': (job_count - usable) / job_count  # tip değişim amacı (değişim / iş emri)
+        }
+
+    def optimality_gap(self, makespan):
+        """Toplam sürenin alt sınıra göre göreli boşluğu"""
+        bound = self.bounds['makespan']
+        return (makespan - bound) / bound if bound > 0 else 0.0
+
+    def evaluate_schedule(self, individual):
+        """Çizelgenin uygunluğunu değerlendir"""
+        self.evaluations += 1
+        return self.score_schedule(self.decode(individual))
+
+    def weighted_fitness(self, objectives):
+        """Amaç değerlerinin ağırlıklı toplamı (küçük olan daha iyi)"""
+        return -sum(w * v for w, v in zip(self.weights, objectives))
+
+    def record_checkpoint(self, population, start_time):
+        """O ana kadarki en iyi çözümü zaman ve değerlendirme sayısıyla kaydeder"""
+        self.add_checkpoint(tools.selBest(population, 1)[0].fitness.values, start_time)
+
+    def add_checkpoint(self, objectives, start_time):
+        """Verilen amaçlar şimdiye kadarkinden iyiyse onları, değilse öncekini kaydeder"""
+        checkpoints = self.debug_stats['anytime']
+        fitness = self.weighted_fitness(objectives)
+        if checkpoints and checkpoints[-1]['best_fitness'] <= fitness:
+            best_objectives, fitness = checkpoints[-1]['best_objectives'], checkpoints[-1]['best_fitness']
+        else:
+            best_objectives = list(objectives)
+        checkpoints.append({
+            'elapsed': time.time() - start_time,
+            'evaluations': self.evaluations,
+            'best_fitness': fitness,
+            'best_objectives': best_objectives
+        })
     
     def calculate_type_change_time(self, current_order, prev_order):
-        """İki iş emri arasındaki tip değişim süresini hesapla"""
-        if not prev_order:
-            return 180  # İlk iş için takım değişimi
-            
-        # Varyant ve ulak kodlarını al ve temizle
-        current_variant = str(current_order.get('varyantKodu', '')).strip()
-        current_ulak = str(current_order.get('ulakKodu', '')).strip()
-        prev_variant = str(prev_order.get('varyantKodu', '')).strip()
-        prev_ulak = str(prev_order.get('ulakKodu', '')).strip()
-        
-        # Boş değer kontrolü
-        if current_variant == '':
-            current_variant = None
-        if current_ulak == '':
-            current_ulak = None
-        if prev_variant == '':
-            prev_variant = None
-        if prev_ulak == '':
-            prev_ulak = None
-        
-        # Eğer herhangi bir kod boş ise takım değişimi
-        if not current_variant or not prev_variant:
-            return 180  # Takım değişimi
-        
-        # Varyant kodu eşleşmesi
-        if current_variant == prev_variant:
-            return 30  # Varyant değişimi
-        
-        # Ulak kodu eşleşmesi
-        if current_ulak and prev_ulak and current_ulak == prev_ulak:
-            return 120  # Ulak değişimi
-            
-        return 180  # Takım değişimi
+        """İki iş emri arasındaki tip değişim süresini hesapla (dakika)"""
+        return TYPE_CHANGE_MINUTES[classify_type_change(current_order, prev_order)]
     
-    def optimize(self, generations=100):
-        """Genetik algoritma ile çizelgeyi optimize et"""
-        print_timestamp("\nOptimizasyon başlıyor...")
+    def optimize(self, generations=100, initial_population=None, on_generation=None, cxpb=0.8, mutpb=0.2,
+                 seed=None, callbacks=(), gap_tolerance=None, surrogate=None, screen_fraction=0.5,
+                 adaptive=False, diversity_threshold=None, immigrant_rate=0.2, fidelity=None,
+                 fidelity_levels=None):
+        """Genetik algoritma ile çizelgeyi optimize et
+
+        initial_population: önceki bir çalışmadan kalan permütasyonlar (sıcak
+        başlangıç); eksik kalan bireyler rastgele üretilir.
+        on_generation: her nesil sonunda nesil istatistik kaydıyla çağrılır.
+        cxpb, mutpb: çaprazlama ve mutasyon olasılıkları.
+        seed: verilirse rastgele sayı üreteci bu tohumla başlatılır.
+        callbacks: her nesil sonunda ilerleme kaydıyla çağrılan alıcılar
+        (bkz. progress_sinks); biri True döndürürse optimizasyon durur.
+        gap_tolerance: en iyi toplam sürenin alt sınıra göreli boşluğu bu
+        değere inince optimizasyon durur (ör. 0.05 = %5).
+        surrogate: 'prefix' ya da 'regression' verilirse değişen yavrular önce
+        vekille tahmin edilir, yalnızca en iyi screen_fraction kısmı tam
+        değerlendirilir; elenen yavrunun yerine ebeveyni kalır (bkz. surrogate).
+        adaptive: True ise cxpb/mutpb, çaprazlama operatörü ve mutasyon indpb
+        sabit değil, yavruların iyileşme oranına göre nesil nesil seçilir
+        (bkz. operator_control); oran geçmişi debug_stats['operator_rates'].
+        diversity_threshold: verilirse kopya yavrular değerlendirmeden önce
+        göçmenlerle değiştirilir, değerlendirilmiş permütasyonlar yeniden
+        çözümlenmez; konum farkı oranı eşiğin altına inince immigrant_rate
+        kadar birey yenilenir (bkz. diversity). Ölçümler debug_stats['diversity'].
+        fidelity: 'stratified' ya da 'random' verilirse erken nesiller iş
+        emirlerinin bir örneklemi üzerinde değerlendirilir; örneklem oranı
+        fidelity_levels takvimiyle artar, son nesiller tam değerlendirilir.
+        Her örneklemli nesilde elit tam puanlanır; en iyi değerler ve kontrol
+        noktaları tam değerlerdir (bkz. fidelity). Nesil kayıtlarının
+        'fidelity' alanı örneklem oranıdır; örneklemli nesillerde
+        avg_fitness tam değer olmadığından None'dır.
+        """
+        self.log("\nOptimizasyon başlıyor...")
+        if seed is not None:
+            random.seed(seed)
         
         # Başlangıç zamanı
         start_time = time.time()
         
-        print_timestamp("İlk popülasyon oluşturuluyor")
+        self.log("İlk popülasyon oluşturuluyor")
         pop = self.toolbox.population(n=self.population_size)
+        if initial_population:
+            seeds = [self.check_permutation(perm) for perm in initial_population[:self.population_size]]
+            pop[:len(seeds)] = [self.Individual(perm) for perm in seeds]
         
         # İstatistikler için
         stats = tools.Statistics(lambda ind: ind.fitness.values)
@@ -276,82 +633,231 @@ class GeneticScheduler:
         stats.register("min_balance", lambda x: min(x, key=lambda y: y[1])[1])
         stats.register("min_changes", lambda x: min(x, key=lambda y: y[2])[2])
         
+        multi_fidelity = None
+        if fidelity is not None:
+            from fidelity import MultiFidelity, FIDELITY_LEVELS
+            multi_fidelity = MultiFidelity(self, generations, method=fidelity,
+                                           levels=fidelity_levels or FIDELITY_LEVELS)
+            multi_fidelity.advance(0)
+            # Vekil ön eleme ve çeşitlilik denetimi de geçerli düzeyde değerlendirir
+            self.toolbox.register("evaluate", multi_fidelity.evaluate)
+
         # İlk nesli değerlendir
         fitnesses = list(map(self.toolbox.evaluate, pop))
         for ind, fit in zip(pop, fitnesses):
             ind.fitness.values = fit
+        if multi_fidelity is None or multi_fidelity.exact:
+            self.record_checkpoint(pop, start_time)
+            if multi_fidelity is not None:
+                # Nesil çalışmasa da tam puanlanmış bir en iyi çözüm bulunur
+                best_initial = tools.selBest(pop, 1)[0]
+                multi_fidelity.observe(best_initial, best_initial.fitness.values)
+        else:
+            self.add_checkpoint(multi_fidelity.rescore_elite(pop), start_time)
         
         # Debug için en iyi değerleri sakla
         best_fitness = float('inf')
+        screen = None
+        if surrogate is not None:
+            from surrogate import SurrogateScreen
+            screen = SurrogateScreen(self, method=surrogate, fraction=screen_fraction)
+        operators = None
+        if adaptive:
+            from operator_control import AdaptiveOperators
+            operators = AdaptiveOperators()
+            self.debug_stats['operator_rates'] = []
+        diversity = None
+        if diversity_threshold is not None:
+            from diversity import DiversityControl
+            diversity = DiversityControl(diversity_threshold, immigrant_rate)
+            self.debug_stats['diversity'] = diversity.history
         
         # Nesilleri evolve et
         for gen in range(1, generations + 1):
             gen_start_time = time.time()
+            if multi_fidelity is not None and multi_fidelity.advance(gen):
+                # Örneklem ya da düzey değişti: ebeveynler yeni düzeyde yeniden puanlanır
+                for ind in pop:
+                    ind.fitness.values = self.toolbox.evaluate(ind)
             
-            offspring = algorithms.varAnd(pop, self.toolbox, cxpb=0.8, mutpb=0.2)
-            fitnesses = list(map(self.toolbox.evaluate, offspring))
-            for ind, fit in zip(offspring, fitnesses):
-                ind.fitness.values = fit
+            if operators is None:
+                offspring = algorithms.varAnd(pop, self.toolbox, cxpb=cxpb, mutpb=mutpb)
+            else:
+                offspring, origins = operators.vary(pop, self.toolbox)
+            if diversity is not None:
+                _, replaced = diversity.apply(gen, pop, offspring, self.toolbox.individual)
+                if operators is not None:
+                    for i in replaced:
+                        origins[i] = []  # göçmenler operatörlere ödül/ceza yazmaz
+            if screen is None:
+                # Uygunluğu geçerli olanlar (değişmemiş ya da önbellekten kopyalanmış) yeniden çözümlenmez
+                targets = [ind for ind in offspring if not ind.fitness.valid]
+                fitnesses = list(map(self.toolbox.evaluate, targets))
+                for ind, fit in zip(targets, fitnesses):
+                    ind.fitness.values = fit
+            else:
+                self.screen_offspring(screen, pop, offspring)
+            if operators is not None:
+                self.debug_stats['operator_rates'].append(
+                    operators.reward(gen, pop, offspring, origins, self.weighted_fitness))
             
             # En iyi bireyi bul ve istatistikleri kaydet
             best_ind = tools.selBest(offspring, 1)[0]
             current_best = best_ind.fitness.values[0]
+            elite_objectives = None
+            if multi_fidelity is not None:
+                if multi_fidelity.exact:
+                    multi_fidelity.observe(best_ind, best_ind.fitness.values)
+                else:
+                    # Örneklem puanı yalnızca sıralama içindir; en iyi değer elitin tam puanından gelir
+                    elite_objectives = multi_fidelity.rescore_elite(offspring)
+                    current_best = elite_objectives[0]
             
             if current_best < best_fitness:
                 best_fitness = current_best
             
             # Nesil istatistiklerini kaydet
-            self.debug_stats['generation_stats'].append({
+            gen_stats = {
                 'generation': gen,
                 'best_fitness': best_fitness,
-                'avg_fitness': sum(ind.fitness.values[0] for ind in offspring) / len(offspring),
-                'execution_time': time.time() - gen_start_time
-            })
+                'avg_fitness': (sum(ind.fitness.values[0] for ind in offspring) / len(offspring)
+                                if elite_objectives is None else None),
+                'execution_time': time.time() - gen_start_time,
+                'gap': self.optimality_gap(best_fitness)
+            }
+            if multi_fidelity is not None:
+                gen_stats['fidelity'] = multi_fidelity.fraction
             
             pop[:] = offspring
-            
-            if gen % 10 == 0:
-                print_timestamp(f"Nesil {gen}: En iyi fitness = {best_fitness:.2f}")
-        
+            if elite_objectives is None:
+                self.record_checkpoint(pop, start_time)
+            else:
+                self.add_checkpoint(elite_objectives, start_time)
+            if self.finish_generation(gen_stats, on_generation, callbacks, gap_tolerance):
+                break
+        
+        if screen is not None:
+            self.debug_stats['surrogate'] = screen.summary()
+            self.log(f"Vekil ön eleme: {self.debug_stats['surrogate']}")
+        if diversity is not None:
+            self.debug_stats['saved_evaluations'] = diversity.saved_evaluations
+            self.log(f"Çeşitlilik denetimi: {diversity.saved_evaluations} değerlendirme tasarruf edildi, "
+                            f"{sum(r['duplicates'] for r in diversity.history)} kopya ve "
+                            f"{sum(r['immigrants'] for r in diversity.history)} göçmen değiştirildi")
+
+        best_ind = tools.selBest(pop, 1)[0]
+        if multi_fidelity is not None:
+            self.toolbox.register("evaluate", self.evaluate_schedule)
+            self.debug_stats['fidelity'] = multi_fidelity.summary()
+            self.log(f"Çok doğruluklu değerlendirme: {self.debug_stats['fidelity']}")
+            # Örneklemli düzeyde durulmuş olabilir (puanlar yaklaşık): tam puanlanmış en iyi çözüm kullanılır
+            best_ind = self.Individual(multi_fidelity.best_permutation)
+
+        # Son popülasyon sonraki çalışmalarda sıcak başlangıç için saklanır
+        self.last_population = [list(ind) for ind in pop]
+
         # En iyi çözümü analiz et
-        best_solution = self.analyze_best_solution(tools.selBest(pop, 1)[0])
+        best_solution = self.analyze_best_solution(best_ind)
         
         return best_solution
     
-    def analyze_best_solution(self, best_ind):
+    def screen_offspring(self, screen, pop, offspring):
+        """Değişen yavruları vekille eler, seçilenleri tam değerlendirir
+
+        varAnd yavruları ebeveynleriyle aynı sırada üretir; değişmeyen
+        yavrunun fitness'ı geçerlidir, elenen yavrunun yerine ebeveyni konur.
+        """
+        changed = [i for i, ind in enumerate(offspring) if not ind.fitness.valid]
+        if not changed:
+            return
+        chosen, estimates, features = screen.select([offspring[i] for i in changed])
+        actual = []
+        for k in chosen:
+            ind = offspring[changed[k]]
+            ind.fitness.values = self.toolbox.evaluate(ind)
+            actual.append(self.weighted_fitness(ind.fitness.values))
+        screen.observe([estimates[k] for k in chosen], actual,
+                       [features[k] for k in chosen] if features is not None else None)
+        for k in set(range(len(changed))) - set(chosen):
+            offspring[changed[k]] = pop[changed[k]]
+
+    def finish_generation(self, gen_stats, on_generation=None, callbacks=(), gap_tolerance=None):
+        """Nesil sonu işleri: istatistiği kaydet, bildir, durdurma koşullarını denetle
+
+        Son kontrol noktası önceden kaydedilmiş olmalıdır. Optimizasyon
+        durmalıysa True döndürür.
+        """
+        gen = gen_stats['generation']
+        self.debug_stats['generation_stats'].append(gen_stats)
+        if on_generation is not None:
+            on_generation(gen_stats)
+
+        if gen % 10 == 0:
+            self.log(f"Nesil {gen}: En iyi fitness = {gen_stats['best_fitness']:.2f} "
+                            f"(alt sınıra boşluk: %{gen_stats['gap'] * 100:.1f})")
+
+        # İlerleme alıcıları: küçük nesil kaydı, biri True döndürürse dur
+        if callbacks:
+            record = self.progress_record(gen_stats)
+            stop_requested = [bool(callback(record)) for callback in callbacks]
+            if any(stop_requested):
+                self.debug_stats['stopped_at'] = gen
+                self.log(f"Nesil {gen}: Durdurma sinyali alındı, optimizasyon sonlandırılıyor")
+                return True
+
+        if gap_tolerance is not None and gen_stats['gap'] <= gap_tolerance:
+            self.debug_stats['stopped_at'] = gen
+            self.log(f"Nesil {gen}: Alt sınıra boşluk %{gen_stats['gap'] * 100:.1f}, "
+                            f"tolerans içinde; optimizasyon sonlandırılıyor")
+            return True
+        return False
+
+    def progress_record(self, gen_stats):
+        """İlerleme alıcılarına giden nesil kaydı: nesil istatistiği ve son kontrol noktası"""
+        checkpoint = self.debug_stats['anytime'][-1]
+        return dict(gen_stats, elapsed=checkpoint['elapsed'], evaluations=checkpoint['evaluations'],
+                    best_objectives=checkpoint['best_objectives'])
+
+    def log(self, message):
+        """quiet değilse zaman damgalı mesaj yazdırır"""
+        if not self.quiet:
+            print_timestamp(message)
+
+    def check_permutation(self, perm):
+        """Permütasyonun tüm iş emirlerini tam bir kez içerdiğini doğrular"""
+        perm = list(perm)
+        if len(perm) != len(self.work_orders) or set(perm) != set(range(len(self.work_orders))):
+            raise ValueError("Başlangıç bireyi iş emirlerinin geçerli bir permütasyonu değil")
+        return perm
+
+    def analyze_best_solution(self, best_ind, assignment=None):
         """En iyi çözümün detaylı analizini yapar"""
-        machine_loads = [[] for _ in range(self.machines)]
-        machine_times = [0] * self.machines
-        machine_stats = {i: {'total_time': 0, 'job_count': 0, 'type_changes': 0} for i in range(self.machines)}
-        
-        for idx in best_ind:
-            order = self.work_orders[idx]
-            best_machine = self.find_best_machine(order, machine_loads, machine_times)
-            machine_loads[best_machine].append(order)
-            machine_stats[best_machine]['job_count'] += 1
-            
-            if len(machine_loads[best_machine]) > 1:
-                prev_order = machine_loads[best_machine][-2]
-                change_time = self.calculate_type_change_time(order, prev_order)
-                
-                if change_time == 30:
-                    self.debug_stats['type_changes']['VARYANT'] += 1
-                elif change_time == 120:
-                    self.debug_stats['type_changes']['ULAK'] += 1
-                else:
-                    self.debug_stats['type_changes']['TAKIM'] += 1
-                
-                machine_times[best_machine] += change_time
-                machine_stats[best_machine]['type_changes'] += 1
-            
-            machine_times[best_machine] += order['duration']
-            machine_stats[best_machine]['total_time'] = machine_times[best_machine]
+        schedule = self.decode(best_ind, materialize=True, assignment=assignment)
+        self.best_schedule = schedule
+        machine_loads = schedule['machine_loads']
+        machine_stats = {}
+        for i in range(self.machines):
+            machine_stats[i] = {
+                'total_time': schedule['machine_times'][i],
+                'job_count': len(machine_loads[i]),
+                'type_changes': max(len(machine_loads[i]) - 1, 0)
+            }
+        for change_type, count in schedule['change_counts'].items():
+            self.debug_stats['type_changes'][change_type] += count
         
         # Makine yükü istatistiklerini kaydet
         self.debug_stats['machine_loads'] = machine_stats
+        if self.quiet:
+            return machine_loads
         
         print("\n=== Optimizasyon Sonuçları ===")
         print(f"Toplam İş Emri Sayısı: {len(self.work_orders)}")
+        makespan = max(schedule['machine_times'])
+        print(f"Toplam Süre: {makespan:.2f} saat (alt sınır: {self.bounds['makespan']:.2f} saat, "
+              f"boşluk: %{self.optimality_gap(makespan) * 100:.1f})")
+        if self.due_hours is not None:
+            print(f"Gecikme: toplam {schedule['total_tardiness']:.2f} saat, en büyük "
+                  f"{schedule['max_tardiness']:.2f} saat, geciken iş {schedule['late_jobs']}")
         print("\nTip Değişim İstatistikleri:")
         for change_type, count in self.debug_stats['type_changes'].items():
             print(f"{change_type}: {count}")
@@ -0,0 +1,169 @@
+"""Tek çözüm üzerinde çalışan yerel arama motorları (benzetimli tavlama, tabu arama)
+
+GeneticScheduler ile aynı permütasyon gösterimini ve çözücüyü kullanır;
+çıktılar (best_schedule, debug_stats, machine_loads) aynıdır.
+"""
+import math
+import random
+import time
+from genetic_algorithm import DEFAULT_WEIGHTS, GeneticScheduler, print_timestamp
+
+# Seçilebilir motorlar
+ENGINES = ('ga', 'array', 'annealing', 'tabu', 'constructive')
+
+def create_scheduler(engine, work_orders, machines=10, population_size=50, **kwargs):
+    """Motor adına göre zamanlayıcıyı oluşturur ('ga', 'array', 'annealing', 'tabu', 'constructive')"""
+    if engine == 'ga':
+        return GeneticScheduler(work_orders, machines=machines, population_size=population_size, **kwargs)
+    if engine in ('annealing', 'tabu'):
+        return LocalSearchScheduler(work_orders, machines=machines, population_size=population_size,
+                                    method=engine, **kwargs)
+    if engine == 'array':
+        from array_ga import ArrayGeneticScheduler
+        return ArrayGeneticScheduler(work_orders, machines=machines, population_size=population_size, **kwargs)
+    if engine == 'constructive':
+        from constructive import ConstructiveScheduler
+        return ConstructiveScheduler(work_orders, machines=machines, population_size=population_size, **kwargs)
+    raise ValueError(f"Bilinmeyen motor: {engine} (seçenekler: {', '.join(ENGINES)})")
+
+class LocalSearchScheduler(GeneticScheduler):
+    """Permütasyon üzerinde takas/yer değiştirme hamleleriyle yerel arama
+
+    Hamleler artımlı değerlendirilir: çözücü durumu her snapshot_every
+    konumda saklanır ve aday yalnızca değişen ilk konumdan önceki en yakın
+    durumdan itibaren çözümlenir. Bütçe GA ile karşılaştırılabilir olsun
+    diye bir "nesil" population_size değerlendirmedir.
+    """
+
+    def __init__(self, work_orders, machines=10, population_size=50, weights=DEFAULT_WEIGHTS, method='annealing',
+                 snapshot_every=32, tabu_candidates=20, tabu_tenure=15, **kwargs):
+        super().__init__(work_orders, machines=machines, population_size=population_size, weights=weights,
+                         **kwargs)
+        if method not in ('annealing', 'tabu'):
+            raise ValueError(f"Bilinmeyen yerel arama yöntemi: {method}")
+        self.method = method
+        self.snapshot_every = snapshot_every
+        self.tabu_candidates = tabu_candidates
+        self.tabu_tenure = tabu_tenure
+
+    def evaluate_from(self, perm, snapshots, first_changed):
+        """Permütasyonu değişen ilk konumdan önceki durumdan çözümler
+
+        (amaçlar, ağırlıklı fitness, yeni durum kopyaları) döndürür.
+        """
+        position = first_changed - first_changed % self.snapshot_every
+        new_snapshots = {}
+        schedule = self.decode(perm, resume=snapshots[position], snapshots=new_snapshots,
+                               snapshot_every=self.snapshot_every)
+        self.evaluations += 1
+        objectives = self.score_schedule(schedule)
+        return objectives, self.weighted_fitness(objectives), new_snapshots
+
+    def random_move(self, perm):
+        """Rastgele takas ya da yer değiştirme; (yeni permütasyon, değişen ilk konum, taşınan iş)"""
+        i, j = random.sample(range(len(perm)), 2)
+        candidate = perm[:]
+        if random.random() < 0.5:
+            candidate[i], candidate[j] = candidate[j], candidate[i]
+        else:
+            candidate.insert(j, candidate.pop(i))
+        return candidate, min(i, j), perm[i]
+
+    def optimize(self, generations=100, initial_population=None, on_generation=None, seed=None, callbacks=(),
+                 gap_tolerance=None, time_limit=None, **kwargs):
+        """Yerel arama ile çizelgeyi optimize et
+
+        generations * population_size değerlendirme ya da time_limit saniye
+        (hangisi önce dolarsa) çalışır. initial_population verilirse ilk
+        permütasyon başlangıç çözümü olur. GA'ya özgü parametreler (cxpb,
+        mutpb) yok sayılır.
+        """
+        print_timestamp(f"\nYerel arama ({self.method}) başlıyor...")
+        if seed is not None:
+            random.seed(seed)
+        start_time = time.time()
+        job_count = len(self.work_orders)
+
+        if initial_population:
+            current = self.check_permutation(initial_population[0])
+        else:
+            current = random.sample(range(job_count), job_count)
+        snapshots = {}
+        current_objectives = self.score_schedule(self.decode(current, snapshots=snapshots,
+                                                             snapshot_every=self.snapshot_every))
+        self.evaluations += 1
+        current_fitness = self.weighted_fitness(current_objectives)
+        best, best_objectives, best_fitness = current[:], current_objectives, current_fitness
+
+        budget = generations * self.population_size
+        temperature = cooling = None
+        if self.method == 'annealing' and job_count > 1:
+            # Başlangıç sıcaklığı: rastgele hamlelerin ortalama kötüleşmesi ~%50 olasılıkla kabul edilir
+            deltas = [abs(self.sample_delta(current, snapshots, current_fitness)) for _ in range(20)]
+            temperature = max(sum(deltas) / len(deltas), 1e-6) / math.log(2)
+            cooling = (1e-3) ** (1 / max(budget, 1))
+        tabu_until = {}
+        # Nesil başına adım: tabu her adımda tabu_candidates komşu değerlendirir
+        steps = self.population_size
+        if self.method == 'tabu':
+            steps = max(1, self.population_size // self.tabu_candidates)
+
+        iteration = 0
+        for gen in range(1, generations + 1):
+            gen_start_time = time.time()
+            makespans = []
+            for _ in range(steps):
+                if job_count < 2:
+                    break
+                iteration += 1
+                if self.method == 'annealing':
+                    candidate, first_changed, _ = self.random_move(current)
+                    objectives, fitness, new_snapshots = self.evaluate_from(candidate, snapshots, first_changed)
+                    delta = fitness - current_fitness
+                    accept = delta <= 0 or random.random() < math.exp(-delta / temperature)
+                    temperature *= cooling
+                else:
+                    # Tabu: örneklenen komşulardan tabu olmayan en iyisi (en iyiyi geçen hamle serbest)
+                    choice = None
+                    for _ in range(self.tabu_candidates):
+                        candidate, first_changed, moved = self.random_move(current)
+                        objectives, fitness, new_snapshots = self.evaluate_from(candidate, snapshots, first_changed)
+                        if tabu_until.get(moved, 0) > iteration and fitness >= best_fitness:
+                            continue
+                        if choice is None or fitness < choice[2]:
+                            choice = (candidate, objectives, fitness, new_snapshots, first_changed, moved)
+                    accept = choice is not None
+                    if accept:
+                        candidate, objectives, fitness, new_snapshots, first_changed, moved = choice
+                        tabu_until[moved] = iteration + self.tabu_tenure
+
+                if accept:
+                    current, current_objectives, current_fitness = candidate, objectives, fitness
+                    snapshots.update(new_snapshots)
+                    if fitness < best_fitness:
+                        best, best_objectives, best_fitness = candidate[:], objectives, fitness
+                makespans.append(current_objectives[0])
+
+            # Nesil istatistiklerini kaydet (GA ile aynı biçim)
+            gen_stats = {
+                'generation': gen,
+                'best_fitness': best_objectives[0],
+                'avg_fitness': sum(makespans) / len(makespans) if makespans else current_objectives[0],
+                'execution_time': time.time() - gen_start_time,
+                'gap': self.optimality_gap(best_objectives[0])
+            }
+            self.add_checkpoint(best_objectives, start_time)
+            if self.finish_generation(gen_stats, on_generation, callbacks, gap_tolerance):
+                break
+            if time_limit is not None and time.time() - start_time >= time_limit:
+                self.debug_stats['stopped_at'] = gen
+                print_timestamp(f"Nesil {gen}: Süre sınırı doldu; optimizasyon sonlandırılıyor")
+                break
+
+        self.last_population = [best]
+        return self.analyze_best_solution(best)
+
+    def sample_delta(self, perm, snapshots, fitness):
+        """Rastgele bir hamlenin fitness farkı (başlangıç sıcaklığı için)"""
+        candidate, first_changed, _ = self.random_move(perm)
+        return self.evaluate_from(candidate, snapshots, first_changed)[1] - fitness
@@ -0,0 +1,194 @@
+"""Tezgah kullanılabilirlik takvimleri (bakım pencereleri, vardiya boşlukları, arızalar)
+
+Her makinenin kapalı olduğu aralıklar (plan başlangıcından itibaren saat)
+birleştirilip sıralı dizilerde tutulur. "m makinesinde t anından sonra d
+saatlik bir işin en erken başlangıcı" ikili arama ve boşluk uzunlukları
+üzerindeki bir segment ağacıyla logaritmik sürede bulunur; kesintili
+işlerin bitişi kümülatif kapalı süreler üzerinde ikili aramayla hesaplanır.
+"""
+import math
+import re
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+# Takvim dosyası sütunları: makine (tezgah adı mk101..mk304, çizelge adı mk101..mk110 ya da 1..10), başlangıç, bitiş (boşsa süresiz arıza),
+# isteğe bağlı tekrar aralığı (saat) ve tekrar adedi (ör. her gün tekrarlanan vardiya boşluğu)
+CALENDAR_COLUMNS = ['makine', 'baslangic', 'bitis', 'tekrar_saat', 'tekrar_adedi']
+
+class _GapIndex:
+    """Boşluk uzunlukları üzerinde maksimum segment ağacı"""
+
+    def __init__(self, gaps):
+        size = 1
+        while size < max(len(gaps), 1):
+            size *= 2
+        self.size = size
+        self.tree = [-math.inf] * (2 * size)
+        self.tree[size:size + len(gaps)] = gaps
+        for node in range(size - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def first_at_least(self, start, value):
+        """start ve sonrasındaki, uzunluğu en az value olan ilk boşluğun sırası (yoksa None)"""
+        return self._find(1, 0, self.size, start, value)
+
+    def _find(self, node, lo, hi, start, value):
+        if hi <= start or self.tree[node] < value:
+            return None
+        if hi - lo == 1:
+            return lo
+        mid = (lo + hi) // 2
+        found = self._find(2 * node, lo, mid, start, value)
+        if found is None:
+            found = self._find(2 * node + 1, mid, hi, start, value)
+        return found
+
+class MachineCalendar:
+    """Makine başına kapalı aralıklar ve hızlı en erken başlangıç sorguları
+
+    downtimes: {makine numarası: [(başlangıç, bitiş), ...]} saat cinsinden;
+    bitiş math.inf olabilir (süresiz arıza). resumable=True ise üretim
+    kapalı aralıkta durup sonra devam eder; False ise iş (hazırlığıyla
+    birlikte) tek parça sığacağı ilk boşluğa kaydırılır. Hazırlık her
+    durumda bölünmez.
+    """
+
+    def __init__(self, downtimes, machines, resumable=True):
+        self.machines = machines
+        self.resumable = resumable
+        self.starts, self.ends, self.cumulative, self.available_at_start, self.gap_index = [], [], [], [], []
+        for machine_id in range(machines):
+            intervals = self.merge(downtimes.get(machine_id, []))
+            starts = [start for start, _ in intervals]
+            ends = [end for _, end in intervals]
+            # cumulative[k]: ilk k kapalı aralığın toplam süresi
+            cumulative = [0.0]
+            for start, end in intervals:
+                cumulative.append(cumulative[-1] + (end - start))
+            # k. kapalı aralık başladığında o ana kadarki açık süre
+            available_at_start = [start - cumulative[k] for k, start in enumerate(starts)]
+            # k. kapalı aralıktan sonraki açık pencerenin uzunluğu
+            gaps = [(starts[k + 1] if k + 1 < len(starts) else math.inf) - ends[k] if ends[k] != math.inf
+                    else -math.inf for k in range(len(starts))]
+            self.starts.append(starts)
+            self.ends.append(ends)
+            self.cumulative.append(cumulative)
+            self.available_at_start.append(available_at_start)
+            self.gap_index.append(_GapIndex(gaps))
+        self.open_ended = any(ends and ends[-1] == math.inf for ends in self.ends)
+
+    @staticmethod
+    def merge(intervals):
+        """Çakışan ya da bitişik aralıkları birleştirip sıralar"""
+        merged = []
+        for start, end in sorted((max(start, 0.0), end) for start, end in intervals if end > max(start, 0.0)):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def next_available(self, machine, t):
+        """t anında ya da sonrasında makinenin açık olduğu ilk an (süresiz arızada inf)"""
+        starts, ends = self.starts[machine], self.ends[machine]
+        i = bisect_right(ends, t)
+        if i < len(starts) and starts[i] <= t:
+            return ends[i]
+        return t
+
+    def earliest_start(self, machine, t, duration):
+        """t'den sonra [s, s + duration) tümüyle açık olan en erken s (bölünmeden)"""
+        starts, ends = self.starts[machine], self.ends[machine]
+        i = bisect_right(ends, t)
+        if i == len(starts) or t + duration <= starts[i]:
+            return t
+        # t bir kapalı aralığın içinde ya da iş sonraki kapanışa sığmıyor: i'den sonraki ilk yeterli boşluk
+        k = self.gap_index[machine].first_at_least(i, duration)
+        return ends[k] if k is not None else math.inf
+
+    def downtime_before(self, machine, t):
+        """Plan başlangıcından t anına kadarki toplam kapalı süre"""
+        starts = self.starts[machine]
+        i = bisect_right(starts, t)
+        if i == 0:
+            return 0.0
+        return self.cumulative[machine][i - 1] + min(t, self.ends[machine][i - 1]) - starts[i - 1]
+
+    def finish_time(self, machine, start, duration):
+        """start anından itibaren duration saat açık süre biriktiğinde ulaşılan an (kesintili)"""
+        if start == math.inf:
+            return math.inf
+        target = start - self.downtime_before(machine, start) + duration
+        k = bisect_left(self.available_at_start[machine], target)
+        return target + self.cumulative[machine][k]
+
+    def schedule_block(self, machine, ready, setup_hours, duration):
+        """Hazırlık ve üretimi yerleştirir; (üretim başlangıcı, bitiş) döndürür"""
+        if self.resumable:
+            start = self.earliest_start(machine, ready, setup_hours) + setup_hours
+            return start, self.finish_time(machine, start, duration)
+        start = self.earliest_start(machine, ready, setup_hours + duration) + setup_hours
+        return start, start + duration
+
+    def downtimes(self, machine):
+        """Makinenin birleştirilmiş kapalı aralıkları"""
+        return list(zip(self.starts[machine], self.ends[machine]))
+
+    def subset(self, machine_ids):
+        """Verilen makineler için yeniden numaralandırılmış takvim (alt problemler için)"""
+        return MachineCalendar({new_id: self.downtimes(machine_id) for new_id, machine_id in enumerate(machine_ids)},
+                               len(machine_ids), self.resumable)
+
+def machine_aliases(machines=10):
+    """Makine adı -> 0 tabanlı numara
+
+    Tezgah adları (DataProcessor sırasıyla mk101..mk304) ve çizelge
+    çıktısındaki adlar (schedule_timeline.machine_name: mk101..mk110) kabul
+    edilir; iki adlandırma yalnızca mk101..mk103'te çakışır ve aynı makineyi gösterir.
+    """
+    from data_processor import MACHINE_NAMES
+    from schedule_timeline import machine_name
+    aliases = {machine_name(machine_id): machine_id for machine_id in range(machines)}
+    aliases.update({name: machine_id for machine_id, name in enumerate(MACHINE_NAMES[:machines])})
+    return aliases
+
+def parse_machine(value, aliases, machines=10):
+    """'mk201', 201 ya da 1..machines biçimindeki makine adını 0 tabanlı numaraya çevirir
+
+    Bilinmeyen adlarda ValueError verir.
+    """
+    text = str(value).strip().lower()
+    if text in aliases:
+        return aliases[text]
+    match = re.fullmatch(r'(\d+)(\.0+)?', text)
+    if match:
+        number = int(match.group(1))
+        if 1 <= number <= machines:
+            return number - 1
+        if f'mk{number}' in aliases:
+            return aliases[f'mk{number}']
+    raise ValueError(f"Takvimde bilinmeyen makine: {value} (geçerli adlar: {', '.join(sorted(aliases))})")
+
+def load_calendar(path, plan_start, machines=10, resumable=True):
+    """Takvim dosyasını (xlsx ya da csv) okuyup MachineCalendar oluşturur"""
+    import pandas as pd
+    frame = pd.read_csv(path) if str(path).endswith('.csv') else pd.read_excel(path)
+    plan_start = datetime.fromisoformat(str(plan_start))
+
+    def hours(value):
+        if pd.isna(value):
+            return math.inf
+        return (pd.Timestamp(value) - plan_start).total_seconds() / 3600
+
+    aliases = machine_aliases(machines)
+    downtimes = {}
+    for row in frame.to_dict('records'):
+        machine_id = parse_machine(row['makine'], aliases, machines)
+        start, end = hours(row['baslangic']), hours(row.get('bitis'))
+        period = row.get('tekrar_saat')
+        repeats = row.get('tekrar_adedi')
+        count = int(repeats) if period and not pd.isna(period) and repeats and not pd.isna(repeats) else 1
+        for k in range(count):
+            offset = k * float(period) if count > 1 else 0.0
+            downtimes.setdefault(machine_id, []).append((start + offset, end + offset))
+    return MachineCalendar(downtimes, machines, resumable)
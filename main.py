@@ -1,103 +1,141 @@
 import sys
-from data_processor import DataProcessor
-from genetic_algorithm import GeneticScheduler, print_timestamp
-from visualizer import ScheduleVisualizer
+import time
 
-def main(test_mode=False):
+# Süreç başlangıcı: ağır modüller yüklenmeden önce alınır
+PROCESS_START = time.perf_counter()
+
+import json
+import os
+from data_processor import DataProcessor, print_timestamp
+from progress_sinks import NDJSONSink, StopSignal
+from schedule_exporter import ScheduleExporter
+from schedule_timeline import gantt_columns
+
+# Gantt ve dışa aktarımda saat 0'ın karşılık geldiği tarih
+PLAN_BASE_TIME = '2025-01-01'
+# Tezgah bakım/duruş takvimi (varsa siparişlerle birlikte okunur)
+CALENDAR_FILE = 'tezgah_takvimi.xlsx'
+
+def timed_import(module_name, timings):
+    """Modülü gerektiğinde yükler ve yükleme süresini kaydeder"""
+    import importlib
+    import_start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    timings[module_name] = round(time.perf_counter() - import_start, 3)
+    return module
+
+def main(test_mode=False, headless=False, offline=False, decompose=False, partition='family', gap_tolerance=None,
+         engine='ga', surrogate=None, adaptive=False, tardiness_weights=None, tardiness_limit=None,
+         diversity_threshold=None, split_mode='upfront', fidelity=None, gantt_options=None):
+    startup_timings = {'modul_yukleme': {}}
     print("Debug: Program başlıyor...")
     print_timestamp("Program başladı")
     
     # Veri okuma
     print("Debug: Veri okuma başlıyor...")
     print_timestamp("Veri okuma başladı")
-    data_processor = DataProcessor('siparis.xlsx', test_mode=test_mode)
+    data_processor = DataProcessor('siparis.xlsx', test_mode=test_mode, split_mode=split_mode)
     work_orders = data_processor.create_work_orders()
     print_timestamp(f"Veri okuma tamamlandı. {len(work_orders)} iş emri oluşturuldu")
+    calendar = None
+    if os.path.exists(CALENDAR_FILE):
+        from machine_calendar import load_calendar
+        calendar = load_calendar(CALENDAR_FILE, PLAN_BASE_TIME, machines=10)
+        print_timestamp(f"Tezgah takvimi okundu: "
+                        f"{sum(len(calendar.downtimes(m)) for m in range(calendar.machines))} kapalı aralık")
     
-    # Genetik algoritma
+    # Genetik algoritma (DEAP yalnızca burada yüklenir)
     print_timestamp("Genetik algoritma başlatılıyor")
+    GeneticScheduler = timed_import('genetic_algorithm', startup_timings['modul_yukleme']).GeneticScheduler
+    startup_timings['optimizasyon_oncesi'] = round(time.perf_counter() - PROCESS_START, 3)
+    print_timestamp(f"Başlangıç süresi: {startup_timings['optimizasyon_oncesi']:.3f} sn "
+                    f"(modül yükleme: {startup_timings['modul_yukleme']})")
     population_size = 20 if test_mode else 50  # Test modunda daha küçük popülasyon
-    scheduler = GeneticScheduler(work_orders, machines=10, population_size=population_size)
+    # Gecikmeler çözücüde termine göre hesaplanır; isteğe bağlı olarak amaç ya da kısıt olur
+    scheduler_options = {'plan_start': PLAN_BASE_TIME, 'tardiness_weights': tardiness_weights,
+                         'tardiness_limit': tardiness_limit, 'calendar': calendar,
+                         'split_orders': split_mode == 'decoder'}
+    decomposition = timed_import('decomposition', startup_timings['modul_yukleme'])
+    if decompose or len(work_orders) > decomposition.DECOMPOSITION_THRESHOLD:
+        # Büyük örnekler: kümelere ayır, makine alt kümelerinde paralel çöz
+        print_timestamp(f"Ayrıştırma modu ({partition})")
+        scheduler = decomposition.DecompositionScheduler(work_orders, machines=10, population_size=population_size,
+                                                         partition=partition, **scheduler_options)
+    elif engine != 'ga':
+        # Dizi popülasyonlu GA (array), küçük yeniden planlamalar için yerel arama (annealing/tabu)
+        # ya da anında yapıcı plan (constructive)
+        local_search = timed_import('local_search', startup_timings['modul_yukleme'])
+        scheduler = local_search.create_scheduler(engine, work_orders, machines=10, population_size=population_size,
+                                                  **scheduler_options)
+    else:
+        scheduler = GeneticScheduler(work_orders, machines=10, population_size=population_size, **scheduler_options)
+
+    # Vekil, uyarlama, çeşitlilik ve çok doğruluk yalnızca 'ga' motorunda vardır; diğerlerinde yok sayılır
+    ga_options = {'surrogate': surrogate, 'adaptive': adaptive, 'diversity_threshold': diversity_threshold,
+                  'fidelity': fidelity}
+    ignored_options = []
+    if type(scheduler) is not GeneticScheduler:
+        ignored_options = [name for name, value in ga_options.items() if value]
+        if ignored_options:
+            print_timestamp(f"Uyarı: {', '.join(ignored_options)} yalnızca 'ga' motorunda geçerli, "
+                            f"{type(scheduler).__name__} için yok sayılıyor")
+        ga_options = {}
     
-    # Optimizasyon
+    # Optimizasyon: ilerleme nesil nesil NDJSON'a yazılır; çıktı klasöründe
+    # DUR dosyası oluşturulursa optimizasyon o nesilden sonra durur
+    export_dir = 'test_cikti' if test_mode else 'cikti'
+    stop_file = os.path.join(export_dir, 'DUR')
+    if os.path.exists(stop_file):
+        os.remove(stop_file)
     generations = 50 if test_mode else 100  # Test modunda çok daha az nesil
-    machine_schedules = scheduler.optimize(generations=generations)
+    optimize_start = time.perf_counter()
+    with NDJSONSink(os.path.join(export_dir, 'ilerleme.ndjson'), append=False) as progress:
+        scheduler.optimize(generations=generations, callbacks=[progress, StopSignal(stop_file=stop_file)],
+                           gap_tolerance=gap_tolerance, **ga_options)
+    optimize_time = time.perf_counter() - optimize_start
     print_timestamp("Genetik algoritma tamamlandı")
     
-    # Çözümü değerlendir
-    print_timestamp("Çözüm değerlendirme başladı")
-    gantt_schedules = {}
-    for machine_id in range(10):
-        gantt_schedules[f'mk{101+machine_id}'] = []
+    # Dışa aktarım: çizelge, makine ve nesil istatistikleri (Parquet/CSV/NDJSON)
+    exporter = ScheduleExporter(export_dir, base_time=PLAN_BASE_TIME)
+    export_paths = exporter.export_scheduler(scheduler)
+    print_timestamp(f"Çizelge dışa aktarıldı: {', '.join(export_paths)}")
     
-    for machine_id, group_list in enumerate(machine_schedules):
-        machine_name = f'mk{101+machine_id}'
-        current_time = 0
+    if headless:
+        # Başsız mod: HTML üretilmez, yalnızca çizelge ve metrikler yazılır
+        metrics_filename = os.path.join(export_dir, 'metrikler.json')
+        metrics = {
+            'is_emri_sayisi': len(work_orders),
+            'tip_degisimleri': scheduler.debug_stats['type_changes'],
+            'makine_yukleri': {f'mk{101+machine_id}': stats
+                               for machine_id, stats in scheduler.debug_stats['machine_loads'].items()},
+            'alt_sinirlar': scheduler.bounds,
+            'alt_sinira_bosluk': scheduler.optimality_gap(max(scheduler.best_schedule['machine_times'])),
+            'gecikme': {'toplam': scheduler.best_schedule['total_tardiness'],
+                        'en_buyuk': scheduler.best_schedule['max_tardiness'],
+                        'geciken_is': scheduler.best_schedule['late_jobs']},
+            'vekil_on_eleme': scheduler.debug_stats.get('surrogate'),
+            'son_operator_oranlari': (scheduler.debug_stats.get('operator_rates') or [None])[-1],
+            'cesitlilik_tasarrufu': scheduler.debug_stats.get('saved_evaluations'),
+            'cok_dogruluk': scheduler.debug_stats.get('fidelity'),
+            'yok_sayilan_secenekler': ignored_options,
+            'optimizasyon_suresi': round(optimize_time, 3),
+            'baslangic': startup_timings,
+            'toplam_sure': round(time.perf_counter() - PROCESS_START, 3)
+        }
+        with open(metrics_filename, 'w', encoding='utf-8') as f:
+            json.dump(metrics, f, ensure_ascii=False, indent=2)
+        print_timestamp(f"Metrikler kaydedildi: {metrics_filename}")
+        return
         
-        for order_idx, order in enumerate(group_list):
-            # Tip değişim süresini hesapla
-            if order_idx > 0:
-                prev_order = group_list[order_idx - 1]
-                prev_variant = prev_order.get('varyantKodu', '')
-                prev_ulak = prev_order.get('ulakKodu', '')
-                
-                type_change = data_processor.check_type_change(
-                    order.get('varyantKodu', ''), order.get('ulakKodu', ''),
-                    prev_variant, prev_ulak
-                )
-                
-                type_change_duration = {
-                    'VARYANT': 30,  # 30 dakika
-                    'ULAK': 120,    # 120 dakika
-                    'TAKIM': 180    # 180 dakika
-                }.get(type_change, 180)  # Varsayılan olarak takım değişimi
-                
-                # Tip değişimini Gantt'a ekle
-                if type_change_duration > 0:
-                    gantt_schedules[machine_name].append({
-                        'Task': f'Tip Değişimi ({type_change})',
-                        'Start': current_time,
-                        'Duration': type_change_duration / 60,  # Dakikayı saate çevir
-                        'Type': 'change'
-                    })
-                    current_time += type_change_duration / 60
-            else:
-                # İlk iş için takım hazırlığı
-                type_change_duration = 180  # 3 saat
-                gantt_schedules[machine_name].append({
-                    'Task': 'İlk Takım Hazırlığı',
-                    'Start': current_time,
-                    'Duration': type_change_duration / 60,
-                    'Type': 'change'
-                })
-                current_time += type_change_duration / 60
-            
-            # İş emri bilgileri
-            task_info = {
-                'Task': f'İş Emri {order["id"]}',
-                'Start': current_time,
-                'Duration': order['duration'],  # Sadece üretim süresi
-                'Type': type_change.lower() if order_idx > 0 else 'takim',
-                'quantity': order['quantity'],
-                'atki_sikligi': order['atkiSikligi'],
-                'siparisId': order['siparisId'],
-                'siparisDetayId': order['siparisDetayId'],
-                'tipAd': order['tipAd'],
-                'varyantKodu': order['varyantKodu'],
-                'ulakKodu': order['ulakKodu'],
-                'hamTermin': order['hamTermin']
-            }
-            
-            gantt_schedules[machine_name].append(task_info)
-            current_time += order['duration']
-    
-    # Görselleştirme
+    # Görselleştirme (plotly yalnızca burada yüklenir)
     print_timestamp("Görselleştirmeler oluşturuluyor")
-    visualizer = ScheduleVisualizer()
+    ScheduleVisualizer = timed_import('visualizer', startup_timings['modul_yukleme']).ScheduleVisualizer
+    visualizer = ScheduleVisualizer(asset_mode='offline' if offline else 'cdn')
     
     # Gantt şeması oluştur
     gantt_filename = 'test_cizelge.html' if test_mode else 'cizelge.html'
-    visualizer.create_gantt(gantt_schedules, gantt_filename)
+    gantt_schedules = gantt_columns(scheduler.best_schedule['timeline'], work_orders, calendar)
+    visualizer.create_gantt(gantt_schedules, gantt_filename, base_time=PLAN_BASE_TIME, **(gantt_options or {}))
     print_timestamp(f"Gantt şeması kaydedildi: {gantt_filename}")
     
     # Analiz grafikleri oluştur
@@ -106,5 +144,47 @@ def main(test_mode=False):
     print_timestamp(f"Analiz grafikleri kaydedildi: {analysis_filename}")
 
 if __name__ == '__main__':
+    if '--prepare-assets' in sys.argv:
+        # Çevrimdışı rapor paketini indirir (ağ erişimi gerekir); --offline raporlar bu klasörü kullanır
+        from visualizer import ScheduleVisualizer
+        ScheduleVisualizer(asset_mode='offline', download_assets=True)
+        sys.exit(0)
     test_mode = '--test' in sys.argv
-    main(test_mode=test_mode) 
\ No newline at end of file
+    headless = '--headless' in sys.argv
+    offline = '--offline' in sys.argv
+    decompose = '--decompose' in sys.argv
+    partition = sys.argv[sys.argv.index('--partition') + 1] if '--partition' in sys.argv else 'family'
+    # --gap 0.05: en iyi toplam süre alt sınırın %5 yakınına inince dur
+    gap_tolerance = float(sys.argv[sys.argv.index('--gap') + 1]) if '--gap' in sys.argv else None
+    engine = sys.argv[sys.argv.index('--engine') + 1] if '--engine' in sys.argv else 'ga'
+    # --surrogate prefix|regression: yavruları vekille ön ele (yalnızca 'ga' motoru)
+    surrogate = sys.argv[sys.argv.index('--surrogate') + 1] if '--surrogate' in sys.argv else None
+    # --adaptive: operatör ve oranları çalışma boyunca uyarla (yalnızca 'ga' motoru)
+    adaptive = '--adaptive' in sys.argv
+    # --tardiness: toplam ve en büyük gecikmeyi ek amaç yap; --max-tardiness 48: 48 saati aşan gecikmeyi cezalandır
+    tardiness_weights = (-1, -1) if '--tardiness' in sys.argv else None
+    tardiness_limit = (float(sys.argv[sys.argv.index('--max-tardiness') + 1])
+                       if '--max-tardiness' in sys.argv else None)
+    # --diversity 0.3: kopyaları ayıkla, konum farkı %30'un altına inince göçmen ekle (yalnızca 'ga' motoru)
+    diversity_threshold = float(sys.argv[sys.argv.index('--diversity') + 1]) if '--diversity' in sys.argv else None
+    # --split decoder: siparişler okunurken bölünmez, bölmeye çözücü karar verir
+    split_mode = sys.argv[sys.argv.index('--split') + 1] if '--split' in sys.argv else 'upfront'
+    # --fidelity stratified|random: erken nesilleri iş emri örneklemiyle değerlendir (yalnızca 'ga' motoru)
+    fidelity = sys.argv[sys.argv.index('--fidelity') + 1] if '--fidelity' in sys.argv else None
+    # Gantt: --gantt-mode svg|webgl|auto, --gantt-grid inline|sidecar|auto,
+    # WebGL detay izleri için --gantt-machines mk101,mk102 ve/veya --gantt-window 0,168 (saat)
+    gantt_options = {}
+    if '--gantt-mode' in sys.argv:
+        gantt_options['render_mode'] = sys.argv[sys.argv.index('--gantt-mode') + 1]
+    if '--gantt-grid' in sys.argv:
+        gantt_options['grid_mode'] = sys.argv[sys.argv.index('--gantt-grid') + 1]
+    if '--gantt-machines' in sys.argv:
+        gantt_options['detail_machines'] = sys.argv[sys.argv.index('--gantt-machines') + 1].split(',')
+    if '--gantt-window' in sys.argv:
+        gantt_options['time_window'] = tuple(float(value) for value in
+                                             sys.argv[sys.argv.index('--gantt-window') + 1].split(','))
+    main(test_mode=test_mode, headless=headless, offline=offline, decompose=decompose, partition=partition,
+         gap_tolerance=gap_tolerance, engine=engine, surrogate=surrogate, adaptive=adaptive,
+         tardiness_weights=tardiness_weights, tardiness_limit=tardiness_limit,
+         diversity_threshold=diversity_threshold, split_mode=split_mode, fidelity=fidelity,
+         gantt_options=gantt_options)
@@ -0,0 +1,117 @@
+"""Optimizasyon sırasında uyarlanan operatör seçimi ve oranları (adaptive pursuit)
+
+Her karar (çaprazlama operatörü, mutasyon indpb düzeyi, nesil başına cxpb
+ve mutpb düzeyi) ayrı bir AdaptivePursuit ile seçilir. Ödül, operatörün
+dokunduğu yavruların ebeveynlerinden iyi çıkma oranıdır; iyi giden kolun
+olasılığı p_max'a, diğerleri p_min'e doğru çekilir.
+"""
+import random
+from functools import partial
+from deap import tools
+
+# Permütasyon gösterimiyle uyumlu çaprazlamalar
+CROSSOVERS = {
+    'upmx': partial(tools.cxUniformPartialyMatched, indpb=0.8),
+    'ox': tools.cxOrdered,
+    'pmx': tools.cxPartialyMatched
+}
+MUTATION_INDPB_LEVELS = (0.01, 0.05, 0.1)
+CXPB_LEVELS = (0.5, 0.8, 0.95)
+MUTPB_LEVELS = (0.1, 0.2, 0.4)
+
+class AdaptivePursuit:
+    """Kollar arasında adaptive pursuit (Thierens) olasılık eşleştirmesi
+
+    alpha: kalite tahmininin öğrenme hızı; beta: olasılıkların en iyi kola
+    yaklaşma hızı; p_min: hiçbir kolun düşmeyeceği alt olasılık.
+    """
+
+    def __init__(self, arms, p_min=0.1, alpha=0.3, beta=0.3):
+        self.arms = list(arms)
+        self.p_min = min(p_min, 1 / len(self.arms))
+        self.p_max = 1 - (len(self.arms) - 1) * self.p_min
+        self.alpha = alpha
+        self.beta = beta
+        self.quality = {arm: 1.0 for arm in self.arms}  # iyimser başlangıç
+        self.probability = {arm: 1 / len(self.arms) for arm in self.arms}
+
+    def choose(self):
+        """Olasılıklara göre bir kol seçer"""
+        return random.choices(self.arms, weights=[self.probability[arm] for arm in self.arms])[0]
+
+    def update(self, rewards):
+        """rewards: {kol: ortalama ödül}; yalnızca bu nesilde kullanılan kollar güncellenir"""
+        if not rewards:
+            return
+        for arm, reward in rewards.items():
+            self.quality[arm] += self.alpha * (reward - self.quality[arm])
+        best = max(self.arms, key=lambda arm: self.quality[arm])
+        for arm in self.arms:
+            target = self.p_max if arm == best else self.p_min
+            self.probability[arm] += self.beta * (target - self.probability[arm])
+
+class AdaptiveOperators:
+    """varAnd yerine geçen uyarlamalı varyasyon; yavruların kökenini izler"""
+
+    def __init__(self, p_min=0.1, alpha=0.3, beta=0.3):
+        self.crossover = AdaptivePursuit(CROSSOVERS, p_min, alpha, beta)
+        self.mutation = AdaptivePursuit(MUTATION_INDPB_LEVELS, p_min, alpha, beta)
+        self.cxpb = AdaptivePursuit(CXPB_LEVELS, p_min, alpha, beta)
+        self.mutpb = AdaptivePursuit(MUTPB_LEVELS, p_min, alpha, beta)
+        self.current = {}
+
+    def vary(self, pop, toolbox):
+        """varAnd ile aynı düzen (ardışık çiftler, sonra bireysel mutasyon); (yavrular, kökenler) döndürür
+
+        kökenler[i]: i. yavruya uygulanan (karar, kol) çiftleri.
+        """
+        self.current = {'cxpb': self.cxpb.choose(), 'mutpb': self.mutpb.choose()}
+        offspring = [toolbox.clone(ind) for ind in pop]
+        origins = [[] for _ in offspring]
+        for i in range(1, len(offspring), 2):
+            if random.random() < self.current['cxpb']:
+                name = self.crossover.choose()
+                offspring[i - 1], offspring[i] = CROSSOVERS[name](offspring[i - 1], offspring[i])
+                del offspring[i - 1].fitness.values, offspring[i].fitness.values
+                origins[i - 1].append(('crossover', name))
+                origins[i].append(('crossover', name))
+        for i, ind in enumerate(offspring):
+            if random.random() < self.current['mutpb']:
+                indpb = self.mutation.choose()
+                offspring[i], = tools.mutShuffleIndexes(ind, indpb=indpb)
+                del offspring[i].fitness.values
+                origins[i].append(('mutation', indpb))
+        return offspring, origins
+
+    def reward(self, generation, pop, offspring, origins, weighted_fitness):
+        """Yavruları ebeveynleriyle (aynı sıra) karşılaştırıp kolları günceller; oran kaydını döndürür
+
+        Ebeveyniyle değiştirilmiş (ör. vekil ön elemesinde elenmiş) yavru
+        iyileşme saymaz.
+        """
+        totals = {'crossover': {}, 'mutation': {}}
+        improved_count = 0
+        for parent, child, applied in zip(pop, offspring, origins):
+            if not applied:
+                continue
+            improved = (child is not parent
+                        and weighted_fitness(child.fitness.values) < weighted_fitness(parent.fitness.values))
+            improved_count += improved
+            for decision, arm in applied:
+                hits, count = totals[decision].get(arm, (0, 0))
+                totals[decision][arm] = (hits + improved, count + 1)
+
+        varied = sum(1 for applied in origins if applied)
+        success_rate = improved_count / varied if varied else 0.0
+        self.crossover.update({arm: hits / count for arm, (hits, count) in totals['crossover'].items()})
+        self.mutation.update({arm: hits / count for arm, (hits, count) in totals['mutation'].items()})
+        self.cxpb.update({self.current['cxpb']: success_rate})
+        self.mutpb.update({self.current['mutpb']: success_rate})
+        return {
+            'generation': generation,
+            'cxpb': self.current['cxpb'],
+            'mutpb': self.current['mutpb'],
+            'success_rate': success_rate,
+            'crossover': dict(self.crossover.probability),
+            'mutation_indpb': dict(self.mutation.probability)
+        }
@@ -0,0 +1,71 @@
+"""Optimizasyon ilerleme kayıtları için geri çağırma (callback) alıcıları
+
+GeneticScheduler.optimize(callbacks=[...]) her nesil sonunda küçük bir
+istatistik kaydıyla her alıcıyı çağırır. Alıcı True döndürürse
+optimizasyon o nesilden sonra durdurulur.
+"""
+import json
+import os
+import threading
+
+class NDJSONSink:
+    """Nesil kayıtlarını NDJSON dosyasına satır satır ekler; bellekte kayıt tutmaz
+
+    stop_when: kayıt alıp True döndüren koşul (ör. hedef fitness'a ulaşıldı).
+    flush_every: kaç kayıtta bir dosyanın diske aktarılacağı.
+    append: False ise dosya baştan yazılır.
+    """
+
+    def __init__(self, path, stop_when=None, flush_every=1, append=True):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.stop_when = stop_when
+        self.flush_every = flush_every
+        self.count = 0
+        self.file = open(path, 'a' if append else 'w', encoding='utf-8')
+
+    def __call__(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self.file.flush()
+        return bool(self.stop_when and self.stop_when(record))
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class StopSignal:
+    """Dışarıdan tetiklenen durdurma sinyali
+
+    Sinyal set() ile (başka bir iş parçacığı ya da süreçler arası olay
+    nesnesi verilirse başka bir süreç) veya stop_file yolunda bir dosya
+    oluşturularak verilir. time_limit verilirse optimizasyonun geçen
+    süresi (kayıttaki elapsed) bu kadar saniyeyi aşınca da durdurur.
+    """
+
+    def __init__(self, stop_file=None, event=None, time_limit=None):
+        self.stop_file = stop_file
+        self.event = event if event is not None else threading.Event()
+        self.time_limit = time_limit
+
+    def set(self):
+        self.event.set()
+
+    def is_set(self):
+        if self.event.is_set():
+            return True
+        return bool(self.stop_file and os.path.exists(self.stop_file))
+
+    def __call__(self, record):
+        if self.time_limit is not None and record.get('elapsed', 0) >= self.time_limit:
+            return True
+        return self.is_set()
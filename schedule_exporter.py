@@ -0,0 +1,164 @@
+import csv
+import json
+import os
+from datetime import datetime, timedelta
+from schedule_timeline import clean_code, machine_name
+
+# Çizelge satırı sütunları (iş emri alanları zaman çizelgesine eklenir)
+SCHEDULE_COLUMNS = ['machine', 'start_hour', 'end_hour', 'start_time', 'end_time', 'change_type',
+                    'change_minutes', 'order_index', 'id', 'siparisId', 'siparisDetayId', 'tipAd',
+                    'varyantKodu', 'ulakKodu', 'quantity', 'atkiSikligi', 'hamTermin', 'tardiness_hours']
+# Parquet sütun tipleri (belirtilmeyenler metin)
+SCHEDULE_TYPES = {'start_hour': 'float64', 'end_hour': 'float64', 'change_minutes': 'int64',
+                  'order_index': 'int64', 'quantity': 'float64', 'atkiSikligi': 'float64',
+                  'tardiness_hours': 'float64'}
+
+class TableWriter:
+    """Satır gruplarını CSV, NDJSON ve Parquet dosyalarına akış halinde yazar"""
+
+    def __init__(self, base_path, columns, formats, types=None):
+        self.columns = columns
+        self.types = types
+        self.paths = []
+        self.csv_file = None
+        self.ndjson_file = None
+        self.parquet_path = None
+        self.parquet_writer = None
+
+        if 'csv' in formats:
+            self.paths.append(base_path + '.csv')
+            self.csv_file = open(base_path + '.csv', 'w', encoding='utf-8', newline='')
+            self.csv_writer = csv.writer(self.csv_file)
+            self.csv_writer.writerow(columns)
+        if 'ndjson' in formats:
+            self.paths.append(base_path + '.ndjson')
+            self.ndjson_file = open(base_path + '.ndjson', 'w', encoding='utf-8')
+        if 'parquet' in formats:
+            # pyarrow isteğe bağlıdır ve yalnızca Parquet istendiğinde yüklenir; yoksa CSV/NDJSON yazılır
+            try:
+                import pyarrow
+                import pyarrow.parquet
+            except ImportError:
+                print("Uyarı: pyarrow kurulu değil, Parquet çıktısı atlanıyor")
+            else:
+                self.pa, self.pq = pyarrow, pyarrow.parquet
+                self.parquet_path = base_path + '.parquet'
+                self.paths.append(self.parquet_path)
+
+    def write_group(self, group):
+        """Sütun listelerinden oluşan bir satır grubunu yazar"""
+        row_count = len(group[self.columns[0]])
+        if row_count == 0:
+            return
+
+        if self.csv_file is not None or self.ndjson_file is not None:
+            for row in range(row_count):
+                values = [group[column][row] for column in self.columns]
+                if self.csv_file is not None:
+                    self.csv_writer.writerow(['' if value is None else value for value in values])
+                if self.ndjson_file is not None:
+                    self.ndjson_file.write(json.dumps(dict(zip(self.columns, values)), ensure_ascii=False,
+                                                      default=str) + '\n')
+
+        if self.parquet_path is not None:
+            pa, pq = self.pa, self.pq
+            schema = None
+            if self.types is not None:
+                schema = pa.schema([(column, getattr(pa, self.types.get(column, 'string'))())
+                                    for column in self.columns])
+            table = pa.table({column: group[column] for column in self.columns}, schema=schema)
+            if self.parquet_writer is None:
+                self.parquet_writer = pq.ParquetWriter(self.parquet_path, table.schema)
+            self.parquet_writer.write_table(table.cast(self.parquet_writer.schema))
+
+    def close(self):
+        if self.csv_file is not None:
+            self.csv_file.close()
+        if self.ndjson_file is not None:
+            self.ndjson_file.close()
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
+        return self.paths
+
+class ScheduleExporter:
+    def __init__(self, output_dir, formats=('parquet', 'csv', 'ndjson'), row_group_size=50000, base_time=None):
+        """Çizelge çıktılarını sütunlu biçimlerde yazar
+
+        base_time verilirse saat cinsinden başlangıç/bitiş değerlerine ek
+        olarak tarih-saat sütunları da doldurulur.
+        """
+        self.output_dir = output_dir
+        self.formats = formats
+        self.row_group_size = row_group_size
+        self.base_time = datetime.fromisoformat(str(base_time)) if base_time is not None else None
+        os.makedirs(output_dir, exist_ok=True)
+
+    def clock_time(self, hours):
+        """Plan başlangıcına göre saat değerini tarih-saate çevirir"""
+        if self.base_time is None:
+            return None
+        return (self.base_time + timedelta(hours=hours)).isoformat(sep=' ', timespec='seconds')
+
+    def export_schedule(self, timeline, work_orders, name='cizelge'):
+        """Zaman çizelgesini iş emri alanlarıyla birlikte satır grupları halinde yazar"""
+        writer = TableWriter(os.path.join(self.output_dir, name), SCHEDULE_COLUMNS, self.formats, SCHEDULE_TYPES)
+        total_rows = len(timeline['order_index'])
+
+        for offset in range(0, total_rows, self.row_group_size):
+            group = {column: [] for column in SCHEDULE_COLUMNS}
+            for row in range(offset, min(offset + self.row_group_size, total_rows)):
+                order = work_orders[timeline['order_index'][row]]
+                start = timeline['start'][row]
+                end = timeline['end'][row]
+                termin = order.get('hamTermin')
+                group['machine'].append(machine_name(timeline['machine'][row]))
+                group['start_hour'].append(round(start, 4))
+                group['end_hour'].append(round(end, 4))
+                group['start_time'].append(self.clock_time(start))
+                group['end_time'].append(self.clock_time(end))
+                group['change_type'].append(timeline['change_type'][row])
+                group['change_minutes'].append(timeline['change_minutes'][row])
+                group['order_index'].append(timeline['order_index'][row])
+                group['id'].append(str(order['id']))
+                group['siparisId'].append(str(order['siparisId']))
+                group['siparisDetayId'].append(str(order['siparisDetayId']))
+                group['tipAd'].append(order.get('tipAd'))
+                group['varyantKodu'].append(clean_code(order.get('varyantKodu')))
+                group['ulakKodu'].append(clean_code(order.get('ulakKodu')))
+                group['quantity'].append(float(order['quantity']) * timeline['fraction'][row])
+                group['atkiSikligi'].append(order.get('atkiSikligi'))
+                group['hamTermin'].append(termin.isoformat(sep=' ') if termin is not None else None)
+                group['tardiness_hours'].append(round(timeline['tardiness'][row], 4))
+            writer.write_group(group)
+
+        return writer.close()
+
+    def export_machine_stats(self, machine_stats, name='makine_istatistikleri'):
+        """Makine bazında toplam süre, iş ve tip değişim sayılarını yazar"""
+        columns = ['machine', 'total_time', 'job_count', 'type_changes']
+        writer = TableWriter(os.path.join(self.output_dir, name), columns, self.formats)
+        group = {column: [] for column in columns}
+        for machine_id, stats in machine_stats.items():
+            group['machine'].append(machine_name(machine_id))
+            group['total_time'].append(float(stats['total_time']))
+            group['job_count'].append(stats['job_count'])
+            group['type_changes'].append(stats['type_changes'])
+        writer.write_group(group)
+        return writer.close()
+
+    def export_generation_stats(self, generation_stats, name='nesil_istatistikleri'):
+        """Nesil istatistiklerini satır grupları halinde yazar"""
+        generation_stats = list(generation_stats)
+        columns = list(generation_stats[0].keys()) if generation_stats else ['generation']
+        writer = TableWriter(os.path.join(self.output_dir, name), columns, self.formats)
+        for offset in range(0, len(generation_stats), self.row_group_size):
+            chunk = generation_stats[offset:offset + self.row_group_size]
+            writer.write_group({column: [stat.get(column) for stat in chunk] for column in columns})
+        return writer.close()
+
+    def export_scheduler(self, scheduler):
+        """Zamanlayıcının en iyi çizelgesini ve istatistiklerini dışa aktarır"""
+        paths = self.export_schedule(scheduler.best_schedule['timeline'], scheduler.work_orders)
+        paths += self.export_machine_stats(scheduler.debug_stats['machine_loads'])
+        paths += self.export_generation_stats(scheduler.debug_stats['generation_stats'])
+        return paths
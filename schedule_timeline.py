@@ -0,0 +1,117 @@
+"""Ortak tip değişim kuralları ve çözümlenmiş çizelgenin sütunlu zaman çizelgesi"""
+
+# Tip değişim süreleri (dakika)
+TYPE_CHANGE_MINUTES = {
+    'VARYANT': 30,   # aynı varyant
+    'ULAK': 120,     # aynı ulak
+    'TAKIM': 180     # takım değişimi / ilk takım hazırlığı
+}
+
+# Zaman çizelgesi sütunları (saat cinsinden, plan başlangıcına göre)
+# fraction: satırın iş emrindeki payı (çözücüde bölünen işlerde 1'den küçük)
+TIMELINE_COLUMNS = ['order_index', 'machine', 'start', 'end', 'change_type', 'change_minutes', 'tardiness',
+                    'fraction']
+
+def clean_code(value):
+    """Varyant/ulak/sipariş kodunu karşılaştırılabilir metne çevirir (boşsa None)"""
+    if value is None:
+        return None
+    text = str(value).strip()
+    if text in ('', 'nan', 'NaN', 'None'):
+        return None
+    return text
+
+def order_code(order, key):
+    """İş emrindeki kodu temizlenmiş olarak döndürür"""
+    return clean_code(order.get(key)) if order else None
+
+def classify_codes(current_variant, current_ulak, prev_variant, prev_ulak):
+    """Temizlenmiş kodlara göre tip değişim türünü belirler"""
+    # Herhangi bir varyant kodu boşsa (ilk iş dahil) takım değişimi
+    if not current_variant or not prev_variant:
+        return 'TAKIM'
+    if current_variant == prev_variant:
+        return 'VARYANT'
+    if current_ulak and prev_ulak and current_ulak == prev_ulak:
+        return 'ULAK'
+    return 'TAKIM'
+
+def classify_type_change(current_order, prev_order):
+    """İki iş emri arasındaki tip değişim türünü belirler (önceki iş yoksa TAKIM)"""
+    if not prev_order:
+        return 'TAKIM'
+    return classify_codes(order_code(current_order, 'varyantKodu'), order_code(current_order, 'ulakKodu'),
+                          order_code(prev_order, 'varyantKodu'), order_code(prev_order, 'ulakKodu'))
+
+def machine_name(machine_id):
+    """Makine numarasından tezgah adını üretir (0 -> mk101)"""
+    return f'mk{101+machine_id}'
+
+def new_timeline():
+    """Boş sütunlu zaman çizelgesi"""
+    return {column: [] for column in TIMELINE_COLUMNS}
+
+def gantt_columns(timeline, work_orders, calendar=None):
+    """Zaman çizelgesini ScheduleVisualizer'ın sütunlu görev biçimine çevirir
+
+    Her iş için önce tip değişimi (ya da ilk takım hazırlığı), ardından
+    üretim satırı eklenir. calendar verilirse makinelerin plan süresi
+    içindeki kapalı aralıkları 'downtime' satırları olarak eklenir.
+    """
+    columns = {column: [] for column in ['Machine', 'Task', 'Start', 'Duration', 'Type', 'quantity',
+                                         'atki_sikligi', 'siparisId', 'siparisDetayId', 'tipAd',
+                                         'varyantKodu', 'ulakKodu', 'hamTermin']}
+    order_keys = ['quantity', 'atkiSikligi', 'siparisId', 'siparisDetayId', 'tipAd', 'varyantKodu',
+                  'ulakKodu', 'hamTermin']
+    task_keys = ['quantity', 'atki_sikligi', 'siparisId', 'siparisDetayId', 'tipAd', 'varyantKodu',
+                 'ulakKodu', 'hamTermin']
+
+    started_machines = set()
+    for row in range(len(timeline['order_index'])):
+        order = work_orders[timeline['order_index'][row]]
+        machine = timeline['machine'][row]
+        name = machine_name(machine)
+        change_type = timeline['change_type'][row]
+        change_hours = timeline['change_minutes'][row] / 60
+        start = timeline['start'][row]
+
+        # Tip değişimi satırı
+        columns['Machine'].append(name)
+        if machine in started_machines:
+            columns['Task'].append(f'Tip Değişimi ({change_type})')
+        else:
+            columns['Task'].append('İlk Takım Hazırlığı')
+            started_machines.add(machine)
+        columns['Start'].append(start - change_hours)
+        columns['Duration'].append(change_hours)
+        columns['Type'].append('change')
+        for key in task_keys:
+            columns[key].append(None)
+
+        # Üretim satırı
+        columns['Machine'].append(name)
+        columns['Task'].append(f'İş Emri {order["id"]}')
+        columns['Start'].append(start)
+        columns['Duration'].append(timeline['end'][row] - start)
+        columns['Type'].append(change_type.lower())
+        for task_key, order_key in zip(task_keys, order_keys):
+            columns[task_key].append(order.get(order_key))
+        if timeline['fraction'][row] < 1:
+            columns['quantity'][-1] = order['quantity'] * timeline['fraction'][row]
+
+    if calendar is not None:
+        # Süresiz arızalar ve plan sonrası kapanışlar son iş bitişinde kesilir
+        horizon = max(timeline['end'], default=0.0)
+        for machine in range(calendar.machines):
+            for down_start, down_end in calendar.downtimes(machine):
+                if down_start >= horizon:
+                    break
+                columns['Machine'].append(machine_name(machine))
+                columns['Task'].append('Duruş')
+                columns['Start'].append(down_start)
+                columns['Duration'].append(min(down_end, horizon) - down_start)
+                columns['Type'].append('downtime')
+                for key in task_keys:
+                    columns[key].append(None)
+
+    return columns
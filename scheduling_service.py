@@ -0,0 +1,306 @@
+import asyncio
+import itertools
+import json
+import multiprocessing
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from data_processor import DataProcessor, print_timestamp
+from progress_sinks import StopSignal
+from schedule_timeline import machine_name
+
+# Her işçi süreçte bir kez yüklenen iş emirleri (havuz yeniden kurulana kadar geçerli)
+_worker_orders = None
+
+def init_worker(work_orders):
+    """İşçi süreci başlatıcısı: temizlenmiş iş emri tablosunu sürece yerleştirir"""
+    global _worker_orders
+    _worker_orders = work_orders
+
+def remap_population(population_ids, work_orders):
+    """Sipariş kimlikleriyle saklanan popülasyonu verilen iş emri listesine uyarlar
+
+    Mevcut iş emirlerinin göreli sırası korunur, yeni iş emirleri rastgele
+    konumlara eklenir; artık olmayanlar çıkarılır.
+    """
+    if not population_ids:
+        return None
+    index_by_id = {order['id']: idx for idx, order in enumerate(work_orders)}
+    population = []
+    for ids in population_ids:
+        perm = [index_by_id[order_id] for order_id in ids if order_id in index_by_id]
+        missing = set(range(len(work_orders))) - set(perm)
+        for idx in missing:
+            perm.insert(random.randint(0, len(perm)), idx)
+        population.append(perm)
+    return population
+
+def run_job(options, population_ids, progress_queue, stop_event=None):
+    """İşçi süreçte optimizasyonu çalıştırır ve sonucu seri hale getirilebilir döndürür
+
+    stop_event (süreçler arası olay) set edilirse optimizasyon o nesilden
+    sonra durur ve o ana kadarki en iyi çizelge döndürülür.
+    """
+    from genetic_algorithm import GeneticScheduler
+
+    job_start = time.time()
+    excluded = set(options.get('exclude', []))
+    work_orders = [order for order in _worker_orders if order['id'] not in excluded]
+    progress_queue.put({'event': 'started', 'orders': len(work_orders)})
+
+    scheduler = GeneticScheduler(work_orders, machines=options.get('machines', 10),
+                                 population_size=options.get('population_size', 50))
+
+    def report(stats):
+        progress_queue.put(dict(stats, event='generation'))
+
+    scheduler.optimize(generations=options.get('generations', 50),
+                       initial_population=remap_population(population_ids, work_orders),
+                       on_generation=report,
+                       callbacks=[StopSignal(event=stop_event)] if stop_event is not None else ())
+
+    schedule = scheduler.best_schedule
+    timeline = schedule['timeline']
+    return {
+        'objectives': list(scheduler.score_schedule(schedule)),
+        'type_changes': scheduler.debug_stats['type_changes'],
+        'machine_stats': {machine_name(machine_id): stats
+                          for machine_id, stats in scheduler.debug_stats['machine_loads'].items()},
+        'schedule': {
+            'machine': [machine_name(machine_id) for machine_id in timeline['machine']],
+            'start': timeline['start'],
+            'end': timeline['end'],
+            'change_type': timeline['change_type'],
+            'order_id': [work_orders[idx]['id'] for idx in timeline['order_index']]
+        },
+        'population': [[work_orders[idx]['id'] for idx in perm] for perm in scheduler.last_population],
+        'elapsed': round(time.time() - job_start, 3)
+    }
+
+class SchedulingService:
+    """Sipariş verisini ve son popülasyonu bellekte tutan yerel planlama servisi
+
+    Uç noktalar (JSON):
+      GET  /status                durum özeti
+      POST /load                  {"file": ..., "test_mode": ...} siparişleri yeniden oku
+                                  (bekleyen ya da çalışan iş varken reddedilir)
+      POST /replan                yeniden planla (son popülasyondan başlar, onu günceller)
+      POST /whatif                senaryo: {"machines", "exclude": [iş emri id], ...}; durumu değiştirmez
+      GET  /jobs/<id>             iş durumu ve sonucu
+      GET  /jobs/<id>/progress    ilerleme olayları (NDJSON, parça parça akış)
+      POST /jobs/<id>/stop        çalışan işi bir sonraki nesilden sonra durdur
+    """
+
+    def __init__(self, file_path='siparis.xlsx', test_mode=False, max_workers=2, defaults=None):
+        self.file_path = file_path
+        self.test_mode = test_mode
+        self.max_workers = max_workers
+        self.defaults = {'machines': 10, 'population_size': 50, 'generations': 50}
+        self.defaults.update(defaults or {})
+
+        self.work_orders = []
+        self.data_version = 0
+        self.population_ids = None
+        self.executor = None
+        self.manager = multiprocessing.Manager()
+        self.jobs = {}
+        self.job_ids = itertools.count(1)
+        # Olay döngüsü görevlere zayıf başvuru tutar; iş görevleri bitene kadar burada saklanır
+        self.tasks = set()
+        self.loading = False
+
+    def load_orders(self, file_path=None, test_mode=None):
+        """Siparişleri okur, temizler ve işçi havuzunu yeni veriyle yeniden kurar"""
+        if file_path is not None:
+            self.file_path = file_path
+        if test_mode is not None:
+            self.test_mode = test_mode
+        self.work_orders = DataProcessor(self.file_path, test_mode=self.test_mode).create_work_orders()
+        self.data_version += 1
+
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=init_worker,
+                                            initargs=(self.work_orders,))
+        print_timestamp(f"Servis verisi yüklendi: {len(self.work_orders)} iş emri (sürüm {self.data_version})")
+        return self.status()
+
+    def active_jobs(self):
+        """Bekleyen ya da çalışan işlerin kimlikleri"""
+        return [job_id for job_id, job in self.jobs.items() if job['status'] in ('queued', 'running')]
+
+    def status(self):
+        return {
+            'file': self.file_path,
+            'orders': len(self.work_orders),
+            'data_version': self.data_version,
+            'population': len(self.population_ids) if self.population_ids else 0,
+            'jobs': {job_id: job['status'] for job_id, job in self.jobs.items()}
+        }
+
+    def submit(self, kind, params):
+        """Optimizasyon işini işçi havuzuna gönderir ve iş kimliğini döndürür"""
+        options = dict(self.defaults)
+        options.update(params)
+        job_id = str(next(self.job_ids))
+        job = {
+            'id': job_id,
+            'kind': kind,
+            'status': 'queued',
+            'options': options,
+            'result': None,
+            'error': None,
+            'events': deque(maxlen=1000),
+            'event_count': 0,
+            'changed': asyncio.Event(),
+            'stop_event': self.manager.Event()
+        }
+        self.jobs[job_id] = job
+        task = asyncio.get_running_loop().create_task(self.run(job))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return job_id
+
+    async def run(self, job):
+        loop = asyncio.get_running_loop()
+        progress_queue = self.manager.Queue()
+        pump = loop.create_task(self.pump_progress(job, progress_queue))
+        job['status'] = 'running'
+        try:
+            result = await loop.run_in_executor(self.executor, run_job, job['options'],
+                                                self.population_ids, progress_queue, job['stop_event'])
+            job['result'] = result
+            job['status'] = 'done'
+            # Yalnızca yeniden planlama sonucu bir sonraki çalışmanın başlangıcı olur
+            if job['kind'] == 'replan':
+                self.population_ids = result['population']
+        except Exception as e:
+            job['error'] = str(e)
+            job['status'] = 'failed'
+        finally:
+            progress_queue.put(None)
+            await pump
+            self.add_event(job, {'event': job['status']})
+
+    async def pump_progress(self, job, progress_queue):
+        """İşçi süreçten gelen ilerleme olaylarını olay döngüsünü bloklamadan aktarır"""
+        loop = asyncio.get_running_loop()
+        while True:
+            event = await loop.run_in_executor(None, progress_queue.get)
+            if event is None:
+                return
+            self.add_event(job, event)
+
+    def add_event(self, job, event):
+        job['events'].append((job['event_count'], event))
+        job['event_count'] += 1
+        job['changed'].set()
+        job['changed'] = asyncio.Event()
+
+    async def stream_progress(self, job, writer):
+        """İlerleme olaylarını iş bitene kadar NDJSON olarak parça parça yazar"""
+        sent = 0
+        while True:
+            changed = job['changed']
+            for number, event in list(job['events']):
+                if number >= sent:
+                    await write_chunk(writer, json.dumps(event, ensure_ascii=False) + '\n')
+                    sent = number + 1
+            if job['status'] in ('done', 'failed') and sent >= job['event_count']:
+                break
+            await changed.wait()
+        await write_chunk(writer, '')
+
+    async def handle(self, reader, writer):
+        """Tek bir HTTP isteğini işler"""
+        try:
+            request_line = (await reader.readline()).decode('latin-1').strip()
+            if not request_line:
+                return
+            method, path, _ = request_line.split(' ', 2)
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                key, _, value = line.partition(':')
+                headers[key.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get('content-length', 0)))
+            params = json.loads(body) if body else {}
+
+            parts = [part for part in path.split('?')[0].split('/') if part]
+            if method == 'GET' and parts == ['status']:
+                await write_json(writer, 200, self.status())
+            elif method == 'POST' and parts == ['load']:
+                # Çalışan işler eski havuzda ve eski iş emri listesine göre sonuç üretir
+                active = self.active_jobs()
+                if active or self.loading:
+                    await write_json(writer, 409, {'error': 'Bekleyen ya da çalışan işler bitmeden veri '
+                                                            'yeniden yüklenemez', 'jobs': active})
+                else:
+                    self.loading = True
+                    try:
+                        loop = asyncio.get_running_loop()
+                        status = await loop.run_in_executor(None, self.load_orders, params.get('file'),
+                                                            params.get('test_mode'))
+                    finally:
+                        self.loading = False
+                    await write_json(writer, 200, status)
+            elif method == 'POST' and parts[:1] in (['replan'], ['whatif']):
+                if not self.work_orders:
+                    await write_json(writer, 409, {'error': 'Önce /load ile sipariş verisi yüklenmeli'})
+                elif self.loading:
+                    await write_json(writer, 409, {'error': 'Sipariş verisi yeniden yükleniyor'})
+                else:
+                    job_id = self.submit(parts[0], params)
+                    await write_json(writer, 202, {'job': job_id})
+            elif method == 'POST' and len(parts) == 3 and parts[0] == 'jobs' and parts[1] in self.jobs \
+                    and parts[2] == 'stop':
+                job = self.jobs[parts[1]]
+                job['stop_event'].set()
+                await write_json(writer, 202, {'job': job['id'], 'status': job['status']})
+            elif method == 'GET' and len(parts) >= 2 and parts[0] == 'jobs' and parts[1] in self.jobs:
+                job = self.jobs[parts[1]]
+                if parts[2:] == ['progress']:
+                    writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson; charset=utf-8\r\n'
+                                 b'Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n')
+                    await self.stream_progress(job, writer)
+                else:
+                    await write_json(writer, 200, {key: job[key] for key in
+                                                   ('id', 'kind', 'status', 'options', 'result', 'error')})
+            else:
+                await write_json(writer, 404, {'error': 'Bulunamadı'})
+        except (ValueError, KeyError) as e:
+            await write_json(writer, 400, {'error': str(e)})
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        server = await asyncio.start_server(self.handle, host, port)
+        print_timestamp(f"Planlama servisi dinleniyor: http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+async def write_json(writer, status, payload):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    reason = {200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found', 409: 'Conflict'}[status]
+    writer.write(f'HTTP/1.1 {status} {reason}\r\nContent-Type: application/json; charset=utf-8\r\n'
+                 f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode('latin-1') + body)
+    await writer.drain()
+
+async def write_chunk(writer, text):
+    data = text.encode('utf-8')
+    writer.write(f'{len(data):X}\r\n'.encode('latin-1') + data + b'\r\n')
+    await writer.drain()
+
+def main():
+    port = int(sys.argv[sys.argv.index('--port') + 1]) if '--port' in sys.argv else 8765
+    workers = int(sys.argv[sys.argv.index('--workers') + 1]) if '--workers' in sys.argv else 2
+    service = SchedulingService('siparis.xlsx', test_mode='--test' in sys.argv, max_workers=workers)
+    service.load_orders()
+    asyncio.run(service.serve(port=port))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""Yavruların ucuz bir vekil (surrogate) modelle ön elemesi
+
+Vekil iki türlüdür: 'prefix' permütasyonun yalnızca baş kısmını çözümleyip
+kalan iş yükünü makinelere eşit dağıtarak toplam süreyi tahmin eder;
+'regression' bu tahmini ve komşu iş benzerliği özniteliklerini, daha önce
+tam değerlendirilmiş bireylerden çevrimiçi öğrenilen doğrusal bir modelle
+birleştirir. Yalnızca en umut verici kısım tam değerlendirilir.
+"""
+from collections import deque
+import numpy as np
+
+SURROGATE_METHODS = ('prefix', 'regression')
+
+def rank_correlation(estimates, actual):
+    """Spearman sıra korelasyonu (eşit değerler için sıra ortalaması yapılmaz)"""
+    if len(estimates) < 3:
+        return None
+    est_ranks = np.argsort(np.argsort(estimates))
+    act_ranks = np.argsort(np.argsort(actual))
+    if est_ranks.std() == 0 or act_ranks.std() == 0:
+        return None
+    return float(np.corrcoef(est_ranks, act_ranks)[0, 1])
+
+class SurrogateScreen:
+    """Değişen yavruları vekille sıralar, en iyi fraction kısmını tam değerlendirmeye seçer
+
+    prefix_fraction: 'prefix' tahmininde çözümlenen permütasyon oranı.
+    history: regresyon modelinin öğrendiği son örnek sayısı.
+    min_samples: regresyon modeli bu kadar örnek görene kadar tüm yavrular
+    tam değerlendirilir.
+    """
+
+    def __init__(self, scheduler, method='prefix', fraction=0.5, prefix_fraction=0.2, history=500, min_samples=30):
+        if method not in SURROGATE_METHODS:
+            raise ValueError(f"Bilinmeyen vekil yöntemi: {method} (seçenekler: {', '.join(SURROGATE_METHODS)})")
+        self.scheduler = scheduler
+        self.method = method
+        self.fraction = fraction
+        self.prefix_length = max(1, int(len(scheduler.work_orders) * prefix_fraction))
+        self.total_duration = sum(order['duration'] for order in scheduler.work_orders)
+        self.samples = deque(maxlen=history)
+        self.min_samples = min_samples
+        self.coefficients = None
+        self.stats = {
+            'method': method,
+            'fraction': fraction,
+            'screened': 0,
+            'evaluated': 0,
+            'rejected': 0,
+            'prefix_decodes': 0,
+            'decode_cost': 0.0,  # baş çözümlemelerinin tam değerlendirme karşılığı
+            'rank_correlation': deque(maxlen=1000),  # nesil başına, tam değerlendirilenler üzerinde
+            'abs_error_pct': deque(maxlen=1000)
+        }
+
+    def prefix_estimate(self, individual):
+        """Baş kısmı çözümleyip amaçları tahmin eder; ağırlıklı fitness döndürür
+
+        Baş çözümlemesi, çözümlenen iş oranı kadar kesirli değerlendirme
+        olarak scheduler.evaluations'a eklenir.
+        """
+        scheduler = self.scheduler
+        prefix = individual[:self.prefix_length]
+        schedule = scheduler.decode(prefix)
+        cost = len(prefix) / len(individual)
+        scheduler.evaluations += cost
+        self.stats['prefix_decodes'] += 1
+        self.stats['decode_cost'] += cost
+        machine_times = schedule['machine_times']
+        remaining = self.total_duration - sum(scheduler.work_orders[idx]['duration'] for idx in prefix)
+        objectives = list(scheduler.score_schedule(schedule))
+        objectives[0] = max(max(machine_times), (sum(machine_times) + remaining) / scheduler.machines)
+        return scheduler.weighted_fitness(objectives)
+
+    def features(self, individual):
+        """Regresyon öznitelikleri: baş tahmini ve ardışık işlerin varyant/ulak/sipariş benzerliği"""
+        codes = self.scheduler.order_codes
+        same = [0, 0, 0]
+        for prev_idx, idx in zip(individual, individual[1:]):
+            for k in range(3):
+                if codes[idx][k] and codes[idx][k] == codes[prev_idx][k]:
+                    same[k] += 1
+        pairs = max(len(individual) - 1, 1)
+        return [self.prefix_estimate(individual)] + [count / pairs for count in same] + [1.0]
+
+    def select(self, individuals):
+        """Tam değerlendirilecek bireylerin sıra numaralarını ve tüm tahminleri döndürür"""
+        self.stats['screened'] += len(individuals)
+        if self.method == 'prefix':
+            features = None
+            estimates = [self.prefix_estimate(individual) for individual in individuals]
+        else:
+            features = [self.features(individual) for individual in individuals]
+            if self.coefficients is None:
+                estimates = [row[0] for row in features]
+            else:
+                estimates = (np.asarray(features) @ self.coefficients).tolist()
+
+        if self.method == 'regression' and len(self.samples) < self.min_samples:
+            chosen = list(range(len(individuals)))  # model ısınıyor
+        else:
+            count = max(1, int(round(len(individuals) * self.fraction)))
+            chosen = sorted(range(len(individuals)), key=lambda i: estimates[i])[:count]
+        self.stats['evaluated'] += len(chosen)
+        self.stats['rejected'] += len(individuals) - len(chosen)
+        return chosen, estimates, features
+
+    def observe(self, estimates, actual, features=None):
+        """Tam değerlendirme sonuçlarıyla doğruluğu kaydeder ve regresyon modelini günceller"""
+        correlation = rank_correlation(estimates, actual)
+        if correlation is not None:
+            self.stats['rank_correlation'].append(correlation)
+        if actual:
+            errors = [abs(e - a) / abs(a) for e, a in zip(estimates, actual) if a]
+            if errors:
+                self.stats['abs_error_pct'].append(100 * sum(errors) / len(errors))
+
+        if features is not None:
+            self.samples.extend(zip(features, actual))
+            if len(self.samples) >= self.min_samples:
+                x = np.asarray([row for row, _ in self.samples])
+                y = np.asarray([value for _, value in self.samples])
+                self.coefficients = np.linalg.lstsq(x, y, rcond=None)[0]
+
+    def summary(self):
+        """Değerlendirme sayıları, vekilin kendi çözümleme maliyeti ve ortalama doğruluk
+
+        net_saved_evaluations: elenen yavrular eksi baş çözümlemelerinin tam
+        değerlendirme karşılığı.
+        """
+        correlations = self.stats['rank_correlation']
+        errors = self.stats['abs_error_pct']
+        return {
+            'method': self.method,
+            'fraction': self.fraction,
+            'screened': self.stats['screened'],
+            'evaluated': self.stats['evaluated'],
+            'rejected': self.stats['rejected'],
+            'prefix_decodes': self.stats['prefix_decodes'],
+            'decode_cost': round(self.stats['decode_cost'], 1),
+            'net_saved_evaluations': round(self.stats['rejected'] - self.stats['decode_cost'], 1),
+            'mean_rank_correlation': sum(correlations) / len(correlations) if correlations else None,
+            'mean_abs_error_pct': sum(errors) / len(errors) if errors else None
+        }
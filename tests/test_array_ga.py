@@ -0,0 +1,50 @@
+"""Dizi tabanlı GA operatörleri: çocuklar ve mutantlar her zaman permütasyondur"""
+import numpy as np
+import pytest
+from array_ga import ArrayGeneticScheduler, order_crossover, shuffle_mutation
+
+def random_permutations(rng, rows, length):
+    return np.argsort(rng.random((rows, length)), axis=1).astype(np.int32)
+
+def assert_permutations(population, length):
+    assert (np.sort(population, axis=1) == np.arange(length)).all()
+
+@pytest.mark.parametrize('length', [1, 2, 3, 10, 257])
+def test_order_crossover_returns_permutations(length):
+    rng = np.random.default_rng(length)
+    for _ in range(20):
+        parents_a = random_permutations(rng, 16, length)
+        parents_b = random_permutations(rng, 16, length)
+        assert_permutations(order_crossover(parents_a, parents_b, rng), length)
+
+def test_order_crossover_identical_parents():
+    rng = np.random.default_rng(0)
+    parents = random_permutations(rng, 8, 30)
+    assert (order_crossover(parents, parents.copy(), rng) == parents).all()
+
+def test_order_crossover_keeps_segment_and_fills_in_order():
+    # Kesit [2, 5) birinci ebeveynden aynı konumda; kalanlar ikinci ebeveynin sırasıyla
+    class FixedCuts:
+        def integers(self, low, high, size):
+            return np.array([[2, 5]])
+    parents_a = np.array([[0, 1, 2, 3, 4, 5, 6, 7]])
+    parents_b = np.array([[7, 6, 5, 4, 3, 2, 1, 0]])
+    child = order_crossover(parents_a, parents_b, FixedCuts())
+    assert child.tolist() == [[7, 6, 2, 3, 4, 5, 1, 0]]
+
+@pytest.mark.parametrize('indpb', [0.0, 0.05, 0.5, 1.0])
+def test_shuffle_mutation_returns_permutations(indpb):
+    rng = np.random.default_rng(1)
+    population = random_permutations(rng, 32, 50)
+    original = population.copy()
+    shuffle_mutation(population, indpb, rng)
+    assert_permutations(population, 50)
+    if indpb == 0.0:
+        assert (population == original).all()
+
+def test_array_scheduler_population_stays_permutations():
+    orders = [{'id': k, 'duration': 1.0 + k % 5, 'quantity': 10.0, 'varyantKodu': f'V{k % 4}',
+               'ulakKodu': f'U{k % 2}', 'siparisId': f'S{k}'} for k in range(25)]
+    scheduler = ArrayGeneticScheduler(orders, machines=3, population_size=10, quiet=True)
+    scheduler.optimize(generations=5, seed=3)
+    assert_permutations(np.asarray(scheduler.last_population), len(orders))
@@ -0,0 +1,75 @@
+"""Çözücü düzeyinde iş emri bölme (split_pieces) ve tezgah takvimi"""
+import math
+from genetic_algorithm import GeneticScheduler
+from machine_calendar import MachineCalendar
+from schedule_timeline import TYPE_CHANGE_MINUTES
+
+SETUP = TYPE_CHANGE_MINUTES['TAKIM'] / 60
+
+def big_order(max_splits=3, min_split_quantity=10):
+    return {'id': 1, 'duration': 30.0, 'quantity': 300.0, 'max_splits': max_splits,
+            'min_split_quantity': min_split_quantity, 'varyantKodu': 'V1', 'ulakKodu': 'U1', 'siparisId': 'S1'}
+
+def decode_rows(scheduler):
+    schedule = scheduler.decode([0], materialize=True)
+    timeline = schedule['timeline']
+    rows = list(zip(timeline['machine'], timeline['start'], timeline['end'], timeline['fraction']))
+    return schedule, rows
+
+def test_split_fills_idle_machines_evenly():
+    scheduler = GeneticScheduler([big_order()], machines=3, population_size=4, split_orders=True)
+    schedule, rows = decode_rows(scheduler)
+    assert sorted(machine for machine, _, _, _ in rows) == [0, 1, 2]
+    assert math.isclose(sum(fraction for _, _, _, fraction in rows), 1.0)
+    # Su doldurma: tüm parçalar aynı anda biter
+    for _, start, end, _ in rows:
+        assert math.isclose(end, (30.0 + 3 * SETUP) / 3)
+    assert math.isclose(max(schedule['machine_times']), (30.0 + 3 * SETUP) / 3)
+
+def test_no_split_without_split_orders():
+    scheduler = GeneticScheduler([big_order()], machines=3, population_size=4)
+    _, rows = decode_rows(scheduler)
+    assert len(rows) == 1 and rows[0][3] == 1.0
+
+def test_min_split_quantity_blocks_small_pieces():
+    scheduler = GeneticScheduler([big_order(min_split_quantity=200)], machines=3, population_size=4,
+                                 split_orders=True)
+    _, rows = decode_rows(scheduler)
+    assert len(rows) == 1
+
+def test_max_splits_limits_piece_count():
+    scheduler = GeneticScheduler([big_order(max_splits=2)], machines=3, population_size=4, split_orders=True)
+    _, rows = decode_rows(scheduler)
+    assert len(rows) == 2
+
+def test_pieces_stay_off_machine_down_indefinitely():
+    # 1 numaralı makine 12. saatten sonra süresiz arızada: parça 3. saatte başlayabilse de
+    # ortak bitişten (13. saat) önce kapanır; bu makineye parça verilmemeli
+    calendar = MachineCalendar({1: [(12.0, math.inf)]}, machines=3)
+    scheduler = GeneticScheduler([big_order()], machines=3, population_size=4, calendar=calendar,
+                                 split_orders=True)
+    schedule, rows = decode_rows(scheduler)
+    assert all(machine != 1 for machine, _, _, _ in rows)
+    assert all(math.isfinite(end) for _, _, end, _ in rows)
+    assert math.isfinite(max(schedule['machine_times']))
+    assert math.isclose(sum(fraction for _, _, _, fraction in rows), 1.0)
+    assert math.isclose(max(end for _, _, end, _ in rows), (30.0 + 2 * SETUP) / 2)
+
+def test_split_pieces_skips_unavailable_helpers():
+    calendar = MachineCalendar({1: [(12.0, math.inf)], 2: [(0.0, math.inf)]}, machines=3)
+    scheduler = GeneticScheduler([big_order()], machines=3, population_size=4, calendar=calendar,
+                                 split_orders=True)
+    assert scheduler.split_pieces(0, 0, SETUP, [0.0, 0.0, 0.0], [None, None, None]) is None
+
+def test_split_schedule_scores_finite_with_many_orders():
+    orders = [dict(big_order(), id=k, siparisId=f'S{k}', varyantKodu=f'V{k % 3}') for k in range(12)]
+    calendar = MachineCalendar({0: [(40.0, math.inf)], 2: [(10.0, 20.0)]}, machines=4)
+    scheduler = GeneticScheduler(orders, machines=4, population_size=4, calendar=calendar, split_orders=True)
+    schedule = scheduler.decode(list(range(12)), materialize=True)
+    assert all(math.isfinite(end) for end in schedule['timeline']['end'])
+    assert all(math.isfinite(value) for value in scheduler.score_schedule(schedule))
+    # Her iş emrinin parça payları toplamı 1
+    totals = {}
+    for idx, fraction in zip(schedule['timeline']['order_index'], schedule['timeline']['fraction']):
+        totals[idx] = totals.get(idx, 0.0) + fraction
+    assert all(math.isclose(total, 1.0) for total in totals.values())
@@ -0,0 +1,104 @@
+"""MachineCalendar sorgularının kaba kuvvet taramasıyla karşılaştırılması"""
+import math
+import random
+import pytest
+from machine_calendar import MachineCalendar, machine_aliases, parse_machine
+
+STEP = 0.5      # tüm uçlar ve süreler bu adımın katları; tarama bu adımla kesindir
+HORIZON = 400.0
+
+def is_open(intervals, t):
+    """t anında başlayan STEP uzunluğundaki dilim açık mı"""
+    return all(not (start <= t < end) for start, end in intervals)
+
+def brute_earliest_start(intervals, t, duration):
+    s = t
+    while s <= HORIZON:
+        if all(not (s < end and start < s + duration) for start, end in intervals):
+            return s
+        s += STEP
+    return math.inf
+
+def brute_finish_time(intervals, start, duration):
+    t, done = start, 0.0
+    while done < duration:
+        if t > HORIZON:
+            return math.inf
+        if is_open(intervals, t):
+            done += STEP
+        t += STEP
+    return t
+
+def random_downtimes(rng, open_ended):
+    intervals = []
+    for _ in range(rng.randint(0, 8)):
+        start = rng.randint(0, 160) * STEP
+        intervals.append((start, start + rng.randint(1, 30) * STEP))
+    if open_ended:
+        intervals.append((rng.randint(100, 200) * STEP, math.inf))
+    return intervals
+
+@pytest.mark.parametrize('seed', range(40))
+def test_queries_match_brute_force(seed):
+    rng = random.Random(seed)
+    intervals = random_downtimes(rng, open_ended=seed % 3 == 0)
+    calendar = MachineCalendar({0: intervals}, machines=1)
+    # Birleştirilmiş aralıklar da aynı kapalı kümeyi tanımlar
+    merged = calendar.downtimes(0)
+    for _ in range(30):
+        t = rng.randint(0, 200) * STEP
+        duration = rng.randint(1, 24) * STEP
+        assert calendar.earliest_start(0, t, duration) == brute_earliest_start(intervals, t, duration)
+        assert calendar.earliest_start(0, t, duration) == brute_earliest_start(merged, t, duration)
+        assert calendar.finish_time(0, t, duration) == brute_finish_time(intervals, t, duration)
+
+@pytest.mark.parametrize('seed', range(20))
+def test_schedule_block_matches_brute_force(seed):
+    rng = random.Random(100 + seed)
+    intervals = random_downtimes(rng, open_ended=seed % 2 == 0)
+    resumable = MachineCalendar({0: intervals}, machines=1, resumable=True)
+    whole = MachineCalendar({0: intervals}, machines=1, resumable=False)
+    for _ in range(20):
+        ready = rng.randint(0, 200) * STEP
+        setup = rng.randint(1, 6) * STEP  # hazırlık en az 30 dakikadır
+        duration = rng.randint(1, 24) * STEP
+
+        # Hazırlık bölünmez, üretim kapalı aralıklarda durup devam eder
+        start = brute_earliest_start(intervals, ready, setup) + setup
+        finish = brute_finish_time(intervals, start, duration) if start != math.inf else math.inf
+        assert resumable.schedule_block(0, ready, setup, duration) == (start, finish)
+
+        # Hazırlık ve üretim tek parça sığacağı ilk boşluğa kayar
+        start = brute_earliest_start(intervals, ready, setup + duration) + setup
+        assert whole.schedule_block(0, ready, setup, duration) == (start, start + duration)
+
+def test_machine_without_downtime():
+    calendar = MachineCalendar({1: [(5.0, 10.0)]}, machines=2)
+    assert calendar.earliest_start(0, 7.0, 100.0) == 7.0
+    assert calendar.finish_time(0, 7.0, 3.0) == 10.0
+    assert not calendar.open_ended
+
+def test_open_ended_downtime():
+    calendar = MachineCalendar({0: [(20.0, math.inf)]}, machines=1)
+    assert calendar.open_ended
+    assert calendar.earliest_start(0, 10.0, 10.0) == 10.0
+    assert calendar.earliest_start(0, 10.0, 10.5) == math.inf
+    assert calendar.finish_time(0, 10.0, 10.5) == math.inf
+    assert calendar.schedule_block(0, 25.0, 1.0, 1.0) == (math.inf, math.inf)
+
+def test_subset_renumbers_machines():
+    calendar = MachineCalendar({0: [(1.0, 2.0)], 3: [(4.0, 6.0)]}, machines=4)
+    subset = calendar.subset([3, 0])
+    assert subset.downtimes(0) == [(4.0, 6.0)]
+    assert subset.downtimes(1) == [(1.0, 2.0)]
+
+@pytest.mark.parametrize('value, expected', [
+    ('mk101', 0), ('MK201 ', 3), ('mk304', 9), ('mk110', 9), (3, 2), ('10', 9), (3.0, 2), (201, 3), ('1.0', 0),
+])
+def test_parse_machine(value, expected):
+    assert parse_machine(value, machine_aliases(10), 10) == expected
+
+@pytest.mark.parametrize('value', ['mk999', 11, 'tezgah', ''])
+def test_parse_machine_rejects_unknown(value):
+    with pytest.raises(ValueError):
+        parse_machine(value, machine_aliases(10), 10)
@@ -0,0 +1,35 @@
+"""Servisin sakladığı popülasyonun veri yeniden yüklemelerinde uyarlanması"""
+import random
+from scheduling_service import remap_population
+
+def orders_with_ids(ids):
+    return [{'id': order_id} for order_id in ids]
+
+def test_empty_population():
+    assert remap_population(None, orders_with_ids([1, 2])) is None
+    assert remap_population([], orders_with_ids([1, 2])) is None
+
+def test_same_orders_in_new_positions():
+    # Yeniden okumada iş emri listesinin sırası değişebilir; kimlik sırası korunur
+    work_orders = orders_with_ids(['c', 'a', 'b'])
+    population = remap_population([['a', 'b', 'c'], ['c', 'b', 'a']], work_orders)
+    assert [[work_orders[idx]['id'] for idx in perm] for perm in population] == [['a', 'b', 'c'], ['c', 'b', 'a']]
+
+def test_removed_and_added_orders():
+    random.seed(0)
+    old_ids = list(range(20))
+    population_ids = [random.sample(old_ids, len(old_ids)) for _ in range(5)]
+    new_ids = [order_id for order_id in old_ids if order_id % 4 != 0] + [100, 101, 102]
+    work_orders = orders_with_ids(new_ids)
+    population = remap_population(population_ids, work_orders)
+    assert len(population) == len(population_ids)
+    for ids, perm in zip(population_ids, population):
+        # Her birey yeni listenin permütasyonudur
+        assert sorted(perm) == list(range(len(work_orders)))
+        # Kalan iş emirlerinin göreli sırası korunur
+        kept = [work_orders[idx]['id'] for idx in perm if work_orders[idx]['id'] < 100]
+        assert kept == [order_id for order_id in ids if order_id % 4 != 0]
+
+def test_all_orders_replaced():
+    population = remap_population([[1, 2, 3]], orders_with_ids([7, 8]))
+    assert sorted(population[0]) == [0, 1]
@@ -0,0 +1,41 @@
+"""Ortak tip değişim kuralları (classify_codes) ve iş emri sarmalayıcıları"""
+import pytest
+from data_processor import DataProcessor
+from schedule_timeline import TYPE_CHANGE_MINUTES, classify_codes, classify_type_change, clean_code
+
+@pytest.mark.parametrize('codes, expected', [
+    (('V1', 'U1', 'V1', 'U1'), 'VARYANT'),
+    (('V1', 'U1', 'V1', 'U2'), 'VARYANT'),
+    (('V1', 'U1', 'V2', 'U1'), 'ULAK'),
+    (('V1', 'U1', 'V2', 'U2'), 'TAKIM'),
+    (('V1', None, 'V2', None), 'TAKIM'),
+    # Varyant kodu boşsa ulak aynı olsa da takım değişimi (eski check_type_change ULAK derdi)
+    ((None, 'U1', 'V2', 'U1'), 'TAKIM'),
+    (('V1', 'U1', None, 'U1'), 'TAKIM'),
+    ((None, None, None, None), 'TAKIM'),
+])
+def test_classify_codes(codes, expected):
+    assert classify_codes(*codes) == expected
+
+@pytest.mark.parametrize('value, expected', [
+    (None, None), ('', None), ('  ', None), ('nan', None), (float('nan'), None), ('None', None),
+    (' V1 ', 'V1'), (123, '123'),
+])
+def test_clean_code(value, expected):
+    assert clean_code(value) == expected
+
+def test_classify_type_change_cleans_order_codes():
+    current = {'varyantKodu': ' V1', 'ulakKodu': 'U1'}
+    assert classify_type_change(current, None) == 'TAKIM'
+    assert classify_type_change(current, {'varyantKodu': 'V1 ', 'ulakKodu': 'U9'}) == 'VARYANT'
+    assert classify_type_change(current, {'varyantKodu': 'V2', 'ulakKodu': ' U1'}) == 'ULAK'
+    assert classify_type_change(current, {'varyantKodu': float('nan'), 'ulakKodu': 'U1'}) == 'TAKIM'
+
+def test_data_processor_uses_shared_rules():
+    processor = DataProcessor('siparis.xlsx')
+    for codes in [('V1', 'U1', 'V1', 'U2'), ('V1', 'U1', 'V2', 'U1'), ('', 'U1', 'V2', 'U1'),
+                  ('V1', 'nan', 'V2', 'nan'), ('V1', 'U1', None, None)]:
+        assert processor.check_type_change(*codes) == classify_codes(*(clean_code(code) for code in codes))
+
+def test_change_minutes_ordering():
+    assert TYPE_CHANGE_MINUTES['VARYANT'] < TYPE_CHANGE_MINUTES['ULAK'] < TYPE_CHANGE_MINUTES['TAKIM']
@@ -0,0 +1,67 @@
+"""Çözücüde gecikme hesabı, gecikme amaçları ve tardiness_limit cezası"""
+import math
+from datetime import datetime, timedelta
+import pytest
+from genetic_algorithm import GeneticScheduler
+from schedule_timeline import TYPE_CHANGE_MINUTES
+
+PLAN_START = datetime(2025, 1, 1)
+SETUP = TYPE_CHANGE_MINUTES['TAKIM'] / 60
+
+def orders():
+    # Tek makinede sırayla: A 3-13 (termin 5, 8 saat gecikme), B 16-20 (termin 100), C termin yok
+    return [
+        {'id': 1, 'duration': 10.0, 'quantity': 10.0, 'varyantKodu': 'A', 'ulakKodu': 'UA', 'siparisId': 'S1',
+         'hamTermin': PLAN_START + timedelta(hours=5)},
+        {'id': 2, 'duration': 4.0, 'quantity': 10.0, 'varyantKodu': 'B', 'ulakKodu': 'UB', 'siparisId': 'S2',
+         'hamTermin': PLAN_START + timedelta(hours=100)},
+        {'id': 3, 'duration': 2.0, 'quantity': 10.0, 'varyantKodu': 'C', 'ulakKodu': 'UC', 'siparisId': 'S3',
+         'hamTermin': None},
+    ]
+
+def scheduler(**kwargs):
+    return GeneticScheduler(orders(), machines=1, population_size=4, plan_start=PLAN_START, **kwargs)
+
+def test_decoder_tardiness():
+    schedule = scheduler().decode([0, 1, 2], materialize=True)
+    assert schedule['timeline']['end'] == [SETUP + 10.0, 2 * SETUP + 14.0, 3 * SETUP + 16.0]
+    assert math.isclose(schedule['total_tardiness'], 8.0)
+    assert math.isclose(schedule['max_tardiness'], 8.0)
+    assert schedule['late_jobs'] == 1
+    assert schedule['timeline']['tardiness'] == [8.0, 0.0, 0.0]
+
+def test_order_changes_tardiness():
+    schedule = scheduler().decode([1, 0, 2])
+    # B 3-7, A 10-20: 15 saat gecikme
+    assert math.isclose(schedule['total_tardiness'], 15.0)
+    assert schedule['late_jobs'] == 1
+
+def test_tardiness_objectives():
+    plain = scheduler()
+    weighted = scheduler(tardiness_weights=(-1, -1))
+    assert len(plain.score_schedule(plain.decode([0, 1, 2]))) == 3
+    objectives = weighted.score_schedule(weighted.decode([0, 1, 2]))
+    assert len(objectives) == 5
+    assert math.isclose(objectives[3], 8.0 / 3)  # iş emri başına toplam gecikme
+    assert math.isclose(objectives[4], 8.0)
+    # İlk üç amaç gecikme amaçlarından etkilenmez
+    assert objectives[:3] == plain.score_schedule(plain.decode([0, 1, 2]))
+
+@pytest.mark.parametrize('limit, penalty', [(None, 0.0), (10.0, 0.0), (8.0, 0.0), (5.0, 3.0), (0.0, 8.0)])
+def test_tardiness_limit_penalizes_makespan(limit, penalty):
+    limited = scheduler(tardiness_limit=limit)
+    schedule = limited.decode([0, 1, 2])
+    assert math.isclose(limited.score_schedule(schedule)[0], max(schedule['machine_times']) + penalty)
+
+def test_tardiness_requires_plan_start():
+    with pytest.raises(ValueError):
+        GeneticScheduler(orders(), machines=1, population_size=4, tardiness_weights=(-1, -1))
+    with pytest.raises(ValueError):
+        GeneticScheduler(orders(), machines=1, population_size=4, tardiness_limit=24)
+
+def test_resumed_decode_keeps_tardiness():
+    limited = scheduler(tardiness_weights=(-1, -1))
+    snapshots = {}
+    full = limited.decode([0, 1, 2], snapshots=snapshots, snapshot_every=1)
+    resumed = limited.decode([0, 1, 2], resume=snapshots[1])
+    assert limited.score_schedule(resumed) == limited.score_schedule(full)
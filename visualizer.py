@@ -1,13 +1,207 @@
-import plotly.figure_factory as ff
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import json
+import os
 from plotly.subplots import make_subplots
 
+# Gantt görev sütunları (main.py'deki görev sözlüğü anahtarları)
+GANTT_COLUMNS = ['Machine', 'Start', 'Duration', 'Type', 'quantity', 'atki_sikligi', 'siparisId',
+                 'siparisDetayId', 'tipAd', 'varyantKodu', 'ulakKodu', 'hamTermin']
+
+CHANGE_HOVER = "<b>Tip Değişim:</b> %{customdata[5]}<br>" + \
+               "<b>Süre:</b> %{customdata[6]}<extra></extra>"
+TASK_HOVER = (
+    "<b>Sipariş No:</b> %{customdata[0]}<br>" + \
+    "<b>Sipariş Detay No:</b> %{customdata[1]}<br>" + \
+    "<b>Tip:</b> %{customdata[2]}<br>" + \
+    "<b>Varyant Kodu:</b> %{customdata[3]}<br>" + \
+    "<b>Ulak Kodu:</b> %{customdata[4]}<br>" + \
+    "<b>Tip Değişim:</b> %{customdata[5]}<br>" + \
+    "<b>Süre:</b> %{customdata[6]}<br>" + \
+    "<b>Miktar:</b> %{customdata[7]} metre<br>" + \
+    "<b>Atkı Sıklığı:</b> %{customdata[8]}<extra></extra>"
+)
+HOVER_COLUMNS = ['SiparisId', 'SiparisDetayId', 'TipAd', 'VaryantKodu', 'UlakKodu', 'Type', 'Duration',
+                 'Quantity', 'Pick_Frequency']
+SUMMARY_HOVER = (
+    "<b>Aile:</b> %{customdata[0]}<br>" + \
+    "<b>İş Sayısı:</b> %{customdata[1]}<br>" + \
+    "<b>Toplam Miktar:</b> %{customdata[2]} metre<br>" + \
+    "<b>Süre:</b> %{customdata[3]}<extra></extra>"
+)
+
+# Tablo ve grafik kütüphaneleri: dosya adı -> CDN adresi
+CDN_ASSETS = {
+    'jquery.dataTables.css': 'https://cdn.datatables.net/1.11.5/css/jquery.dataTables.css',
+    'buttons.dataTables.min.css': 'https://cdn.datatables.net/buttons/2.2.2/css/buttons.dataTables.min.css',
+    'jquery-3.5.1.min.js': 'https://code.jquery.com/jquery-3.5.1.min.js',
+    'jquery.dataTables.min.js': 'https://cdn.datatables.net/1.11.5/js/jquery.dataTables.min.js',
+    'dataTables.buttons.min.js': 'https://cdn.datatables.net/buttons/2.2.2/js/dataTables.buttons.min.js',
+    'buttons.html5.min.js': 'https://cdn.datatables.net/buttons/2.2.2/js/buttons.html5.min.js'
+}
+PLOTLY_ASSET = 'plotly.min.js'
+
+# DataTables Türkçe dil ayarları (yükleme sırasında ağdan çekilmemesi için gömülü)
+DATATABLES_TR = {
+    'sDecimal': ',',
+    'sEmptyTable': 'Tabloda herhangi bir veri mevcut değil',
+    'sInfo': '_TOTAL_ kayıttan _START_ - _END_ arasındaki kayıtlar gösteriliyor',
+    'sInfoEmpty': 'Kayıt yok',
+    'sInfoFiltered': '(_MAX_ kayıt içerisinden bulunan)',
+    'sInfoPostFix': '',
+    'sInfoThousands': '.',
+    'sLengthMenu': 'Sayfada _MENU_ kayıt göster',
+    'sLoadingRecords': 'Yükleniyor...',
+    'sProcessing': 'İşleniyor...',
+    'sSearch': 'Ara:',
+    'sZeroRecords': 'Eşleşen kayıt bulunamadı',
+    'oPaginate': {'sFirst': 'İlk', 'sLast': 'Son', 'sNext': 'Sonraki', 'sPrevious': 'Önceki'},
+    'oAria': {
+        'sSortAscending': ': artan sütun sıralamasını aktifleştir',
+        'sSortDescending': ': azalan sütun sıralamasını aktifleştir'
+    },
+    'buttons': {'copy': 'Kopyala', 'copyTitle': 'Panoya kopyalandı', 'csv': 'CSV', 'excel': 'Excel'}
+}
+
+# Tablo verisinin HTML'e gömüldüğü (küçük çizelgeler için) betik
+INLINE_GRID_SCRIPT = """<script>
+    $(document).ready(function() {
+        var gridData = __GRID_DATA__;
+        $('#scheduleGrid').DataTable({
+            data: gridData,
+            deferRender: true,
+            columns: [
+                { data: 'Makine' },
+                { data: 'İşlem Tipi' },
+                { data: 'Başlangıç' },
+                { data: 'Bitiş' },
+                { data: 'Süre' },
+                { data: 'Sipariş No' },
+                { data: 'Sipariş Detay No' },
+                { data: 'Tip' },
+                { data: 'Varyant Kodu' },
+                { data: 'Ulak Kodu' },
+                { data: 'Miktar' },
+                { data: 'Atkı Sıklığı' },
+                { data: 'Termin' }
+            ],
+            dom: 'Bfrtip',
+            buttons: ['copy', 'csv', 'excel'],
+            pageLength: 25,
+            order: [[0, 'asc'], [2, 'asc']],
+            language: __GRID_LANGUAGE__
+        });
+    });
+</script>"""
+
+# Yan dosyadan sayfalı yükleme: tablo sunucu tarafı moduna alınır, varsayılan
+# sıralamada yalnızca görüntülenen sayfaların dosyaları yüklenir; arama ya da
+# farklı sıralama istendiğinde tüm sayfalar bir kez yüklenip bellekte işlenir.
+SIDECAR_GRID_SCRIPT = """<script>
+    $(document).ready(function() {
+        var meta = __GRID_META__;
+        var pages = {};
+        var waiting = {};
+        var allRows = null;
+
+        window.cizelgeSayfa = function(index, rows) {
+            pages[index] = rows;
+            (waiting[index] || []).forEach(function(done) { done(); });
+            delete waiting[index];
+        };
+
+        function loadPage(index, done) {
+            if (pages[index]) { done(); return; }
+            if (waiting[index]) { waiting[index].push(done); return; }
+            waiting[index] = [done];
+            var script = document.createElement('script');
+            script.src = meta.dir + '/sayfa_' + ('0000' + index).slice(-4) + '.js';
+            document.head.appendChild(script);
+        }
+
+        function loadPages(first, last, done) {
+            var remaining = last - first + 1;
+            if (remaining <= 0) { done(); return; }
+            for (var i = first; i <= last; i++) {
+                loadPage(i, function() { if (--remaining === 0) { done(); } });
+            }
+        }
+
+        function rowsBetween(start, end) {
+            var rows = [];
+            for (var i = Math.floor(start / meta.pageSize); i * meta.pageSize < end && i < meta.pageCount; i++) {
+                var offset = i * meta.pageSize;
+                rows = rows.concat(pages[i].slice(Math.max(start - offset, 0), end - offset));
+            }
+            return rows;
+        }
+
+        function isDefaultOrder(order) {
+            return order.length === 0 || (order[0].column === 0 && order[0].dir === 'asc' &&
+                (order.length === 1 || (order[1].column === 2 && order[1].dir === 'asc')));
+        }
+
+        $('#scheduleGrid').DataTable({
+            serverSide: true,
+            deferRender: true,
+            processing: true,
+            ajax: function(request, callback) {
+                var search = request.search.value.toLowerCase();
+                var length = request.length < 0 ? meta.total : request.length;
+                if (!search && isDefaultOrder(request.order)) {
+                    var end = Math.min(request.start + length, meta.total);
+                    loadPages(Math.floor(request.start / meta.pageSize),
+                              Math.floor(Math.max(end - 1, 0) / meta.pageSize), function() {
+                        callback({ draw: request.draw, recordsTotal: meta.total,
+                                   recordsFiltered: meta.total, data: rowsBetween(request.start, end) });
+                    });
+                    return;
+                }
+                loadPages(0, meta.pageCount - 1, function() {
+                    if (allRows === null) { allRows = rowsBetween(0, meta.total); }
+                    var rows = search ? allRows.filter(function(row) {
+                        return row.join(' ').toLowerCase().indexOf(search) >= 0;
+                    }) : allRows.slice();
+                    rows.sort(function(a, b) {
+                        for (var k = 0; k < request.order.length; k++) {
+                            var column = request.order[k].column;
+                            var x = a[column] === null ? '' : a[column];
+                            var y = b[column] === null ? '' : b[column];
+                            if (x !== y) {
+                                var result = x < y ? -1 : 1;
+                                return request.order[k].dir === 'asc' ? result : -result;
+                            }
+                        }
+                        return 0;
+                    });
+                    callback({ draw: request.draw, recordsTotal: meta.total, recordsFiltered: rows.length,
+                               data: rows.slice(request.start, request.start + length) });
+                });
+            },
+            dom: 'Bfrtip',
+            buttons: ['copy', 'csv', 'excel'],
+            pageLength: 25,
+            order: [[0, 'asc'], [2, 'asc']],
+            language: __GRID_LANGUAGE__
+        });
+    });
+</script>"""
+
 class ScheduleVisualizer:
-    def __init__(self):
+    def __init__(self, asset_mode='cdn', assets_dir='rapor_varliklari', download_assets=False):
+        """asset_mode: 'cdn' (kütüphaneler internetten) ya da 'offline'
+        (kütüphaneler assets_dir klasöründen, tüm raporlar aynı kopyayı kullanır)
+
+        download_assets: True ise çevrimdışı pakette eksik dosyalar CDN'den
+        indirilir (hazırlık adımı, bkz. main.py --prepare-assets); aksi halde
+        ağa çıkılmaz, eksikler için yalnızca uyarı verilir."""
+        self.asset_mode = asset_mode
+        self.assets_dir = assets_dir
+        if asset_mode == 'offline':
+            self.prepare_offline_assets(download=download_assets)
+
         self.colors = {
             'VARYANT'.lower(): 'rgb(144, 238, 144)',  # açık yeşil
             'ULAK'.lower(): 'rgb(238, 130, 238)',     # lila
@@ -15,6 +209,73 @@ class ScheduleVisualizer:
             'change': 'rgb(220, 20, 60)'      # kızıl
         }
     
+    def prepare_offline_assets(self, download=False):
+        """Çevrimdışı rapor paketini hazırlar
+
+        plotly.js kurulu plotly paketinden yazılır; jQuery/DataTables dosyaları
+        yalnızca download=True ise CDN'den bir kez indirilir. Ağa kapalı
+        makinelerde klasör, ağ erişimi olan bir makinede hazırlanıp kopyalanmalıdır.
+        """
+        os.makedirs(self.assets_dir, exist_ok=True)
+        plotly_path = os.path.join(self.assets_dir, PLOTLY_ASSET)
+        if not os.path.exists(plotly_path):
+            from plotly.offline import get_plotlyjs
+            with open(plotly_path, 'w', encoding='utf-8') as f:
+                f.write(get_plotlyjs())
+
+        missing = []
+        for name, url in CDN_ASSETS.items():
+            path = os.path.join(self.assets_dir, name)
+            if os.path.exists(path):
+                continue
+            if download:
+                try:
+                    from urllib.request import urlopen
+                    with urlopen(url, timeout=10) as response:
+                        content = response.read()
+                    with open(path, 'wb') as f:
+                        f.write(content)
+                    continue
+                except OSError as e:
+                    print(f"Varlık indirilemedi ({name}): {str(e)}")
+            missing.append(name)
+
+        if missing:
+            print(f"Uyarı: Çevrimdışı pakette eksik dosyalar var ({self.assets_dir}): {', '.join(missing)} "
+                  f"(ağ erişimi olan bir makinede 'python main.py --prepare-assets' ile hazırlayın)")
+        return missing
+
+    def asset_url(self, name, filename):
+        """Varlığın rapor dosyasına göre adresini döndürür (CDN ya da göreli yol)"""
+        if self.asset_mode != 'offline':
+            return CDN_ASSETS[name]
+        report_dir = os.path.dirname(os.path.abspath(filename))
+        relative = os.path.relpath(os.path.join(os.path.abspath(self.assets_dir), name), report_dir)
+        return relative.replace(os.sep, '/')
+
+    def head_assets(self, filename):
+        """Gantt sayfasının <head> bölümündeki stil ve betik etiketleri"""
+        tags = []
+        for name in CDN_ASSETS:
+            url = self.asset_url(name, filename)
+            if name.endswith('.css'):
+                tags.append(f'<link rel="stylesheet" type="text/css" href="{url}">')
+            else:
+                tags.append(f'<script type="text/javascript" src="{url}"></script>')
+        if self.asset_mode == 'offline':
+            tags.append(f'<script type="text/javascript" src="{self.asset_url(PLOTLY_ASSET, filename)}"></script>')
+        return '\n                '.join(tags)
+
+    def plotlyjs_include(self, filename, default):
+        """plotly.js'in rapora nasıl ekleneceği (çevrimdışında ortak kopya)"""
+        if self.asset_mode == 'offline':
+            return self.asset_url(PLOTLY_ASSET, filename)
+        return default
+
+    def write_figure_html(self, fig, filename):
+        """Tek başına grafik sayfasını (analiz, deney grafikleri) kaydeder"""
+        fig.write_html(filename, include_plotlyjs=self.plotlyjs_include(filename, True))
+
     def format_duration(self, hours):
         """Saat cinsinden süreyi saat ve dakika olarak biçimlendirir"""
         total_minutes = int(hours * 60)
@@ -22,129 +283,139 @@ class ScheduleVisualizer:
         minutes = total_minutes % 60
         return f"{hours} saat {minutes} dakika"
     
-    def create_gantt(self, machine_schedules, filename):
-        # Gantt şeması için veri hazırlama
-        df = pd.DataFrame(columns=['Task', 'Start', 'Finish', 'Resource', 'Type', 'Duration', 'Quantity', 'Pick_Frequency', 'Description'])
-        grid_data = []
-        
+    def format_durations(self, hours):
+        """Süre serisini (saat) vektörel olarak saat ve dakika metnine çevirir"""
+        total_minutes = (hours.astype(float) * 60).astype(int)
+        return (total_minutes // 60).astype(str) + ' saat ' + (total_minutes % 60).astype(str) + ' dakika'
+
+    def collect_tasks(self, machine_schedules):
+        """Görevleri sütun listelerinde toplayıp tek adımda DataFrame oluşturur
+
+        Makine adı -> görev listesi sözlüğü, hazır sütunlu bir zaman çizelgesi
+        (DataFrame ya da 'Machine' anahtarlı liste sözlüğü) kabul edilir.
+        """
+        if isinstance(machine_schedules, pd.DataFrame):
+            return machine_schedules.reset_index(drop=True)
+        if 'Machine' in machine_schedules:
+            return pd.DataFrame(machine_schedules)
+
+        columns = {column: [] for column in GANTT_COLUMNS}
+        task_columns = GANTT_COLUMNS[1:]
         for machine_name, tasks in machine_schedules.items():
-            for task in tasks:
-                try:
-                    start_time = pd.to_datetime('2025-01-01') + pd.Timedelta(hours=task['Start'])
-                    end_time = pd.to_datetime('2025-01-01') + pd.Timedelta(hours=task['Start'] + task['Duration'])
-                    
-                    duration_str = self.format_duration(task['Duration'])
-                    quantity = task.get('quantity', None)
-                    quantity_str = f"{quantity:.2f}" if quantity is not None else ""
-                    pick_frequency = task.get('atki_sikligi', '')
-                    
-                    if task['Type'].lower() == 'change':
-                        hover_text = (
-                            f"Tip Değişim: {task['Type']}<br>"
-                            f"Süre: {duration_str}"
-                        )
-                    else:
-                        hover_text = (
-                            f"Sipariş No: {task.get('siparisId', '')}<br>"
-                            f"Sipariş Detay No: {task.get('siparisDetayId', '')}<br>"
-                            f"Tip: {task.get('tipAd', '')}<br>"
-                            f"Varyant Kodu: {task.get('varyantKodu', '')}<br>"
-                            f"Ulak Kodu: {task.get('ulakKodu', '')}<br>"
-                            f"Tip Değişim: {task['Type']}<br>"
-                            f"Süre: {duration_str}<br>"
-                            f"Miktar: {quantity_str} metre<br>"
-                            f"Atkı Sıklığı: {pick_frequency}"
-                        )
-                        
-                        # Sadece üretim işleri grid'e eklenecek
-                        termin_date = task.get('hamTermin')
-                        termin_str = termin_date.strftime('%Y-%m-%d %H:%M:%S') if termin_date is not None else ''
-                        
-                        grid_data.append({
-                            'Makine': machine_name,
-                            'İşlem Tipi': 'Üretim',
-                            'Başlangıç': start_time.strftime('%Y-%m-%d %H:%M:%S'),
-                            'Bitiş': end_time.strftime('%Y-%m-%d %H:%M:%S'),
-                            'Süre': duration_str,
-                            'Sipariş No': task.get('siparisId', ''),
-                            'Sipariş Detay No': task.get('siparisDetayId', ''),
-                            'Tip': task.get('tipAd', ''),
-                            'Varyant Kodu': task.get('varyantKodu', ''),
-                            'Ulak Kodu': task.get('ulakKodu', ''),
-                            'Miktar': quantity_str,
-                            'Atkı Sıklığı': pick_frequency if pick_frequency else '',
-                            'Termin': termin_str
-                        })
-                    
-                    new_row = pd.DataFrame({
-                        'Task': [machine_name],
-                        'Start': [start_time],
-                        'Finish': [end_time],
-                        'Resource': [machine_name],
-                        'Type': [task['Type']],
-                        'SiparisId': [task.get('siparisId', '')],
-                        'SiparisDetayId': [task.get('siparisDetayId', '')],
-                        'TipAd': [task.get('tipAd', '')],
-                        'VaryantKodu': [task.get('varyantKodu', '')],
-                        'UlakKodu': [task.get('ulakKodu', '')],
-                        'Duration': [duration_str],
-                        'Quantity': [quantity_str],
-                        'Pick_Frequency': [pick_frequency if pick_frequency else ''],
-                        'Description': [hover_text]
-                    })
-                    
-                    df = pd.concat([df, new_row], ignore_index=True)
-                        
-                except Exception as e:
-                    print(f"Hata oluştu (Makine {machine_name}): {str(e)}")
-                    continue
+            columns['Machine'].extend([machine_name] * len(tasks))
+            for column in task_columns:
+                columns[column].extend([task.get(column) for task in tasks])
+        return pd.DataFrame(columns)
+
+    def create_gantt(self, machine_schedules, filename, base_time='2025-01-01', render_mode='auto',
+                     large_threshold=3000, detail_machines=None, time_window=None,
+                     grid_mode='auto', grid_page_size=2000):
+        """Gantt şeması ve detaylı plan tablosunu HTML olarak kaydeder
+
+        render_mode: 'svg' (görev başına bir çubuk), 'webgl' (aile koşusu
+        özetleri WebGL izleri olarak) ya da 'auto' (large_threshold görevden
+        fazlaysa webgl).
+        detail_machines / time_window (saat cinsinden (başlangıç, bitiş)):
+        WebGL modunda yalnızca bunlar verildiğinde, seçilen görevler için
+        detay izleri de eklenir.
+        grid_mode: 'inline' (tablo verisi HTML içinde), 'sidecar' (sayfalı yan
+        dosyalar) ya da 'auto' (grid_page_size satırdan fazlaysa sidecar).
+        """
+        # Gantt şeması için veri hazırlama
+        tasks = self.collect_tasks(machine_schedules)
+        for column in GANTT_COLUMNS:
+            if column not in tasks:
+                tasks[column] = None
+
+        tasks['Start'] = pd.to_numeric(tasks['Start'], errors='coerce')
+        tasks['Duration'] = pd.to_numeric(tasks['Duration'], errors='coerce')
+        invalid = tasks['Start'].isna() | tasks['Duration'].isna()
+        if invalid.any():
+            print(f"Hata oluştu: {int(invalid.sum())} görevin başlangıç/süre bilgisi eksik, atlanıyor")
+            tasks = tasks[~invalid].reset_index(drop=True)
+
+        start_times = pd.Timestamp(base_time) + pd.to_timedelta(tasks['Start'], unit='h')
+        end_times = start_times + pd.to_timedelta(tasks['Duration'], unit='h')
+        duration_str = self.format_durations(tasks['Duration'])
+        quantity = pd.to_numeric(tasks['quantity'], errors='coerce')
+        quantity_str = quantity.round(2).map('{:.2f}'.format).where(quantity.notna(), '')
+        pick_frequency = tasks['atki_sikligi'].where(tasks['atki_sikligi'].notna() & (tasks['atki_sikligi'] != 0), '')
+
+        df = pd.DataFrame({
+            'Task': tasks['Machine'],
+            'Start': start_times,
+            'Finish': end_times,
+            'Resource': tasks['Machine'],
+            'Type': tasks['Type'],
+            'SiparisId': tasks['siparisId'].fillna(''),
+            'SiparisDetayId': tasks['siparisDetayId'].fillna(''),
+            'TipAd': tasks['tipAd'].fillna(''),
+            'VaryantKodu': tasks['varyantKodu'].fillna(''),
+            'UlakKodu': tasks['ulakKodu'].fillna(''),
+            'Duration': duration_str,
+            'Quantity': quantity_str,
+            'Pick_Frequency': pick_frequency
+        })
+
+        # Sadece üretim işleri grid'e eklenecek
+        production = ~tasks['Type'].str.lower().isin(['change', 'downtime'])
+        termin = pd.to_datetime(tasks.loc[production, 'hamTermin'], errors='coerce')
+        grid_frame = pd.DataFrame({
+            'Makine': tasks.loc[production, 'Machine'],
+            'İşlem Tipi': 'Üretim',
+            'Başlangıç': start_times[production].dt.strftime('%Y-%m-%d %H:%M:%S'),
+            'Bitiş': end_times[production].dt.strftime('%Y-%m-%d %H:%M:%S'),
+            'Süre': duration_str[production],
+            'Sipariş No': tasks.loc[production, 'siparisId'],
+            'Sipariş Detay No': tasks.loc[production, 'siparisDetayId'],
+            'Tip': tasks.loc[production, 'tipAd'],
+            'Varyant Kodu': tasks.loc[production, 'varyantKodu'],
+            'Ulak Kodu': tasks.loc[production, 'ulakKodu'],
+            'Miktar': quantity_str[production],
+            'Atkı Sıklığı': pick_frequency[production],
+            'Termin': termin.dt.strftime('%Y-%m-%d %H:%M:%S').fillna('')
+        })
+        grid_frame = grid_frame.astype(object).where(grid_frame.notna(), None)
 
         try:
             colors = {
                 'varyant': 'rgb(144, 238, 144)',  # açık yeşil
                 'takim': 'rgb(173, 216, 230)',    # açık mavi
                 'change': 'rgb(220, 20, 60)',     # kızıl
-                'ulak': 'rgb(238, 130, 238)'      # lila
+                'ulak': 'rgb(238, 130, 238)',     # lila
+                'downtime': 'rgb(105, 105, 105)'  # koyu gri (bakım/arıza/vardiya boşluğu)
             }
 
-            fig = px.timeline(df, 
-                            x_start="Start", 
-                            x_end="Finish", 
-                            y="Task", 
-                            color="Type",
-                            color_discrete_map=colors,
-                            hover_data={
-                                'SiparisId': True,
-                                'SiparisDetayId': True,
-                                'TipAd': True,
-                                'VaryantKodu': True,
-                                'UlakKodu': True,
-                                'Type': True,
-                                'Duration': True,
-                                'Quantity': True,
-                                'Pick_Frequency': True,
-                                'Start': False,
-                                'Finish': False,
-                                'Task': False
-                            },
-                            labels={"Task": "Makine", "Type": "İş Tipi"})
-
-            for trace in fig.data:
-                if trace.name.lower() == 'change':
-                    trace.hovertemplate = "<b>Tip Değişim:</b> %{customdata[5]}<br>" + \
-                                        "<b>Süre:</b> %{customdata[6]}<extra></extra>"
-                else:
-                    trace.hovertemplate = (
-                        "<b>Sipariş No:</b> %{customdata[0]}<br>" + \
-                        "<b>Sipariş Detay No:</b> %{customdata[1]}<br>" + \
-                        "<b>Tip:</b> %{customdata[2]}<br>" + \
-                        "<b>Varyant Kodu:</b> %{customdata[3]}<br>" + \
-                        "<b>Ulak Kodu:</b> %{customdata[4]}<br>" + \
-                        "<b>Tip Değişim:</b> %{customdata[5]}<br>" + \
-                        "<b>Süre:</b> %{customdata[6]}<br>" + \
-                        "<b>Miktar:</b> %{customdata[7]} metre<br>" + \
-                        "<b>Atkı Sıklığı:</b> %{customdata[8]}<extra></extra>"
-                    )
+            use_webgl = render_mode == 'webgl' or (render_mode == 'auto' and len(df) > large_threshold)
+            if use_webgl:
+                # Büyük çizelgeler: WebGL izleri ve aile bazında özet çubuklar
+                fig = self.create_webgl_timeline(df, tasks, colors, base_time, detail_machines, time_window)
+            else:
+                fig = px.timeline(df, 
+                                x_start="Start", 
+                                x_end="Finish", 
+                                y="Task", 
+                                color="Type",
+                                color_discrete_map=colors,
+                                hover_data={
+                                    'SiparisId': True,
+                                    'SiparisDetayId': True,
+                                    'TipAd': True,
+                                    'VaryantKodu': True,
+                                    'UlakKodu': True,
+                                    'Type': True,
+                                    'Duration': True,
+                                    'Quantity': True,
+                                    'Pick_Frequency': True,
+                                    'Start': False,
+                                    'Finish': False,
+                                    'Task': False
+                                },
+                                labels={"Task": "Makine", "Type": "İş Tipi"})
+
+                for trace in fig.data:
+                    trace.hovertemplate = (CHANGE_HOVER if trace.name.lower() in ('change', 'downtime')
+                                           else TASK_HOVER)
 
             fig.update_layout(
                 title="Üretim Çizelgesi",
@@ -161,12 +432,7 @@ class ScheduleVisualizer:
             <html>
             <head>
                 <title>Üretim Çizelgesi</title>
-                <link rel="stylesheet" type="text/css" href="https://cdn.datatables.net/1.11.5/css/jquery.dataTables.css">
-                <link rel="stylesheet" type="text/css" href="https://cdn.datatables.net/buttons/2.2.2/css/buttons.dataTables.min.css">
-                <script type="text/javascript" src="https://code.jquery.com/jquery-3.5.1.min.js"></script>
-                <script type="text/javascript" src="https://cdn.datatables.net/1.11.5/js/jquery.dataTables.min.js"></script>
-                <script type="text/javascript" src="https://cdn.datatables.net/buttons/2.2.2/js/dataTables.buttons.min.js"></script>
-                <script type="text/javascript" src="https://cdn.datatables.net/buttons/2.2.2/js/buttons.html5.min.js"></script>
+                {head_assets}
                 <style>
                     body {{ font-family: Arial, sans-serif; margin: 20px; }}
                     #gridContainer {{ margin-top: 30px; }}
@@ -201,46 +467,27 @@ class ScheduleVisualizer:
                         </thead>
                     </table>
                 </div>
-                <script>
-                    $(document).ready(function() {{
-                        var gridData = {grid_data};
-                        $('#scheduleGrid').DataTable({{
-                            data: gridData,
-                            columns: [
-                                {{ data: 'Makine' }},
-                                {{ data: 'İşlem Tipi' }},
-                                {{ data: 'Başlangıç' }},
-                                {{ data: 'Bitiş' }},
-                                {{ data: 'Süre' }},
-                                {{ data: 'Sipariş No' }},
-                                {{ data: 'Sipariş Detay No' }},
-                                {{ data: 'Tip' }},
-                                {{ data: 'Varyant Kodu' }},
-                                {{ data: 'Ulak Kodu' }},
-                                {{ data: 'Miktar' }},
-                                {{ data: 'Atkı Sıklığı' }},
-                                {{ data: 'Termin' }}
-                            ],
-                            dom: 'Bfrtip',
-                            buttons: ['copy', 'csv', 'excel'],
-                            pageLength: 25,
-                            order: [[0, 'asc'], [2, 'asc']],
-                            language: {{
-                                url: 'https://cdn.datatables.net/plug-ins/1.11.5/i18n/tr.json'
-                            }}
-                        }});
-                    }});
-                </script>
+                {grid_script}
             </body>
             </html>
             """
 
             # Gantt şemasını HTML'e çevir
-            gantt_html = fig.to_html(full_html=False, include_plotlyjs='cdn')
-            grid_json = json.dumps(grid_data, ensure_ascii=False)
+            # Çevrimdışı modda plotly.js <head> içinde ortak paketten yüklenir
+            gantt_html = fig.to_html(full_html=False,
+                                     include_plotlyjs=False if self.asset_mode == 'offline' else 'cdn')
+            if grid_mode == 'sidecar' or (grid_mode == 'auto' and len(grid_frame) > grid_page_size):
+                # Büyük tablolar: satırlar sayfa sayfa yan dosyalardan istenince yüklenir
+                grid_meta = self.write_grid_sidecar(grid_frame, filename, grid_page_size)
+                grid_script = SIDECAR_GRID_SCRIPT.replace('__GRID_META__', json.dumps(grid_meta, ensure_ascii=False))
+            else:
+                grid_json = json.dumps(grid_frame.to_dict('records'), ensure_ascii=False)
+                grid_script = INLINE_GRID_SCRIPT.replace('__GRID_DATA__', grid_json)
             
             # HTML şablonunu doldur ve kaydet
-            complete_html = html_template.format(gantt_div=gantt_html, grid_data=grid_json)
+            grid_script = grid_script.replace('__GRID_LANGUAGE__', json.dumps(DATATABLES_TR, ensure_ascii=False))
+            complete_html = html_template.format(head_assets=self.head_assets(filename), gantt_div=gantt_html,
+                                                 grid_script=grid_script)
             with open(filename, 'w', encoding='utf-8') as f:
                 f.write(complete_html)
             
@@ -248,9 +495,190 @@ class ScheduleVisualizer:
             print(f"Hata oluştu: {str(e)}")
             raise
     
+    def write_grid_sidecar(self, grid_frame, filename, page_size):
+        """Tablo satırlarını HTML'in yanındaki klasöre sayfalı olarak yazar
+
+        Her sayfa cizelgeSayfa(no, satırlar) çağıran küçük bir JS dosyasıdır
+        (file:// altında da yüklenebilir).
+        """
+        data_dir = os.path.splitext(filename)[0] + '_veri'
+        os.makedirs(data_dir, exist_ok=True)
+        for name in os.listdir(data_dir):
+            if name.startswith('sayfa_') and name.endswith('.js'):
+                os.remove(os.path.join(data_dir, name))
+
+        grid_frame = grid_frame.sort_values(['Makine', 'Başlangıç'], kind='stable')
+        rows = grid_frame.values.tolist()
+        page_count = 0
+        for offset in range(0, len(rows), page_size):
+            with open(os.path.join(data_dir, f'sayfa_{page_count:04d}.js'), 'w', encoding='utf-8') as f:
+                f.write(f'cizelgeSayfa({page_count},')
+                json.dump(rows[offset:offset + page_size], f, ensure_ascii=False, separators=(',', ':'))
+                f.write(');\n')
+            page_count += 1
+
+        return {
+            'dir': os.path.basename(data_dir),
+            'pageSize': page_size,
+            'pageCount': page_count,
+            'total': len(rows)
+        }
+
+    def aggregate_runs(self, df, tasks):
+        """Makine üzerindeki aynı aileden ardışık işleri özet çubuklara birleştirir
+
+        Aile varyant kodu, yoksa ulak kodu, o da yoksa tip adıdır. Bir koşu
+        içindeki tip değişimleri özete dahil edilir; koşular arasındaki
+        değişimler ayrı çubuk olarak döner.
+        """
+        frame = pd.DataFrame({
+            'Machine': df['Task'],
+            'Start': df['Start'],
+            'Finish': df['Finish'],
+            'Type': df['Type'],
+            'quantity': pd.to_numeric(tasks['quantity'], errors='coerce').fillna(0),
+            'family': tasks['varyantKodu'].where(tasks['varyantKodu'].notna() & (tasks['varyantKodu'] != ''),
+                       tasks['ulakKodu'].where(tasks['ulakKodu'].notna() & (tasks['ulakKodu'] != ''),
+                                               tasks['tipAd']))
+        }).sort_values(['Machine', 'Start'], kind='stable')
+
+        production = frame['Type'].str.lower() != 'change'
+        prod = frame[production]
+        new_run = (prod['Machine'] != prod['Machine'].shift()) | (prod['family'] != prod['family'].shift())
+        frame['run'] = new_run.cumsum().reindex(frame.index)
+
+        # Değişim satırları önceki ve sonraki üretim koşusuna göre sınıflandırılır
+        grouped_runs = frame.groupby('Machine', sort=False)['run']
+        internal = (grouped_runs.ffill() == grouped_runs.bfill()) & ~production
+        between_changes = frame[~production & ~internal]
+
+        runs = frame[production | internal].copy()
+        runs['is_job'] = production[production | internal]
+        runs['run'] = runs.groupby('Machine', sort=False)['run'].bfill()
+        summary = runs.groupby('run', sort=False).agg(
+            Machine=('Machine', 'first'),
+            Start=('Start', 'min'),
+            Finish=('Finish', 'max'),
+            family=('family', 'last'),
+            job_count=('is_job', 'sum'),
+            quantity=('quantity', 'sum')
+        ).reset_index(drop=True)
+        return summary, between_changes
+
+    def epoch_ms(self, times):
+        """Zaman serisini tarih ekseninin sayısal biçimine (epoch milisaniyesi) çevirir"""
+        return times.to_numpy(dtype='datetime64[ms]').astype(np.int64).astype(np.float64)
+
+    def bar_trace(self, starts, finishes, rows, color, name, visible=True, showlegend=True):
+        """Çubukları tek bir WebGL çizgi izi olarak çizer (segmentler NaN ile ayrılır)
+
+        starts/finishes epoch milisaniyesi, rows makine satır numarasıdır;
+        sayısal diziler HTML'e ikili (typed array) olarak gömülür.
+        """
+        count = len(starts)
+        xs = np.full(count * 3, np.nan)
+        ys = np.full(count * 3, np.nan)
+        xs[0::3] = starts
+        xs[1::3] = finishes
+        ys[0::3] = rows
+        ys[1::3] = rows
+        return go.Scattergl(x=xs, y=ys, mode='lines', line=dict(color=color, width=20),
+                            name=name, legendgroup=name, hoverinfo='skip',
+                            visible=visible, showlegend=showlegend)
+
+    def hover_trace(self, starts, finishes, rows, customdata, hovertemplate, name, visible=True):
+        """Çubuk ortalarına görünmez işaretler koyarak fare üstü bilgisini sağlar"""
+        return go.Scattergl(x=(starts + finishes) / 2, y=rows, mode='markers', marker=dict(size=12, opacity=0),
+                            customdata=customdata, hovertemplate=hovertemplate,
+                            name=name, legendgroup=name, visible=visible, showlegend=False)
+
+    def create_webgl_timeline(self, df, tasks, colors, base_time, detail_machines=None, time_window=None):
+        """Büyük çizelgeler için WebGL tabanlı, özet/detay seviyeli Gantt şeması oluşturur
+
+        Varsayılan olarak yalnızca aile koşusu özetleri, koşular arası tip
+        değişimleri ve duruşlar gömülür. Görev başına detay çubukları yalnızca
+        detail_machines ve/veya time_window verildiğinde, o alt küme için
+        eklenir; Özet/Detay düğmeleri bu durumda görünür.
+        """
+        # Makineler sayısal satırlara eşlenir (üstte mk101)
+        machine_names = sorted(df['Task'].unique(), reverse=True)
+        row_of = {name: row for row, name in enumerate(machine_names)}
+        starts, finishes = self.epoch_ms(df['Start']), self.epoch_ms(df['Finish'])
+        rows = df['Task'].map(row_of).to_numpy(dtype=np.float64)
+
+        # Duruşlar koşu özetine katılmaz, özet görünümde ayrı çubuk olarak çizilir
+        downtime = (df['Type'] == 'downtime').to_numpy()
+        summary, between_changes = self.aggregate_runs(df[~downtime], tasks[~downtime])
+        summary_color = 'rgb(70, 130, 180)'
+        summary_starts, summary_finishes = self.epoch_ms(summary['Start']), self.epoch_ms(summary['Finish'])
+        summary_rows = summary['Machine'].map(row_of).to_numpy(dtype=np.float64)
+
+        traces = [
+            self.bar_trace(summary_starts, summary_finishes, summary_rows, summary_color, 'Özet'),
+            self.hover_trace(summary_starts, summary_finishes, summary_rows,
+                             list(zip(summary['family'], summary['job_count'],
+                                      summary['quantity'].round(2),
+                                      self.format_durations((summary['Finish'] - summary['Start']).dt.total_seconds() / 3600))),
+                             SUMMARY_HOVER, 'Özet'),
+            self.bar_trace(self.epoch_ms(between_changes['Start']), self.epoch_ms(between_changes['Finish']),
+                           between_changes['Machine'].map(row_of).to_numpy(dtype=np.float64),
+                           colors['change'], 'change'),
+        ]
+        if downtime.any():
+            traces.append(self.bar_trace(starts[downtime], finishes[downtime], rows[downtime],
+                                         colors['downtime'], 'downtime'))
+        summary_count = len(traces)
+
+        # Detay izleri: yalnızca istenen makine / zaman penceresi için
+        detail = np.zeros(len(df), dtype=bool)
+        if detail_machines is not None or time_window is not None:
+            detail[:] = True
+            if detail_machines is not None:
+                detail &= df['Task'].isin(detail_machines).to_numpy()
+            if time_window is not None:
+                window_start = pd.Timestamp(base_time) + pd.Timedelta(hours=time_window[0])
+                window_end = pd.Timestamp(base_time) + pd.Timedelta(hours=time_window[1])
+                detail &= ((df['Finish'] > window_start) & (df['Start'] < window_end)).to_numpy()
+
+        types = df['Type'].astype(str).to_numpy()
+        for task_type in pd.unique(types[detail]):
+            group = detail & (types == task_type)
+            color = colors.get(task_type.lower(), 'rgb(128, 128, 128)')
+            hovertemplate = CHANGE_HOVER if task_type.lower() in ('change', 'downtime') else TASK_HOVER
+            traces.append(self.bar_trace(starts[group], finishes[group], rows[group], color, task_type,
+                                         visible=False))
+            traces.append(self.hover_trace(starts[group], finishes[group], rows[group],
+                                           df.loc[group, HOVER_COLUMNS].values, hovertemplate, task_type,
+                                           visible=False))
+
+        fig = go.Figure(data=traces)
+        detail_count = len(traces) - summary_count
+        fig.update_layout(
+            xaxis=dict(type='date'),
+            yaxis=dict(tickmode='array', tickvals=list(range(len(machine_names))), ticktext=machine_names,
+                       range=[-0.5, len(machine_names) - 0.5])
+        )
+        if detail_count:
+            fig.update_layout(updatemenus=[dict(
+                type='buttons',
+                direction='right',
+                x=0, y=1.08, xanchor='left',
+                buttons=[
+                    dict(label='Özet', method='update',
+                         args=[{'visible': [True] * summary_count + [False] * detail_count}]),
+                    dict(label='Detay', method='update',
+                         args=[{'visible': [False] * summary_count + [True] * detail_count}])
+                ]
+            )])
+            print(f"WebGL Gantt: {len(df)} görev, {len(summary)} özet çubuk, {int(detail.sum())} detay çubuk")
+        else:
+            print(f"WebGL Gantt: {len(df)} görev, {len(summary)} özet çubuk "
+                  f"(detay için detail_machines / time_window verin)")
+        return fig
+
     def save_gantt(self, fig, filename='schedule.html'):
         """Gantt şemasını HTML dosyası olarak kaydeder"""
-        fig.write_html(filename) 
+        self.write_figure_html(fig, filename)
     
     def create_analysis_charts(self, debug_stats, filename='analiz.html'):
         """Optimizasyon analiz grafiklerini oluşturur"""
@@ -349,5 +777,5 @@ class ScheduleVisualizer:
         )
         
         # Grafiği HTML olarak kaydet
-        fig.write_html(filename)
+        self.write_figure_html(fig, filename)
         print(f"Analiz grafikleri {filename} dosyasına kaydedildi.") 
\ No newline at end of file